@@ -3,9 +3,11 @@ from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from typing import Optional
 
+from asyncpg import Connection
 from fastapi import FastAPI
 from fastapi.logger import logger
 from gino import create_engine
+from gino.dialects.asyncpg import Pool
 from gino_starlette import Gino, GinoEngine
 
 # Explicitly register the gino asyncpg dialect with SQLAlchemy
@@ -17,6 +19,8 @@ registry.register("postgresql.asyncpg", "gino.dialects.asyncpg", "AsyncpgDialect
 
 from .settings.globals import (
     DATABASE_CONFIG,
+    QUERY_MAX_POOL_SIZE,
+    QUERY_MIN_POOL_SIZE,
     SQL_REQUEST_TIMEOUT,
     WRITE_DATABASE_CONFIG,
     WRITER_MIN_POOL_SIZE,
@@ -31,6 +35,7 @@ CURRENT_ENGINE: ContextVar = ContextVar("engine")
 
 WRITE_ENGINE: Optional[GinoEngine] = None
 READ_ENGINE: Optional[GinoEngine] = None
+QUERY_ENGINE: Optional[GinoEngine] = None
 
 
 class ContextualGino(Gino):
@@ -85,10 +90,58 @@ class ContextEngine(object):
         return engine
 
 
+async def init_query_connection(conn: Connection) -> None:
+    """Decode values of user SQL queries straight into JSON-serializable
+    types.
+
+    By default, asyncpg returns numeric values as Decimal and uuids as
+    UUID objects, which orjson can only serialize through a Python
+    callback. Numeric values are decoded as floats, which is how GET
+    /query/json has always rendered them. All other queries, which
+    render numeric values exactly, run on the reader engine instead (see
+    get_query_engine). JSON values are already returned as raw text by
+    asyncpg.
+    """
+    for type_name, decoder in [("numeric", float), ("uuid", str)]:
+        await conn.set_type_codec(
+            type_name,
+            encoder=str,
+            decoder=decoder,
+            schema="pg_catalog",
+            format="text",
+        )
+
+
+class QueryPool(Pool):
+    """Connection pool which prepares new connections for user SQL
+    queries."""
+
+    def __init__(self, url, loop, init=None, **kwargs):
+        super().__init__(url, loop, init=init_query_connection, **kwargs)
+
+
+def get_query_engine(exact_numeric: bool = False):
+    """Return the engine to run user SQL queries with.
+
+    With exact_numeric, return the reader engine, which keeps the
+    default codecs and so decodes numeric values as Decimals. Falls back
+    to the contextual engine outside of the app lifespan.
+    """
+    engine = READ_ENGINE if exact_numeric else QUERY_ENGINE
+    return engine if engine is not None else db
+
+
+def get_write_engine():
+    """Return the writer engine, for writes during read requests. Falls
+    back to the contextual engine outside of the app lifespan."""
+    return WRITE_ENGINE if WRITE_ENGINE is not None else db
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global WRITE_ENGINE
     global READ_ENGINE
+    global QUERY_ENGINE
 
     WRITE_ENGINE = await create_engine(
         WRITE_DATABASE_CONFIG.url,
@@ -107,6 +160,23 @@ async def lifespan(app: FastAPI):
     logger.info(
         f"Database connection pool for read operation created: {READ_ENGINE.repr(color=True)}"
     )
+    # Codecs are registered on dedicated connections only, so that ORM reads
+    # on the READ engine still receive Decimal and UUID objects.
+    QUERY_ENGINE = await create_engine(
+        DATABASE_CONFIG.url,
+        max_size=QUERY_MAX_POOL_SIZE,
+        min_size=QUERY_MIN_POOL_SIZE,
+        command_timeout=SQL_REQUEST_TIMEOUT,
+        pool_class=QueryPool,
+    )
+    logger.info(
+        f"Database connection pool for user queries created: {QUERY_ENGINE.repr(color=True)}"
+    )
+
+    # Imported here because the crud modules depend on this one
+    from .crud.admin_boundaries import warm_admin_boundary_indexes
+
+    await warm_admin_boundary_indexes()
 
     yield
 
@@ -126,6 +196,15 @@ async def lifespan(app: FastAPI):
         logger.info(
             f"Closed database connection for read operations {READ_ENGINE.repr(color=True)}"
         )
+    if QUERY_ENGINE:
+        logger.info(
+            f"Closing database connection for user queries {QUERY_ENGINE.repr(color=True)}"
+        )
+        await QUERY_ENGINE.close()
+        logger.info(
+            f"Closed database connection for user queries {QUERY_ENGINE.repr(color=True)}"
+        )
+        QUERY_ENGINE = None
 
 
 app: FastAPI = FastAPI(title="GFW Data API", redoc_url="/", lifespan=lifespan)
@@ -5,6 +5,7 @@ from pydantic.main import BaseModel
 
 from ..application import db
 from ..models.pydantic.change_log import ChangeLog
+from . import change_logs
 
 
 async def update_data(
@@ -18,7 +19,10 @@ async def update_data(
     if isinstance(input_data, BaseModel):
         input_data = input_data.dict(skip_defaults=True, by_alias=True)
 
-    if input_data.get("change_log"):
+    if input_data.get("change_log") and change_logs.has_change_log_table(row):
+        # Assets and versions keep their change logs in a separate table
+        await change_logs.create_change_logs(row, input_data.pop("change_log"))
+    elif input_data.get("change_log"):
         change_log = row.change_log
         # Make sure dates are correctly parsed as strings
         _logs = list()
@@ -29,6 +33,7 @@ async def update_data(
         change_log.extend(_logs)
         input_data["change_log"] = change_log
 
-    await row.update(**input_data).apply()
+    if input_data:
+        await row.update(**input_data).apply()
 
     return row
@@ -0,0 +1,202 @@
+"""In-memory index of admin boundaries.
+
+Deployed admin boundary versions never change, so the boundaries of
+the versions configured for this environment are loaded once at
+startup. ID and name lookups and admin lists are then answered without
+database access. Lookups for versions which aren't loaded fall back to
+SQL.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from fastapi.logger import logger
+from sqlalchemy import Column, Table
+from sqlalchemy.sql import Select
+
+from app.application import db
+from app.settings.globals import (
+    ADMIN_BOUNDARY_DATASETS,
+    ENV,
+    per_env_admin_boundary_versions,
+)
+from app.utils.gadm import normalize_name
+
+INDEXED_ADM_LEVELS: Tuple[str, ...] = ("0", "1", "2")
+
+NAME_FIELDS: Tuple[str, ...] = ("country", "name_1", "name_2")
+
+NameKey = Tuple[str, ...]
+
+
+class AdminBoundary(NamedTuple):
+    adm_level: int
+    gfw_geostore_id: UUID
+    gid_0: Optional[str]
+    gid_1: Optional[str]
+    gid_2: Optional[str]
+    country: Optional[str]
+    name_1: Optional[str]
+    name_2: Optional[str]
+
+
+def strip_revision(adm_level: int, gid: str) -> str:
+    """Remove the revision suffix from a GADM id, ie MEX.5.2_1 -> MEX.5.2.
+
+    gid_0 has no revision, and some ids are missing it by mistake.
+    """
+    if adm_level == 0:
+        return gid
+    return gid.rsplit("_", 1)[0]
+
+
+class AdminBoundaryIndex:
+    def __init__(self, boundaries: List[AdminBoundary]):
+        self.countries: List[AdminBoundary] = []
+        self._by_id: Dict[Tuple[int, str], AdminBoundary] = dict()
+
+        # Per adm level and normalization, boundaries sorted by names, so
+        # that both exact and prefix matches are found by bisection
+        by_name: Dict[Tuple[int, bool], List[Tuple[NameKey, AdminBoundary]]] = dict()
+
+        for boundary in boundaries:
+            adm_level = boundary.adm_level
+            gid: Optional[str] = getattr(boundary, f"gid_{adm_level}")
+            if gid is not None:
+                # Keep first match, like the SQL lookup does
+                self._by_id.setdefault(
+                    (adm_level, strip_revision(adm_level, gid)), boundary
+                )
+            names: NameKey = tuple(
+                getattr(boundary, field) or "" for field in NAME_FIELDS[: adm_level + 1]
+            )
+            by_name.setdefault((adm_level, False), list()).append((names, boundary))
+            by_name.setdefault((adm_level, True), list()).append(
+                (tuple(normalize_name(name) for name in names), boundary)
+            )
+            if adm_level == 0:
+                self.countries.append(boundary)
+
+        self.countries.sort(key=lambda b: str(b.gid_0))
+
+        self._name_keys: Dict[Tuple[int, bool], List[NameKey]] = dict()
+        self._name_boundaries: Dict[Tuple[int, bool], List[AdminBoundary]] = dict()
+        for key, entries in by_name.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._name_keys[key] = [names for names, _ in entries]
+            self._name_boundaries[key] = [boundary for _, boundary in entries]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get_by_id(
+        self,
+        adm_level: int,
+        country_id: str,
+        region_id: Optional[str] = None,
+        subregion_id: Optional[str] = None,
+    ) -> Optional[AdminBoundary]:
+        level_id = ".".join(
+            [
+                level
+                for level in (country_id, region_id, subregion_id)[: adm_level + 1]
+                if level is not None
+            ]
+        )
+        return self._by_id.get((adm_level, level_id))
+
+    def find_by_name(
+        self,
+        adm_level: int,
+        normalized: bool,
+        *names: Optional[str],
+        prefix: bool = False,
+    ) -> List[AdminBoundary]:
+        """Find boundaries of an adm level by names of the country, region
+        and subregion.
+
+        Names must already be normalized if normalized is True. With
+        prefix, names only need to start with the given names.
+        """
+        key: NameKey = tuple(name or "" for name in names[: adm_level + 1])
+        keys: List[NameKey] = self._name_keys.get((adm_level, normalized), [])
+        boundaries: List[AdminBoundary] = self._name_boundaries.get(
+            (adm_level, normalized), []
+        )
+        if prefix:
+            positions = self._prefix_positions(keys, key)
+        else:
+            positions = self._exact_positions(keys, key)
+        return [boundaries[i] for i in positions]
+
+    @staticmethod
+    def _exact_positions(keys: List[NameKey], key: NameKey) -> Iterator[int]:
+        i = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            yield i
+            i += 1
+
+    @staticmethod
+    def _prefix_positions(keys: List[NameKey], key: NameKey) -> Iterator[int]:
+        i = bisect_left(keys, key[:1])
+        while i < len(keys) and keys[i][0].startswith(key[0]):
+            if all(name.startswith(part) for name, part in zip(keys[i][1:], key[1:])):
+                yield i
+            i += 1
+
+
+_indexes: Dict[Tuple[str, str], AdminBoundaryIndex] = dict()
+
+
+def get_admin_boundary_index(
+    dataset: str, version: str
+) -> Optional[AdminBoundaryIndex]:
+    """Return the index of a dataset version or None if it isn't
+    loaded."""
+    return _indexes.get((dataset, version))
+
+
+async def load_admin_boundary_index(dataset: str, version: str) -> AdminBoundaryIndex:
+    src_table: Table = db.table(version)
+    src_table.schema = dataset
+
+    columns: List[Column] = [db.column(field) for field in AdminBoundary._fields]
+    sql: Select = (
+        db.select(columns)
+        .select_from(src_table)
+        .where(db.column("adm_level").in_(INDEXED_ADM_LEVELS))
+    )
+    rows = await db.all(sql)
+
+    boundaries: List[AdminBoundary] = []
+    for row in rows:
+        fields = dict(row)
+        fields["adm_level"] = int(fields["adm_level"])
+        boundaries.append(AdminBoundary(**fields))
+
+    index = AdminBoundaryIndex(boundaries)
+    _indexes[(dataset, version)] = index
+    return index
+
+
+async def warm_admin_boundary_indexes() -> None:
+    """Load admin boundaries of all versions deployed in this environment.
+
+    Failures are logged only, lookups then fall back to the database.
+    """
+    for provider, versions in per_env_admin_boundary_versions[ENV].items():
+        dataset: Optional[str] = ADMIN_BOUNDARY_DATASETS.get(provider)
+        if dataset is None:
+            continue
+        for version in versions.values():
+            try:
+                index = await load_admin_boundary_index(dataset, version)
+            except Exception as e:
+                logger.warning(
+                    f"Cannot load admin boundaries of {dataset}.{version}: {e}"
+                )
+            else:
+                logger.info(
+                    f"Loaded {len(index)} admin boundaries of {dataset}.{version}"
+                )
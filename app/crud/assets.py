@@ -165,6 +165,21 @@ async def get_asset(asset_id: UUID) -> ORMAsset:
     return asset
 
 
+async def lock_asset(asset_id: UUID) -> ORMAsset:
+    """Get asset and lock its row until the end of the current
+    transaction."""
+    asset: Optional[ORMAsset] = (
+        await ORMAsset.query.where(ORMAsset.asset_id == asset_id)
+        .with_for_update()
+        .gino.first()
+    )
+
+    if asset is None:
+        raise RecordNotFoundError(f"Could not find requested asset {asset_id}")
+
+    return asset
+
+
 async def get_default_asset(dataset: str, version: str) -> ORMAsset:
     asset: ORMAsset = (
         await ORMAsset.query.where(ORMAsset.dataset == dataset)
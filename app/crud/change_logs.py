@@ -0,0 +1,105 @@
+"""Change logs of assets and versions.
+
+Entries are appended to the change_logs table, instead of being added
+to an array column of the asset or version row, so that status updates
+don't rewrite the entire change log.
+"""
+
+from datetime import timezone
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ClauseElement
+
+from ..application import db
+from ..models.orm.assets import Asset as ORMAsset
+from ..models.orm.change_logs import ChangeLog as ORMChangeLog
+from ..models.orm.versions import Version as ORMVersion
+from ..models.pydantic.change_log import ChangeLog
+
+
+def has_change_log_table(row: db.Model) -> bool:  # type: ignore
+    return isinstance(row, (ORMAsset, ORMVersion))
+
+
+def _owner(row: db.Model) -> Dict[str, Any]:  # type: ignore
+    if isinstance(row, ORMAsset):
+        return {"asset_id": row.asset_id}
+    return {"dataset": row.dataset, "version": row.version}
+
+
+def _owner_filter(**owner) -> ClauseElement:
+    if "asset_id" in owner:
+        return ORMChangeLog.asset_id == owner["asset_id"]
+    return db.and_(
+        ORMChangeLog.dataset == owner["dataset"],
+        ORMChangeLog.version == owner["version"],
+    )
+
+
+async def create_change_logs(
+    row: db.Model, change_logs: Sequence[Dict[str, Any]]  # type: ignore
+) -> None:
+    """Append change log entries of an asset or version."""
+    owner: Dict[str, Any] = _owner(row)
+    values: List[Dict[str, Any]] = list()
+    for data in change_logs:
+        change_log = ChangeLog(**data)
+        date_time = change_log.date_time
+        if date_time.tzinfo is not None:
+            date_time = date_time.astimezone(timezone.utc).replace(tzinfo=None)
+        values.append(
+            {
+                **owner,
+                "date_time": date_time,
+                "status": change_log.status.value,
+                "message": change_log.message,
+                "detail": change_log.detail,
+            }
+        )
+    if values:
+        await ORMChangeLog.insert().values(values).gino.status()
+
+
+def _query(**owner):
+    return ORMChangeLog.query.where(_owner_filter(**owner)).order_by(
+        ORMChangeLog.date_time, ORMChangeLog.change_log_id
+    )
+
+
+async def get_asset_change_logs(asset_id: UUID) -> List[ORMChangeLog]:
+    return await _query(asset_id=asset_id).gino.all()
+
+
+async def get_version_change_logs(dataset: str, version: str) -> List[ORMChangeLog]:
+    return await _query(dataset=dataset, version=version).gino.all()
+
+
+async def count_filtered_change_logs_fn(**owner):
+    """Return a function counting the change logs of an asset or version.
+
+    Pass either asset_id or dataset and version.
+    """
+    query = _query(**owner)
+
+    async def count_change_logs() -> int:
+        return await func.count().select().select_from(query.alias()).gino.scalar()
+
+    return count_change_logs
+
+
+async def get_filtered_change_logs_fn(**owner):
+    """Return a function fetching a page of change logs of an asset or
+    version.
+
+    Pass either asset_id or dataset and version.
+    """
+    query = _query(**owner)
+
+    async def paginated_change_logs(
+        size: int = None, offset: int = 0
+    ) -> List[ORMChangeLog]:
+        return await query.limit(size).offset(offset).gino.all()
+
+    return paginated_change_logs
@@ -1,14 +1,18 @@
 import json
+import math
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from asyncpg.exceptions import UniqueViolationError
+from async_lru import alru_cache
 from fastapi.logger import logger
-from sqlalchemy import Column, Table, func
+from sqlalchemy import Column, Table, column, func
 from sqlalchemy.sql import Select, label
-from sqlalchemy.sql.elements import Label, TextClause
+from sqlalchemy.sql.elements import ColumnElement, Label, TextClause
 
-from app.application import db
+from app.application import db, get_write_engine
+from app.crud.admin_boundaries import AdminBoundary, get_admin_boundary_index
 from app.errors import (
     BadAdminSourceException,
     BadAdminVersionException,
@@ -26,8 +30,15 @@ from app.models.pydantic.geostore import (
     Geometry,
     Geostore,
 )
-from app.settings.globals import ENV, per_env_admin_boundary_versions
+from app.settings.globals import (
+    ADMIN_BOUNDARY_DATASETS,
+    ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO,
+    ADMIN_BOUNDARY_SIMPLIFY_TOLERANCES,
+    ENV,
+    per_env_admin_boundary_versions,
+)
 from app.utils.gadm import extract_level_id, fix_id_pattern
+from app.utils.geojson import round_geometry
 
 GEOSTORE_COLUMNS: List[Column] = [
     db.column("gfw_geostore_id"),
@@ -38,24 +49,100 @@ GEOSTORE_COLUMNS: List[Column] = [
     db.column("updated_on"),
 ]
 
+SIMPLIFIED_BOUNDARIES_CACHE_TTL: float = 60.0
+_simplified_boundaries_cache: Dict[Tuple[str, str], Tuple[float, bool]] = dict()
+
 
 async def get_gfw_geostore_from_any_dataset(geostore_id: UUID) -> Geostore:
-    src_table: Table = db.table("geostore")
+    geostores: List[Geostore] = await get_gfw_geostores_from_any_dataset(
+        [geostore_id]
+    )
 
-    where_clause: TextClause = db.text("gfw_geostore_id=:geostore_id")
-    bind_vals = {"geostore_id": f"{geostore_id}"}
-    where_clause = where_clause.bindparams(**bind_vals)
+    if not geostores:
+        raise RecordNotFoundError(
+            f"Area with gfw_geostore_id {geostore_id} does not exist"
+        )
 
-    sql: Select = db.select(GEOSTORE_COLUMNS).select_from(src_table).where(where_clause)
+    return geostores[0]
+
+
+async def get_gfw_geostores_from_any_dataset(
+    geostore_ids: List[UUID],
+) -> List[Geostore]:
+    """Fetch geostores of any dataset.
+
+    Instead of querying the geostore parent table, which probes every
+    inheriting table, the gfw_get_geostores function queries the user
+    areas and the source tables listed in the geostore lookup table, in
+    a single statement. Only IDs missing from these are looked up in the
+    geostore parent table (see _get_unregistered_geostores). IDs which
+    do not exist are omitted from the result.
+    """
+    sql = db.text(
+        f"""SELECT {", ".join(column.name for column in GEOSTORE_COLUMNS)}
+        FROM gfw_get_geostores(CAST(:geostore_ids AS UUID[]))"""
+    ).bindparams(geostore_ids=[f"{geostore_id}" for geostore_id in geostore_ids])
+    rows = await db.all(sql)
 
-    row = await db.first(sql)
+    geostores: Dict[str, Geostore] = {}
+    for row in rows:
+        geostore = Geostore.from_orm(row)
+        geostores.setdefault(str(geostore.gfw_geostore_id), geostore)
 
-    if row is None:
-        raise RecordNotFoundError(
-            f"Area with gfw_geostore_id {geostore_id} does not exist"
+    missing_ids: List[str] = [
+        f"{geostore_id}"
+        for geostore_id in geostore_ids
+        if f"{geostore_id}" not in geostores
+    ]
+    if missing_ids:
+        for geostore in await _get_unregistered_geostores(missing_ids):
+            geostores.setdefault(str(geostore.gfw_geostore_id), geostore)
+
+    return list(geostores.values())
+
+
+async def _get_unregistered_geostores(geostore_ids: List[str]) -> List[Geostore]:
+    """Fetch geostores missing from the geostore lookup table from the
+    geostore parent table, i.e. of tables which were not created by
+    inherit_geostore.sh or rows added since their IDs were registered.
+
+    The tables which hold them are registered in the lookup table, so
+    that later lookups of these IDs take the fast path.
+    """
+    columns = ", ".join(f"g.{column.name}" for column in GEOSTORE_COLUMNS)
+    sql = db.text(
+        f"""SELECT {columns}, n.nspname AS dataset, c.relname AS version
+        FROM geostore AS g
+        JOIN pg_class AS c ON c.oid = g.tableoid
+        JOIN pg_namespace AS n ON n.oid = c.relnamespace
+        WHERE g.gfw_geostore_id = ANY(CAST(:geostore_ids AS UUID[]))
+        AND n.nspname <> 'public'"""
+    ).bindparams(geostore_ids=geostore_ids)
+    rows = await db.all(sql)
+    if not rows:
+        return list()
+
+    # Registration only speeds up later lookups, so don't fail the request
+    try:
+        await get_write_engine().status(
+            db.text(
+                """INSERT INTO geostore_lookup (gfw_geostore_id, dataset, version)
+                SELECT * FROM unnest(
+                    CAST(:geostore_ids AS UUID[]),
+                    CAST(:datasets AS TEXT[]),
+                    CAST(:versions AS TEXT[])
+                )
+                ON CONFLICT DO NOTHING"""
+            ).bindparams(
+                geostore_ids=[f"{row.gfw_geostore_id}" for row in rows],
+                datasets=[row.dataset for row in rows],
+                versions=[row.version for row in rows],
+            )
         )
+    except Exception as e:
+        logger.warning(f"Cannot register geostore IDs in geostore lookup: {e}")
 
-    return Geostore.from_orm(row)
+    return [Geostore.from_orm(row) for row in rows]
 
 
 async def get_geostore_by_version(
@@ -80,58 +167,71 @@ async def get_geostore_by_version(
 
 
 async def create_user_area(geometry: Geometry) -> Geostore:
+    """Save a geometry as user area and return it."""
+    user_areas: List[Geostore] = await create_user_areas([geometry])
+    return user_areas[0]
 
-    # Sanitize the JSON by doing a round-trip with Postgres. We want the sort
-    # order, whitespace, etc. to match what would be saved via other means
-    # (in particular, via batch/scripts/add_gfw_fields.sh)
-    geometry_str = geometry.json()
 
-    sql = db.text("SELECT ST_AsGeoJSON(ST_GeomFromGeoJSON(:geo)::geometry);")
-    bind_vals = {"geo": geometry_str}
-    sql = sql.bindparams(**bind_vals)
-    logger.debug(sql)
-    sanitized_json = await db.scalar(sql)
+async def create_user_areas(geometries: List[Geometry]) -> List[Geostore]:
+    """Save geometries as user areas in a single round trip and return them
+    in the order of the input.
 
-    bbox: List[float] = await db.scalar(
-        f"""
-        SELECT ARRAY[
-            ST_XMin(ST_Envelope(ST_GeomFromGeoJSON('{sanitized_json}')::geometry)),
-            ST_YMin(ST_Envelope(ST_GeomFromGeoJSON('{sanitized_json}')::geometry)),
-            ST_XMax(ST_Envelope(ST_GeomFromGeoJSON('{sanitized_json}')::geometry)),
-            ST_YMax(ST_Envelope(ST_GeomFromGeoJSON('{sanitized_json}')::geometry))
-        ]::NUMERIC[];
-        """
-    )
+    The GeoJSON is sanitized by doing a round-trip with Postgres. We want
+    the sort order, whitespace, etc. to match what would be saved via other
+    means (in particular, via batch/scripts/_fill_gfw_fields_sql.sh). BBox, area
+    and ID are derived from the sanitized GeoJSON. We could easily compute
+    the MD5 hash in Python but we want PostgreSQL's behavior (if different)
+    to be the source of truth.
 
-    area: float = await db.scalar(
+    User areas which already exist are returned unchanged.
+    """
+    sql = db.text(
         f"""
-        SELECT ST_Area(
-            ST_GeomFromGeoJSON(
-                '{sanitized_json}'
-            )::geography
+        WITH sanitized AS (
+            SELECT
+                ord,
+                ST_AsGeoJSON(ST_GeomFromGeoJSON(geo)::geometry) AS geojson
+            FROM unnest(CAST(:geos AS TEXT[])) WITH ORDINALITY AS input(geo, ord)
+        ),
+        upserted AS (
+            INSERT INTO {ORMUserArea.__tablename__}
+                (gfw_geostore_id, gfw_geojson, gfw_area__ha, gfw_bbox, created_on, updated_on)
+            SELECT DISTINCT ON (MD5(geojson))
+                MD5(geojson)::uuid,
+                geojson,
+                ST_Area(geom::geography) / 10000,
+                ARRAY[
+                    ST_XMin(ST_Envelope(geom)),
+                    ST_YMin(ST_Envelope(geom)),
+                    ST_XMax(ST_Envelope(geom)),
+                    ST_YMax(ST_Envelope(geom))
+                ]::NUMERIC[],
+                :now,
+                :now
+            FROM (
+                SELECT geojson, ST_GeomFromGeoJSON(geojson)::geometry AS geom
+                FROM sanitized
+            ) AS user_area
+            ON CONFLICT (gfw_geostore_id)
+                DO UPDATE SET gfw_geostore_id = EXCLUDED.gfw_geostore_id
+            RETURNING gfw_geostore_id, gfw_geojson, gfw_bbox, gfw_area__ha, created_on, updated_on
         )
+        SELECT upserted.*
+        FROM sanitized
+        JOIN upserted ON upserted.gfw_geostore_id = MD5(sanitized.geojson)::uuid
+        ORDER BY sanitized.ord;
         """
     )
-    area = area / 10000
-
-    # We could easily do this in Python but we want PostgreSQL's behavior
-    # (if different) to be the source of truth.
-    # geo_id = UUID(str(hashlib.md5(feature_json.encode("UTF-8")).hexdigest()))
-    geo_id: UUID = await db.scalar(f"SELECT MD5('{sanitized_json}')::uuid;")
-
-    try:
-        user_area = await ORMUserArea.create(
-            gfw_geostore_id=geo_id,
-            gfw_geojson=sanitized_json,
-            gfw_area__ha=area,
-            gfw_bbox=bbox,
-        )
-        geostore: Geostore = Geostore.from_orm(user_area)
+    bind_vals = {
+        "geos": [geometry.json() for geometry in geometries],
+        "now": datetime.utcnow(),
+    }
+    sql = sql.bindparams(**bind_vals)
+    logger.debug(sql)
 
-    except UniqueViolationError:
-        geostore = await get_gfw_geostore_from_any_dataset(geo_id)
+    rows = await db.all(sql)
 
-    return geostore
+    return [Geostore.from_orm(row) for row in rows]
 
 
 async def get_admin_boundary_list(
@@ -142,6 +242,10 @@ async def get_admin_boundary_list(
     )
     dataset, version = dv
 
+    index = get_admin_boundary_index(dataset, version)
+    if index is not None:
+        return _admin_list_response(index.countries)
+
     src_table: Table = db.table(version)
     src_table.schema = dataset
 
@@ -164,6 +268,10 @@ async def get_admin_boundary_list(
 
     rows = await get_all_rows(sql)
 
+    return _admin_list_response(rows)
+
+
+def _admin_list_response(rows) -> AdminListResponse:
     return AdminListResponse.parse_obj(
         {
             "data": [
@@ -198,6 +306,20 @@ async def get_gadm_geostore_id(
     region_id: str | None = None,
     subregion_id: str | None = None,
 ) -> str:
+    dataset, version = await admin_params_to_dataset_version(
+        admin_provider, admin_version
+    )
+    index = get_admin_boundary_index(dataset, version)
+    if index is not None:
+        boundary: Optional[AdminBoundary] = index.get_by_id(
+            adm_level, country_id, region_id, subregion_id
+        )
+        if boundary is None:
+            raise RecordNotFoundError(
+                f"Admin boundary not found in {admin_provider} version {admin_version}"
+            )
+        return boundary.gfw_geostore_id
+
     src_table = await get_versioned_dataset(admin_provider, admin_version)
     columns_etc: List[Column | Label] = [
         db.column("gfw_geostore_id"),
@@ -223,7 +345,10 @@ async def build_gadm_geostore(
     country_id: str,
     region_id: str | None = None,
     subregion_id: str | None = None,
+    precision: int | None = None,
 ) -> AdminGeostore:
+    """Build admin geostore, optionally simplified and with coordinates
+    limited to precision decimal places."""
     src_table = await get_versioned_dataset(admin_provider, admin_version)
 
     columns_etc: List[Column | Label] = [
@@ -239,13 +364,25 @@ async def build_gadm_geostore(
     else:
         columns_etc.append(label("name", db.column(f"name_{adm_level}")))
 
+    pre_computed: bool = False
+    snapped: Optional[float] = None
+    if simplify is not None and simplify > 0:
+        snapped = snap_simplify_tolerance(simplify)
     if simplify is None:
-        columns_etc.append(label("geojson", func.ST_AsGeoJSON(db.column("geom"))))
+        columns_etc.append(label("geojson", _as_geojson(db.column("geom"), precision)))
+    elif snapped is not None and await has_simplified_boundaries(
+        src_table.schema, src_table.name
+    ):
+        simplify = snapped
+        pre_computed = True
+        columns_etc.append(
+            label("geojson", _simplified_geojson(src_table, simplify, precision))
+        )
     else:
         columns_etc.append(
             label(
                 "geojson",
-                func.ST_AsGeoJSON(func.ST_Simplify(db.column("geom"), simplify)),
+                _as_geojson(func.ST_Simplify(db.column("geom"), simplify), precision),
             )
         )
 
@@ -265,19 +402,96 @@ async def build_gadm_geostore(
             "GeoJSON is None, try reducing or eliminating simplification."
         )
 
+    geojson: Dict = json.loads(row.geojson)
+    if pre_computed and precision is not None:
+        geojson = round_geometry(geojson, precision)
+
     return await form_admin_geostore(
         adm_level=adm_level,
         admin_version=admin_version,
         area=float(row.gfw_area__ha),
         bbox=[float(val) for val in row.gfw_bbox],
         name=str(row.name),
-        geojson=json.loads(row.geojson),
+        geojson=geojson,
         geostore_id=str(row.gfw_geostore_id),
         level_id=str(row.level_id),
         simplify=simplify,
     )
 
 
+def snap_simplify_tolerance(simplify: float) -> Optional[float]:
+    """Return the pre-computed simplification tolerance closest to the
+    requested one, on a log scale.
+
+    Returns None if no tolerance is within a factor of
+    ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO of the requested one.
+    """
+    tolerance: float = min(
+        ADMIN_BOUNDARY_SIMPLIFY_TOLERANCES,
+        key=lambda tolerance: abs(math.log(tolerance / simplify)),
+    )
+    if max(tolerance / simplify, simplify / tolerance) > (
+        ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO
+    ):
+        return None
+    return tolerance
+
+
+async def has_simplified_boundaries(dataset: str, version: str) -> bool:
+    """Check if simplified boundaries were pre-computed for the admin
+    boundary version (see batch/scripts/simplify_admin_boundaries.sh).
+
+    Results are only cached briefly, so that new tables are used soon
+    and dropped ones are soon noticed.
+    """
+    now: float = time.monotonic()
+    expiry, exists = _simplified_boundaries_cache.get((dataset, version), (0.0, False))
+    if expiry > now:
+        return exists
+
+    sql = db.text("SELECT to_regclass(:table_name) IS NOT NULL").bindparams(
+        table_name=f'"{dataset}"."{version}__simplified"'
+    )
+    exists = await db.scalar(sql)
+    _simplified_boundaries_cache[(dataset, version)] = (
+        now + SIMPLIFIED_BOUNDARIES_CACHE_TTL,
+        exists,
+    )
+    return exists
+
+
+def _as_geojson(geom: ColumnElement, precision: int | None) -> ColumnElement:
+    if precision is None:
+        return func.ST_AsGeoJSON(geom)
+    return func.ST_AsGeoJSON(geom, precision)
+
+
+def _simplified_geojson(
+    src_table: Table, tolerance: float, precision: int | None
+) -> ColumnElement:
+    """Pre-computed simplified GeoJSON of the boundary, simplified on the fly
+    if missing."""
+    simplified_table: Table = db.table(f"{src_table.name}__simplified")
+    simplified_table.schema = src_table.schema
+
+    pre_computed: ColumnElement = (
+        db.select([db.column("geojson")])
+        .select_from(simplified_table)
+        .where(
+            db.column("gfw_geostore_id")
+            == column("gfw_geostore_id", _selectable=src_table)
+        )
+        .where(db.column("tolerance") == tolerance)
+        .as_scalar()
+    )
+    return func.coalesce(
+        pre_computed,
+        _as_geojson(func.ST_Simplify(db.column("geom"), tolerance), precision),
+    )
+
+
+# Versions are immutable, so IDs never need to be refreshed
+@alru_cache(maxsize=4096)
 async def get_wdpa_geostore_id(dataset, version, wdpa_id):
     src_table: Table = db.table(version)
     src_table.schema = dataset
@@ -385,6 +599,7 @@ async def get_gadm_geostore(
     country_id: str,
     region_id: str | None = None,
     subregion_id: str | None = None,
+    precision: int | None = None,
 ) -> AdminGeostoreResponse:
     geostore: AdminGeostore = await build_gadm_geostore(
         admin_provider=admin_provider,
@@ -394,6 +609,7 @@ async def get_gadm_geostore(
         country_id=country_id,
         region_id=region_id,
         subregion_id=subregion_id,
+        precision=precision,
     )
 
     return AdminGeostoreResponse(data=geostore)
@@ -402,15 +618,13 @@ async def get_gadm_geostore(
 async def admin_params_to_dataset_version(
     source_provider: str, source_version: str
 ) -> Tuple[str, str]:
-    admin_source_to_dataset: Dict[str, str] = {"GADM": "gadm_administrative_boundaries"}
-
     try:
-        dataset: str = admin_source_to_dataset[source_provider.upper()]
+        dataset: str = ADMIN_BOUNDARY_DATASETS[source_provider.upper()]
     except KeyError:
         raise BadAdminSourceException(
             (
                 "Invalid admin boundary source. Valid sources:"
-                f" {[source.lower() for source in admin_source_to_dataset.keys()]}"
+                f" {[source.lower() for source in ADMIN_BOUNDARY_DATASETS.keys()]}"
             )
         )
 
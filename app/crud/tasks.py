@@ -1,11 +1,13 @@
-from typing import List
+from typing import Any, Dict, List
 from uuid import UUID
 
 from asyncpg import ForeignKeyViolationError, UniqueViolationError
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import func
 
+from ..application import db
 from ..errors import RecordAlreadyExistsError, RecordNotFoundError
+from ..models.enum.change_log import ChangeLogStatus
 from ..models.orm.tasks import Task as ORMTask
 from . import update_data
 
@@ -42,6 +44,17 @@ async def get_tasks(asset_id: UUID) -> List[ORMTask]:
     return tasks
 
 
+async def count_unfinished_tasks(asset_id: UUID) -> int:
+    """Count tasks of an asset without a successful change log entry."""
+    sql = db.text(
+        "SELECT count(*) FROM tasks WHERE asset_id = :asset_id AND NOT EXISTS"
+        " (SELECT 1 FROM unnest(change_log) AS entry"
+        " WHERE entry->>'status' = :status)"
+    ).bindparams(asset_id=asset_id, status=ChangeLogStatus.success.value)
+
+    return await db.scalar(sql)
+
+
 async def get_task(task_id: UUID) -> ORMTask:
     row: ORMTask = await ORMTask.get(task_id)
     if row is None:
@@ -60,6 +73,28 @@ async def create_task(task_id: UUID, **data) -> ORMTask:
     return new_task
 
 
+async def create_tasks(asset_id: UUID, tasks: Dict[UUID, Dict[str, Any]]) -> None:
+    """Create tasks of an asset with a single multi-row insert.
+
+    Tasks are passed as a dict of task data by task_id.
+    """
+    rows = [
+        {"task_id": task_id, "asset_id": asset_id, **jsonable_encoder(data)}
+        for task_id, data in tasks.items()
+    ]
+    if not rows:
+        return
+    try:
+        async with db.transaction():
+            await ORMTask.insert().values(rows).gino.status()
+    except UniqueViolationError:
+        raise RecordAlreadyExistsError(
+            f"One of tasks {list(tasks.keys())} already exists."
+        )
+    except ForeignKeyViolationError:
+        raise RecordNotFoundError(f"Asset {asset_id} does not exist.")
+
+
 async def create_or_update_task(task_id: UUID, **data) -> ORMTask:
     try:
         new_task: ORMTask = await ORMTask.create(task_id=task_id, **data)
@@ -7,7 +7,7 @@ from fastapi.responses import ORJSONResponse
 from app.settings.globals import ENV
 
 
-class TooManyRetriesError(RecursionError):
+class JobDependencyError(Exception):
     def __init__(self, message: str, detail: str):
         self.message = message
         self.detail = detail
@@ -6,6 +6,11 @@ class QueryFormat(str, Enum):
     csv = "csv"
 
 
+class AsyncQueryFormat(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
 class QueryType(str, Enum):
     table = "table"
     raster = "raster"
@@ -0,0 +1,45 @@
+from .base import db
+
+
+class ChangeLog(db.Model):  # type: ignore
+    """Append-only change log entries of assets and versions.
+
+    Entries belong to either an asset or a version, and are removed with
+    them. Task change logs remain in the tasks table.
+    """
+
+    __tablename__ = "change_logs"
+    change_log_id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    asset_id = db.Column(db.UUID, nullable=True)
+    dataset = db.Column(db.String, nullable=True)
+    version = db.Column(db.String, nullable=True)
+    date_time = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String, nullable=False)
+    message = db.Column(db.String, nullable=False)
+    detail = db.Column(db.String, nullable=True)
+
+    fk_asset = db.ForeignKeyConstraint(
+        ["asset_id"],
+        ["assets.asset_id"],
+        name="fk_asset",
+        onupdate="CASCADE",
+        ondelete="CASCADE",
+    )
+    fk_version = db.ForeignKeyConstraint(
+        ["dataset", "version"],
+        ["versions.dataset", "versions.version"],
+        name="fk_version",
+        onupdate="CASCADE",
+        ondelete="CASCADE",
+    )
+
+    ck_owner = db.CheckConstraint(
+        "(asset_id IS NULL) <> (dataset IS NULL OR version IS NULL)", name="ck_owner"
+    )
+
+    _change_logs_asset_id_date_time_idx = db.Index(
+        "change_logs_asset_id_date_time_idx", "asset_id", "date_time"
+    )
+    _change_logs_dataset_version_date_time_idx = db.Index(
+        "change_logs_dataset_version_date_time_idx", "dataset", "version", "date_time"
+    )
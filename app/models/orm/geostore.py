@@ -19,3 +19,23 @@ class Geostore(Base):
     _geostore_gfw_geostore_id_idx = db.Index(
         "geostore_gfw_geostore_id_idx", "gfw_geostore_id", postgresql_using="hash"
     )
+
+
+class GeostoreLookup(db.Model):  # type: ignore
+    """Maps geostore IDs to the tables which inherit them from geostore, so
+    that lookups don't need to scan the entire inheritance tree.
+
+    Maintained by batch/scripts/update_geostore_lookup.sh, on table
+    deletion and when a lookup finds an unregistered ID in the geostore
+    table. User areas are not tracked here.
+    """
+
+    __tablename__ = "geostore_lookup"
+
+    gfw_geostore_id = db.Column(db.UUID, primary_key=True)
+    dataset = db.Column(db.String, primary_key=True)
+    version = db.Column(db.String, primary_key=True)
+
+    _geostore_lookup_dataset_version_idx = db.Index(
+        "geostore_lookup_dataset_version_idx", "dataset", "version"
+    )
@@ -15,9 +15,10 @@ from app.application import db
 from app.models.orm.api_keys import ApiKey  # noqa: F401
 from app.models.orm.asset_metadata import AssetMetadata  # noqa: F401
 from app.models.orm.assets import Asset  # noqa: F401
+from app.models.orm.change_logs import ChangeLog  # noqa: F401
 from app.models.orm.dataset_metadata import DatasetMetadata  # noqa: F401
 from app.models.orm.datasets import Dataset  # noqa: F401
-from app.models.orm.geostore import Geostore  # noqa: F401
+from app.models.orm.geostore import Geostore, GeostoreLookup  # noqa: F401
 from app.models.orm.tasks import Task  # noqa: F401
 from app.models.orm.user_areas import UserArea  # noqa: F401
 from app.models.orm.version_metadata import VersionMetadata  # noqa: F401
@@ -0,0 +1,123 @@
+"""Add change logs table
+
+Revision ID: 3e9b2f6c1d47
+Revises: 5c0d9f3e7a21
+Create Date: 2026-10-18 14:03:52.184406
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3e9b2f6c1d47"
+down_revision = "5c0d9f3e7a21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "change_logs",
+        sa.Column("change_log_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("asset_id", postgresql.UUID(), nullable=True),
+        sa.Column("dataset", sa.String(), nullable=True),
+        sa.Column("version", sa.String(), nullable=True),
+        sa.Column("date_time", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("detail", sa.String(), nullable=True),
+        sa.CheckConstraint(
+            "(asset_id IS NULL) <> (dataset IS NULL OR version IS NULL)",
+            name="ck_owner",
+        ),
+        sa.ForeignKeyConstraint(
+            ["asset_id"],
+            ["assets.asset_id"],
+            name="fk_asset",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["dataset", "version"],
+            ["versions.dataset", "versions.version"],
+            name="fk_version",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("change_log_id"),
+    )
+    op.create_index(
+        "change_logs_asset_id_date_time_idx",
+        "change_logs",
+        ["asset_id", "date_time"],
+        unique=False,
+    )
+    op.create_index(
+        "change_logs_dataset_version_date_time_idx",
+        "change_logs",
+        ["dataset", "version", "date_time"],
+        unique=False,
+    )
+
+    # Backfill from the change log arrays, keeping the order of entries.
+    # The arrays are left in place, but no longer written to.
+    op.execute(
+        """
+        INSERT INTO change_logs (asset_id, date_time, status, message, detail)
+        SELECT a.asset_id, (entry->>'date_time')::timestamp, entry->>'status',
+               coalesce(entry->>'message', ''), entry->>'detail'
+        FROM assets AS a, unnest(a.change_log) WITH ORDINALITY AS t(entry, position)
+        ORDER BY a.asset_id, t.position;
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO change_logs (dataset, version, date_time, status, message, detail)
+        SELECT v.dataset, v.version, (entry->>'date_time')::timestamp,
+               entry->>'status', coalesce(entry->>'message', ''), entry->>'detail'
+        FROM versions AS v, unnest(v.change_log) WITH ORDINALITY AS t(entry, position)
+        ORDER BY v.dataset, v.version, t.position;
+        """
+    )
+
+
+def downgrade():
+    # Write entries added since the upgrade back into the change log arrays
+    op.execute(
+        """
+        UPDATE assets AS a SET change_log = c.change_log
+        FROM (
+            SELECT asset_id, array_agg(
+                jsonb_build_object(
+                    'date_time', date_time, 'status', status,
+                    'message', message, 'detail', detail
+                ) ORDER BY date_time, change_log_id
+            ) AS change_log
+            FROM change_logs WHERE asset_id IS NOT NULL GROUP BY asset_id
+        ) AS c
+        WHERE a.asset_id = c.asset_id;
+        """
+    )
+    op.execute(
+        """
+        UPDATE versions AS v SET change_log = c.change_log
+        FROM (
+            SELECT dataset, version, array_agg(
+                jsonb_build_object(
+                    'date_time', date_time, 'status', status,
+                    'message', message, 'detail', detail
+                ) ORDER BY date_time, change_log_id
+            ) AS change_log
+            FROM change_logs WHERE asset_id IS NULL GROUP BY dataset, version
+        ) AS c
+        WHERE v.dataset = c.dataset AND v.version = c.version;
+        """
+    )
+
+    op.drop_index(
+        "change_logs_dataset_version_date_time_idx", table_name="change_logs"
+    )
+    op.drop_index("change_logs_asset_id_date_time_idx", table_name="change_logs")
+    op.drop_table("change_logs")
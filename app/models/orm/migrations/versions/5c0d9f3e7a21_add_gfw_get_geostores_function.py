@@ -0,0 +1,67 @@
+"""Add gfw_get_geostores function
+
+Revision ID: 5c0d9f3e7a21
+Revises: a1204296a6b6
+Create Date: 2026-10-18 21:24:40.604118
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c0d9f3e7a21"
+down_revision = "a1204296a6b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fetch geostores of user areas and of the tables listed for them in the
+    # geostore lookup table in one call, without probing every table which
+    # inherits from geostore. Lookup rows of dropped tables are skipped.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.gfw_get_geostores(geostore_ids uuid[])
+            RETURNS TABLE (
+                gfw_geostore_id uuid,
+                gfw_geojson text,
+                gfw_bbox numeric[],
+                gfw_area__ha numeric,
+                created_on timestamp,
+                updated_on timestamp
+            )
+            LANGUAGE 'plpgsql'
+            STABLE STRICT
+        AS $BODY$
+        DECLARE
+            src record;
+            columns CONSTANT text := 'gfw_geostore_id, gfw_geojson::text, '
+                'gfw_bbox::numeric[], gfw_area__ha::numeric, '
+                'created_on::timestamp, updated_on::timestamp';
+        BEGIN
+            RETURN QUERY EXECUTE format(
+                'SELECT %s FROM public.userareas WHERE gfw_geostore_id = ANY($1)',
+                columns
+            ) USING geostore_ids;
+
+            FOR src IN
+                SELECT l.dataset, l.version, array_agg(l.gfw_geostore_id) AS ids
+                FROM public.geostore_lookup AS l
+                WHERE l.gfw_geostore_id = ANY(geostore_ids)
+                AND to_regclass(quote_ident(l.dataset) || '.' || quote_ident(l.version))
+                    IS NOT NULL
+                GROUP BY l.dataset, l.version
+            LOOP
+                RETURN QUERY EXECUTE format(
+                    'SELECT %s FROM %I.%I WHERE gfw_geostore_id = ANY($1)',
+                    columns, src.dataset, src.version
+                ) USING src.ids;
+            END LOOP;
+        END;
+        $BODY$;
+        """
+    )
+
+
+def downgrade():
+    op.execute("""DROP FUNCTION IF EXISTS public.gfw_get_geostores;""")
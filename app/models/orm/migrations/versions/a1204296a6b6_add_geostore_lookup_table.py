@@ -0,0 +1,50 @@
+"""Add geostore lookup table
+
+Revision ID: a1204296a6b6
+Revises: d8f049f00259
+Create Date: 2026-10-18 10:12:31.511287
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a1204296a6b6"
+down_revision = "d8f049f00259"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "geostore_lookup",
+        sa.Column("gfw_geostore_id", postgresql.UUID(), nullable=False),
+        sa.Column("dataset", sa.String(), nullable=False),
+        sa.Column("version", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("gfw_geostore_id", "dataset", "version"),
+    )
+    op.create_index(
+        "geostore_lookup_dataset_version_idx",
+        "geostore_lookup",
+        ["dataset", "version"],
+        unique=False,
+    )
+
+    # Backfill from all tables which currently inherit from geostore
+    op.execute(
+        """
+        INSERT INTO geostore_lookup (gfw_geostore_id, dataset, version)
+        SELECT DISTINCT g.gfw_geostore_id, n.nspname, c.relname
+        FROM geostore AS g
+        JOIN pg_class AS c ON c.oid = g.tableoid
+        JOIN pg_namespace AS n ON n.oid = c.relnamespace
+        WHERE n.nspname <> 'public';
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("geostore_lookup_dataset_version_idx", table_name="geostore_lookup")
+    op.drop_table("geostore_lookup")
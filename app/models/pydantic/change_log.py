@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from ..enum.change_log import ChangeLogStatus, ChangeLogStatusTaskIn
 from .base import StrictBaseModel
-from .responses import Response
+from .responses import PaginationLinks, PaginationMeta, Response
 
 
 class ChangeLog(StrictBaseModel):
@@ -22,3 +22,8 @@ class ChangeLogTaskIn(StrictBaseModel):
 
 class ChangeLogResponse(Response):
     data: List[ChangeLog]
+
+
+class PaginatedChangeLogResponse(ChangeLogResponse):
+    links: PaginationLinks
+    meta: PaginationMeta
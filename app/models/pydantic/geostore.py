@@ -2,11 +2,13 @@ import json
 from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import validator
+from pydantic import Field, validator
 
 from .base import BaseRecord, StrictBaseModel
 from .responses import Response
 
+GEOSTORE_BULK_LIMIT = 1000
+
 
 class Geometry(StrictBaseModel):
     type: str
@@ -50,6 +52,14 @@ class GeostoreIn(StrictBaseModel):
     geometry: Geometry
 
 
+class GeostoresIn(StrictBaseModel):
+    geometries: List[Geometry] = Field(..., min_items=1, max_items=GEOSTORE_BULK_LIMIT)
+
+
+class GeostoreLookupIn(StrictBaseModel):
+    geostore_ids: List[UUID] = Field(..., min_items=1, max_items=GEOSTORE_BULK_LIMIT)
+
+
 class RWGeostoreIn(StrictBaseModel):
     geojson: Geometry | Feature | FeatureCollection
 
@@ -58,6 +68,10 @@ class GeostoreResponse(Response):
     data: Geostore
 
 
+class GeostoresResponse(Response):
+    data: List[Geostore]
+
+
 class Adm0BoundaryInfo(StrictBaseModel):
     use: Dict
     simplifyThresh: Optional[float]
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import validator
 
 from ...settings.globals import (
+    ASYNC_QUERY_TIMEOUT,
     AURORA_JOB_QUEUE,
     DATA_LAKE_JOB_QUEUE,
     DEFAULT_JOB_DURATION,
@@ -112,6 +113,18 @@ class GdalPythonExportJob(Job):
     attempt_duration_seconds = DEFAULT_JOB_DURATION
 
 
+class AsyncQueryJob(Job):
+    """Use for long running READ-ONLY queries whose results are exported to
+    the S3 data lake."""
+
+    job_queue = DATA_LAKE_JOB_QUEUE
+    job_definition = GDAL_PYTHON_JOB_DEFINITION
+    vcpus = 1
+    memory = 3000
+    attempts = 1
+    attempt_duration_seconds = ASYNC_QUERY_TIMEOUT
+
+
 class TileCacheJob(Job):
     """Use for generating Vector Tile Cache using TippeCanoe."""
 
@@ -42,6 +42,13 @@ class AdminIDLookupQueryParams(StrictBaseModel):
             "Whether or not to perform a case- and accent-insensitive search."
         ),
     )
+    prefix_search: bool = Query(
+        False,
+        description=(
+            "Whether to match all names starting with the given names "
+            "instead of whole names only."
+        ),
+    )
 
     @root_validator(pre=True)
     def validate_params(cls, values):
@@ -1,6 +1,7 @@
 from typing import Optional, List
 
 from app.models.enum.creation_options import Delimiters
+from app.models.enum.queries import AsyncQueryFormat
 from app.models.pydantic.base import StrictBaseModel
 from app.models.pydantic.geostore import FeatureCollection, Geometry
 from pydantic import Field
@@ -29,3 +30,12 @@ class QueryBatchRequestIn(StrictBaseModel):
 
 class CsvQueryRequestIn(QueryRequestIn):
     delimiter: Delimiters = Delimiters.comma
+
+
+class AsyncQueryRequestIn(QueryRequestIn):
+    format: AsyncQueryFormat = Field(
+        AsyncQueryFormat.csv, description="File format of the exported results."
+    )
+    delimiter: Delimiters = Field(
+        Delimiters.comma, description="Delimiter to use for CSV results."
+    )
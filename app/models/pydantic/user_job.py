@@ -10,7 +10,7 @@ class UserJob(BaseModel):
     job_id: UUID
     job_link: Optional[str]   # Full URL to check the job status
     status: str = "pending"   # Can be pending, success, partial_success, failure, and error
-    message: Optional[str]    # Error message when status is "error"
+    message: Optional[str]    # Error message when status is "error", or the stage of a pending table query
     download_link: Optional[str] = None
     failed_geometries_link: Optional[str] = None
     progress: Optional[str] = "0%"
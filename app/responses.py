@@ -1,6 +1,6 @@
 import decimal
 import io
-from typing import Any
+from typing import Any, Callable
 import asyncpg
 
 import orjson
@@ -9,6 +9,13 @@ from starlette.background import BackgroundTask
 
 
 class ORJSONLiteResponse(Response):
+    """Serialize content with ORJSON only.
+
+    Returning this response from a route bypasses validation and
+    encoding against the route's response_model, which is then only
+    used for the OpenAPI schema.
+    """
+
     media_type = "application/json"
 
     def __init__(
@@ -17,8 +24,30 @@ class ORJSONLiteResponse(Response):
         status_code: int = 200,
         headers: dict = None,
         background: BackgroundTask = None,
+        default: Callable[[Any], Any] = None,
+    ) -> None:
+        serialized_content = orjson.dumps(
+            content, default=default if default else jsonencoder_lite
+        )
+        super().__init__(
+            serialized_content, status_code, headers, self.media_type, background
+        )
+
+
+class JSENDRawDataResponse(Response):
+    """Wrap already serialized JSON data into a JSEND success envelope
+    without parsing it again."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        data: bytes,
+        status_code: int = 200,
+        headers: dict = None,
+        background: BackgroundTask = None,
     ) -> None:
-        serialized_content = orjson.dumps(content, default=jsonencoder_lite)
+        serialized_content = b'{"data":' + data + b',"status":"success"}'
         super().__init__(
             serialized_content, status_code, headers, self.media_type, background
         )
@@ -51,7 +51,10 @@ from ...models.pydantic.asset_metadata import (
 )
 from ...models.pydantic.assets import AssetResponse, AssetType, AssetUpdateIn
 from ...models.pydantic.authentication import User
-from ...models.pydantic.change_log import ChangeLog, ChangeLogResponse
+from ...models.pydantic.change_log import (
+    ChangeLogResponse,
+    PaginatedChangeLogResponse,
+)
 from ...models.pydantic.creation_options import (
     CreationOptions,
     CreationOptionsResponse,
@@ -71,6 +74,7 @@ from ...tasks.delete_assets import (
 from ...utils.paginate import paginate_collection
 from ...utils.path import infer_srid_from_grid, split_s3_path
 from ..assets import asset_response
+from ..change_logs import change_log_response
 from ..datasets import _get_presigned_url
 from ..datasets.dataset import get_owner
 from ..tasks import paginated_tasks_response, tasks_response
@@ -274,15 +278,33 @@ async def get_tasks(
     "/{asset_id}/change_log",
     response_class=ORJSONResponse,
     tags=["Assets"],
-    response_model=ChangeLogResponse,
+    response_model=Union[PaginatedChangeLogResponse, ChangeLogResponse],
 )
-async def get_change_log(asset_id: UUID = Path(...)) -> ChangeLogResponse:
-    asset: ORMAsset = await assets.get_asset(asset_id)
-    change_logs: List[ChangeLog] = [
-        ChangeLog(**change_log) for change_log in asset.change_log
-    ]
+async def get_change_log(
+    *,
+    asset_id: UUID = Path(...),
+    request: Request,
+    page_number: Optional[int] = Query(
+        default=None, alias="page[number]", ge=1, description="The page number."
+    ),
+    page_size: Optional[int] = Query(
+        default=None,
+        alias="page[size]",
+        ge=1,
+        description="The number of change log entries per page. Default is `10`.",
+    ),
+) -> Union[PaginatedChangeLogResponse, ChangeLogResponse]:
+    """Get the change log of selected asset, oldest entries first.
 
-    return ChangeLogResponse(data=change_logs)
+    Will attempt to paginate if `page[size]` or `page[number]` is
+    provided. Otherwise, it will return the entire change log.
+    """
+    # Make sure the asset exists
+    await assets.get_asset(asset_id)
+
+    return await change_log_response(
+        f"{API_URL}{request.url.path}", page_number, page_size, asset_id=asset_id
+    )
 
 
 @router.get(
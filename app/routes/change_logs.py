@@ -0,0 +1,60 @@
+from typing import List, Optional, Union
+
+from fastapi import HTTPException
+
+from ..crud import change_logs
+from ..models.orm.change_logs import ChangeLog as ORMChangeLog
+from ..models.pydantic.change_log import (
+    ChangeLog,
+    ChangeLogResponse,
+    PaginatedChangeLogResponse,
+)
+from ..utils.paginate import paginate_collection
+
+
+def _change_log(row: ORMChangeLog) -> ChangeLog:
+    return ChangeLog(
+        date_time=row.date_time,
+        status=row.status,
+        message=row.message,
+        detail=row.detail,
+    )
+
+
+async def change_log_response(
+    request_url: str,
+    page_number: Optional[int] = None,
+    page_size: Optional[int] = None,
+    **owner,
+) -> Union[PaginatedChangeLogResponse, ChangeLogResponse]:
+    """Serialize the change log of an asset or version, in chronological
+    order.
+
+    Pass either asset_id or dataset and version. Will paginate if
+    page_number or page_size is provided.
+    """
+    if page_number or page_size:
+        try:
+            rows, links, meta = await paginate_collection(
+                paged_items_fn=await change_logs.get_filtered_change_logs_fn(**owner),
+                item_count_fn=await change_logs.count_filtered_change_logs_fn(**owner),
+                request_url=request_url,
+                page=page_number,
+                size=page_size,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+        return PaginatedChangeLogResponse(
+            data=[_change_log(row) for row in rows], links=links, meta=meta
+        )
+
+    if "asset_id" in owner:
+        rows: List[ORMChangeLog] = await change_logs.get_asset_change_logs(
+            owner["asset_id"]
+        )
+    else:
+        rows = await change_logs.get_version_change_logs(
+            owner["dataset"], owner["version"]
+        )
+    return ChangeLogResponse(data=[_change_log(row) for row in rows])
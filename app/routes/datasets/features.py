@@ -10,6 +10,7 @@ from asyncpg import UndefinedTableError
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import ORJSONResponse
 from geojson import Polygon as geoPolygon
+from pydantic.json import pydantic_encoder
 from shapely.geometry import Point
 from shapely.ops import transform
 from sqlalchemy.sql import Select
@@ -20,6 +21,7 @@ from ...crud import assets, metadata as metadata_crud
 from ...models.orm.assets import Asset as ORMAsset
 from ...models.pydantic.asset_metadata import FieldMetadataOut
 from ...models.pydantic.features import FeaturesResponse
+from ...responses import ORJSONLiteResponse
 from ...routes import DATE_REGEX, dataset_version_dependency, version_dependency
 
 router = APIRouter()
@@ -38,6 +40,7 @@ def default_end():
 @router.get(
     "/nasa_viirs_fire_alerts/{version}/features",
     response_class=ORJSONResponse,
+    response_model=FeaturesResponse,
     tags=["Versions"],
 )
 async def get_nasa_viirs_fire_alerts_features(
@@ -77,7 +80,10 @@ async def get_nasa_viirs_fire_alerts_features(
 
 
 @router.get(
-    "/{dataset}/{version}/features", response_class=ORJSONResponse, tags=["Versions"]
+    "/{dataset}/{version}/features",
+    response_class=ORJSONResponse,
+    response_model=FeaturesResponse,
+    tags=["Versions"],
 )
 async def get_features(
     *,
@@ -218,10 +224,17 @@ def _get_buffer_distance(zoom: int) -> float:
     return search_buffer
 
 
-async def _features_response(rows) -> FeaturesResponse:
-    """Serialize ORM response."""
-    data = list(rows)
-    return FeaturesResponse(data=data)
+async def _features_response(rows) -> ORJSONLiteResponse:
+    """Serialize ORM response.
+
+    Rows are serialized directly, without validating them against
+    FeaturesResponse first. Pydantic's encoder keeps the output of
+    FastAPI's encoder, i.e. numeric values are rendered as numbers.
+    """
+    data = [dict(row) for row in rows]
+    return ORJSONLiteResponse(
+        {"data": data, "status": "success"}, default=pydantic_encoder
+    )
 
 
 async def _get_features_by_location_sql(
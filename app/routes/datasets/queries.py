@@ -9,8 +9,8 @@ from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from uuid import UUID, uuid4
 
 import httpx
+import orjson
 from async_lru import alru_cache
-from asyncpg import DataError, InsufficientPrivilegeError, SyntaxOrAccessError
 from botocore.client import BaseClient
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi import Request as FastApiRequest
@@ -19,11 +19,12 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.logger import logger
 from fastapi.openapi.models import APIKey
 from fastapi.responses import ORJSONResponse, RedirectResponse
+from pydantic.json import pydantic_encoder
 from pydantic.tools import parse_obj_as
 
 from app.settings.globals import API_URL
 
-from ...application import db
+from ...application import db, get_query_engine
 from ...authentication.api_keys import get_api_key
 from ...authentication.token import is_authorized_for_query
 from ...crud import assets
@@ -31,13 +32,15 @@ from ...models.enum.assets import AssetType
 from ...models.enum.creation_options import Delimiters
 from ...models.enum.geostore import GeostoreOrigin
 from ...models.enum.pixetl import Grid
-from ...models.enum.queries import QueryFormat, QueryType
+from ...models.enum.queries import AsyncQueryFormat, QueryFormat, QueryType
 from ...models.orm.assets import Asset as AssetORM
 from ...models.orm.queries.raster_assets import data_environment_raster_tile_sets
 from ...models.pydantic.asset_metadata import RasterTable, RasterTableRow
 from ...models.pydantic.creation_options import NoDataType
 from ...models.pydantic.geostore import Geometry, GeostoreCommon
+from ...models.pydantic.jobs import AsyncQueryJob
 from ...models.pydantic.query import (
+    AsyncQueryRequestIn,
     CsvQueryRequestIn,
     QueryBatchRequestIn,
     QueryRequestIn,
@@ -50,18 +53,33 @@ from ...models.pydantic.raster_analysis import (
 )
 from ...models.pydantic.responses import Response
 from ...models.pydantic.user_job import UserJob, UserJobResponse
-from ...responses import CSVStreamingResponse, ORJSONLiteResponse
+from ...responses import (
+    CSVStreamingResponse,
+    JSENDRawDataResponse,
+    ORJSONLiteResponse,
+)
 from ...settings.globals import (
+    ASYNC_QUERY_RESULTS_PREFIX,
+    ASYNC_QUERY_TIMEOUT,
+    DATA_LAKE_BUCKET,
     GEOSTORE_SIZE_LIMIT_OTF,
+    QUERY_JSON_PASSTHROUGH,
     RASTER_ANALYSIS_LAMBDA_NAME,
     RASTER_ANALYSIS_STATE_MACHINE_ARN,
 )
-from ...utils.aws import get_sfn_client, invoke_lambda
+from ...tasks import reader_secrets
+from ...tasks.batch import submit_batch_job
+from ...utils.aws import get_s3_client, get_sfn_client, invoke_lambda
 from ...utils.decorators import hash_dict
 from ...utils.geostore import get_geostore
 from .. import dataset_version_dependency
 from . import _verify_source_file_access
-from .utils.query_helpers import scrutinize_sql
+from .utils.query_helpers import (
+    check_query_cost,
+    ensure_unique_column_names,
+    scrutinize_sql,
+    translate_query_errors,
+)
 
 router = APIRouter()
 
@@ -69,6 +87,10 @@ router = APIRouter()
 # Special suffixes to do an extra area density calculation on the raster data set.
 AREA_DENSITY_RASTER_SUFFIXES = ["_ha-1", "_ha_yr-1"]
 
+# Batch job name used for asynchronous table queries. The job API only
+# reports on Batch jobs with this name.
+ASYNC_QUERY_JOB_NAME = "async_table_query"
+
 
 @router.get(
     "/{dataset}/{version}/query",
@@ -157,10 +179,21 @@ async def query_dataset_json(
     else:
         response.headers["Cache-Control"] = "max-age=7200"  # 2h
 
+    if QUERY_JSON_PASSTHROUGH:
+        json_bytes: bytes = await _query_dataset_json_bytes(
+            dataset, version, sql, geostore
+        )
+        return JSENDRawDataResponse(json_bytes, headers=dict(response.headers))
+
+    # Numeric values are rendered as numbers, as the Response model did
     json_data: List[Dict[str, Any]] = await _query_dataset_json(
-        dataset, version, sql, geostore
+        dataset, version, sql, geostore, exact_numeric=False
+    )
+    return ORJSONLiteResponse(
+        {"data": json_data, "status": "success"},
+        headers=dict(response.headers),
+        default=pydantic_encoder,
     )
-    return Response(data=json_data)
 
 
 @router.get(
@@ -260,10 +293,17 @@ async def query_dataset_json_post(
     else:
         geostore = None
 
+    if QUERY_JSON_PASSTHROUGH:
+        json_bytes: bytes = await _query_dataset_json_bytes(
+            dataset, version, request.sql, geostore
+        )
+        return JSENDRawDataResponse(json_bytes)
+
+    # Numeric values are rendered as exact strings by jsonencoder_lite
     json_data: List[Dict[str, Any]] = await _query_dataset_json(
         dataset, version, request.sql, geostore
     )
-    return ORJSONLiteResponse(Response(data=json_data).dict())
+    return ORJSONLiteResponse({"data": json_data, "status": "success"})
 
 
 @router.post(
@@ -417,6 +457,120 @@ async def query_dataset_list_post(
     return UserJobResponse(data=UserJob(job_id=job_id, job_link=job_link))
 
 
+@router.post(
+    "/{dataset}/{version}/query/async",
+    response_class=ORJSONResponse,
+    response_model=UserJobResponse,
+    tags=["Query"],
+    status_code=202,
+)
+async def query_dataset_async_post(
+    *,
+    dataset_version: Tuple[str, str] = Depends(dataset_version_dependency),
+    request: AsyncQueryRequestIn,
+    is_authorized: bool = Depends(is_authorized_for_query),
+    api_key: APIKey = Depends(get_api_key),
+):
+    """Execute a long running READ-ONLY SQL query on the given database table
+    dataset version and export the results to a CSV or Parquet file.
+
+    The query is validated the same way as for /query/json, but runs on
+    a dedicated worker with a timeout of several minutes or more instead
+    of the regular request timeout. Results are streamed to storage and
+    are never held in the API. Use this path for large extracts or
+    expensive aggregations which are rejected or time out on
+    /query/json and /query/csv.
+
+    The response includes a job_id. Poll the job via the /job/{job_id}
+    API. When "data.status" indicates "success", the results are
+    available at the specified "data.download_link". A status of
+    "failed" includes the reason in "data.message".
+    """
+
+    dataset, version = dataset_version
+
+    default_asset: AssetORM = await assets.get_default_asset(dataset, version)
+    if default_asset.asset_type not in [
+        AssetType.geo_database_table,
+        AssetType.database_table,
+    ]:
+        raise HTTPException(
+            status_code=400,
+            detail="Asynchronous queries are only available for database tables.",
+        )
+
+    sql = await scrutinize_sql(dataset, version, request.geometry, request.sql)
+
+    try:
+        sql_uri: str = _upload_async_query_sql(sql)
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            500, f"There was an error starting your job. Error details: {str(e)}"
+        )
+
+    job = AsyncQueryJob(
+        dataset=dataset,
+        job_name=ASYNC_QUERY_JOB_NAME,
+        command=_async_query_command(sql_uri, request.format, request.delimiter),
+        environment=reader_secrets
+        + [
+            {
+                "name": "PGOPTIONS",
+                "value": f"-c statement_timeout={ASYNC_QUERY_TIMEOUT * 1000}",
+            }
+        ],
+    )
+
+    try:
+        job_id: UUID = submit_batch_job(job)
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            500, f"There was an error starting your job. Error details: {str(e)}"
+        )
+
+    job_link = f"{API_URL}/job/{job_id}"
+    return UserJobResponse(data=UserJob(job_id=job_id, job_link=job_link))
+
+
+def _upload_async_query_sql(sql: str) -> str:
+    """Upload the SQL of an asynchronous query to the data lake.
+
+    The SQL can include large inlined geometries, and Batch limits the
+    size of job container overrides to about 30 KiB, so it isn't passed
+    in the job command.
+    """
+    key = f"{ASYNC_QUERY_RESULTS_PREFIX}/queries/{uuid4()}.sql"
+    get_s3_client().put_object(Bucket=DATA_LAKE_BUCKET, Key=key, Body=sql.encode())
+    return f"s3://{DATA_LAKE_BUCKET}/{key}"
+
+
+def _async_query_command(
+    sql_uri: str, format: AsyncQueryFormat, delimiter: Delimiters
+) -> List[str]:
+    return [
+        "export_query_results.sh",
+        "--sql_uri",
+        sql_uri,
+        "-F",
+        format.value,
+        "-D",
+        delimiter.encode(
+            "unicode_escape"
+        ).decode(),  # Need to escape special characters such as TAB for batch job payload
+        "--target_bucket",
+        DATA_LAKE_BUCKET,
+        "--prefix",
+        ASYNC_QUERY_RESULTS_PREFIX,
+    ]
+
+
+def get_async_query_results_path(job_id: UUID, format: AsyncQueryFormat) -> str:
+    """Location of the results of an asynchronous table query."""
+    return f"s3://{DATA_LAKE_BUCKET}/{ASYNC_QUERY_RESULTS_PREFIX}/{job_id}/results.{format.value}"
+
+
 async def _start_batch_execution(
     sfn_client: BaseClient, job_id: UUID, input: Dict[str, Any]
 ) -> None:
@@ -433,13 +587,22 @@ async def _query_dataset_json(
     sql: str,
     geostore: Optional[GeostoreCommon],
     raster_version_overrides: Dict[str, str] = {},
+    exact_numeric: bool = True,
 ) -> List[Dict[str, Any]]:
+    """Query a dataset version.
+
+    Numeric values of table queries are returned as Decimals, unless
+    exact_numeric is false, in which case they are returned as floats
+    (see _query_table).
+    """
     # Make sure we can query the dataset
     default_asset: AssetORM = await assets.get_default_asset(dataset, version)
     query_type = _get_query_type(default_asset, geostore)
     if query_type == QueryType.table:
         geometry = geostore.geojson if geostore else None
-        return await _query_table(dataset, version, sql, geometry)
+        return await _query_table(
+            dataset, version, sql, geometry, exact_numeric=exact_numeric
+        )
     elif query_type == QueryType.raster:
         geostore = cast(GeostoreCommon, geostore)
         results = await _query_raster(
@@ -457,6 +620,33 @@ async def _query_dataset_json(
         )
 
 
+async def _query_dataset_json_bytes(
+    dataset: str,
+    version: str,
+    sql: str,
+    geostore: Optional[GeostoreCommon],
+) -> bytes:
+    """Same as _query_dataset_json, but return the data serialized as JSON.
+
+    Table queries are serialized by PostgreSQL, so no Python objects are
+    created per row.
+    """
+    default_asset: AssetORM = await assets.get_default_asset(dataset, version)
+    query_type = _get_query_type(default_asset, geostore)
+    if query_type == QueryType.table:
+        geometry = geostore.geojson if geostore else None
+        return await _query_table_json(dataset, version, sql, geometry)
+    elif query_type == QueryType.raster:
+        geostore = cast(GeostoreCommon, geostore)
+        results = await _query_raster(dataset, default_asset, sql, geostore)
+        return orjson.dumps(results["data"], default=pydantic_encoder)
+    else:
+        raise HTTPException(
+            status_code=501,
+            detail="This endpoint is not implemented for the given dataset.",
+        )
+
+
 async def _query_dataset_csv(
     dataset: str,
     version: str,
@@ -508,23 +698,51 @@ async def _query_table(
     version: str,
     sql: str,
     geometry: Optional[Geometry],
+    exact_numeric: bool = True,
 ) -> List[Dict[str, Any]]:
+    """Query a table.
+
+    Numeric values are returned as Decimals with all their digits. If
+    exact_numeric is false, the query runs on the user query engine
+    instead, which returns them as floats and skips the Decimal objects
+    for callers which render numbers anyway.
+    """
     # Parse and validate SQL statement
     sql = await scrutinize_sql(dataset, version, geometry, sql)
 
-    try:
-        rows = await db.all(sql)
+    with translate_query_errors():
+        await check_query_cost(dataset, sql)
+        rows = await get_query_engine(exact_numeric).all(sql)
         response: List[Dict[str, Any]] = [dict(row) for row in rows]
-    except InsufficientPrivilegeError:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to execute this query."
-        )
-    except (SyntaxOrAccessError, DataError) as e:
-        raise HTTPException(status_code=400, detail=f"Bad request. {str(e)}")
 
     return response
 
 
+async def _query_table_json(
+    dataset: str,
+    version: str,
+    sql: str,
+    geometry: Optional[Geometry],
+) -> bytes:
+    """Query a table and let PostgreSQL serialize the rows into a JSON
+    array.
+
+    Result columns must have unique names, as each becomes a key of the
+    row objects.
+    """
+    # Parse and validate SQL statement
+    sql = await scrutinize_sql(dataset, version, geometry, sql)
+    ensure_unique_column_names(sql)
+
+    with translate_query_errors():
+        await check_query_cost(dataset, sql)
+        json_data: str = await get_query_engine().scalar(
+            f"SELECT coalesce(json_agg(t), '[]'::json) FROM ({sql}) AS t"
+        )
+
+    return json_data.encode()
+
+
 def _orm_to_csv(
     data: List[Dict[str, Any]], delimiter: Delimiters = Delimiters.comma
 ) -> StringIO:
@@ -1,23 +1,45 @@
+import json
 import re
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, cast
 from urllib.parse import unquote
 
+from async_lru import alru_cache
+from asyncpg import (
+    DataError,
+    InsufficientPrivilegeError,
+    InternalServerError,
+    QueryCanceledError,
+    SyntaxOrAccessError,
+)
 from fastapi import HTTPException
 from pglast import printers  # noqa
 from pglast import parse_sql
 from pglast.ast import (
+    A_Star,
     BoolExpr,
+    CaseExpr,
+    CoalesceExpr,
+    ColumnRef,
     FuncCall,
     RangeSubselect,
     RangeVar,
     RawStmt,
+    ResTarget,
     SelectStmt,
     SQLValueFunction,
+    TypeCast,
 )
 from pglast.ast import String as PgString
 from pglast.parser import ParseError
 from pglast.stream import RawStream
+from shapely import get_num_coordinates
+from shapely.errors import ShapelyError
+from shapely.geometry import shape
+from sqlalchemy import text
 
+from ....application import get_query_engine
 from ....models.enum.pg_admin_functions import (
     advisory_lock_functions,
     backup_control_functions,
@@ -46,6 +68,11 @@ from ....models.enum.pg_sys_functions import (
     transaction_ids_and_snapshots,
 )
 from ....models.pydantic.geostore import Geometry
+from ....settings.globals import (
+    DEFAULT_QUERY_COST_LIMIT,
+    QUERY_COST_LIMITS,
+    QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES,
+)
 
 FORBIDDEN_FUNCTION_GROUPS: List[List[str]] = [
     configuration_settings_functions,
@@ -241,7 +268,7 @@ async def _add_geometry_filter(
     """Add a geometry intersection filter to the WHERE clause of a parsed SQL
     statement."""
     # Create the geometry filter as a separate parsed statement
-    intersect_filter = f"SELECT WHERE ST_Intersects(geom, ST_SetSRID(ST_GeomFromGeoJSON('{geometry.json()}'),4326))"
+    intersect_filter = f"SELECT WHERE {await _geometry_filter_sql(geometry)}"
     parsed_filter = parse_sql(intersect_filter)
 
     # Extract the WHERE clause from the filter statement
@@ -266,6 +293,122 @@ async def _add_geometry_filter(
     return parsed_sql
 
 
+async def _geometry_filter_sql(geometry: Geometry) -> str:
+    """Return the condition for rows intersecting the geometry.
+
+    Large geometries are replaced by their subdivided pieces. The
+    bounding box of the whole geometry still lets PostgreSQL use the
+    spatial index, and rows are then tested against the few small pieces
+    they overlap only.
+    """
+    geojson: str = geometry.json()
+    max_vertices: Optional[int] = QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES
+    if max_vertices is not None:
+        try:
+            geom = shape(geometry.dict())
+        except (ShapelyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid geometry. {e}")
+        if get_num_coordinates(geom) > max_vertices:
+            with translate_query_errors():
+                try:
+                    pieces: List[str] = await subdivide_geometry(
+                        geojson, max_vertices
+                    )
+                except InternalServerError as e:
+                    # GEOS errors, ie for invalid geometries
+                    raise HTTPException(
+                        status_code=400, detail=f"Invalid geometry. {e}"
+                    )
+                except QueryCanceledError:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Geometry is too complex to subdivide.",
+                    )
+            xmin, ymin, xmax, ymax = geom.bounds
+            pieces_array = ", ".join(f"'{piece}'" for piece in pieces)
+            return (
+                f"geom && ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}, 4326)"
+                " AND EXISTS (SELECT 1 FROM"
+                f" unnest(CAST(ARRAY[{pieces_array}] AS geometry[])) AS piece"
+                " WHERE ST_Intersects(geom, piece))"
+            )
+
+    return f"ST_Intersects(geom, ST_SetSRID(ST_GeomFromGeoJSON('{geojson}'),4326))"
+
+
+@alru_cache(maxsize=32)
+async def subdivide_geometry(geojson: str, max_vertices: int) -> List[str]:
+    """Split a GeoJSON geometry into pieces of at most max_vertices
+    vertices, as hex-encoded EWKB.
+
+    The pieces are cached by geometry, so each geostore is only
+    subdivided once.
+    """
+    rows = await get_query_engine().all(
+        text(
+            "SELECT encode(ST_AsEWKB(ST_Subdivide("
+            "ST_SetSRID(ST_GeomFromGeoJSON(:geojson), 4326), :max_vertices"
+            ")), 'hex') AS piece"
+        ).bindparams(geojson=geojson, max_vertices=max_vertices)
+    )
+    return [row.piece for row in rows]
+
+
+@contextmanager
+def translate_query_errors() -> Iterator[None]:
+    """Turn database errors caused by user SQL into HTTP errors."""
+    try:
+        yield
+    except InsufficientPrivilegeError:
+        raise HTTPException(
+            status_code=403, detail="Not authorized to execute this query."
+        )
+    except (SyntaxOrAccessError, DataError) as e:
+        raise HTTPException(status_code=400, detail=f"Bad request. {str(e)}")
+
+
+def _column_name(node: Any) -> Optional[str]:
+    """Return the name PostgreSQL gives to an unnamed result column, or
+    None for `*`."""
+    if isinstance(node, ColumnRef):
+        last_field = node.fields[-1]
+        return None if isinstance(last_field, A_Star) else last_field.sval
+    if isinstance(node, FuncCall):
+        return node.funcname[-1].sval
+    if isinstance(node, TypeCast):
+        name = _column_name(node.arg)
+        return name if name != "?column?" else node.typeName.names[-1].sval
+    if isinstance(node, CaseExpr):
+        return "case"
+    if isinstance(node, CoalesceExpr):
+        return "coalesce"
+    return "?column?"
+
+
+def ensure_unique_column_names(sql: str) -> None:
+    """Reject a scrutinized SQL statement with several result columns of
+    the same name.
+
+    Names are taken from the parsed select list, so columns expanded
+    from `*` are not checked.
+    """
+    select_stmt: SelectStmt = cast(SelectStmt, parse_sql(sql)[0].stmt)
+
+    names: Set[str] = set()
+    for target in select_stmt.targetList or ():
+        target = cast(ResTarget, target)
+        name = target.name if target.name else _column_name(target.val)
+        if name is None:
+            continue
+        if name in names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Column name {name} is used more than once. "
+                "Please give result columns unique names.",
+            )
+        names.add(name)
+
+
 def quote_ident(ident: str) -> str:
     # safe-ish Postgres identifier quoting
     return '"' + ident.replace('"', '""') + '"'
@@ -435,3 +578,51 @@ async def _replace_from_clause(from_part: str, sql_in: str) -> str:
         flags=re.IGNORECASE,
     )
     return sql_out
+
+
+def get_query_cost_limit(dataset: str) -> Optional[float]:
+    """Return the maximum estimated query cost allowed for a dataset.
+
+    Exact dataset names take precedence over fnmatch patterns, which in
+    turn take precedence over the default limit. None means queries
+    against the dataset are not cost-checked.
+    """
+    if dataset in QUERY_COST_LIMITS:
+        return QUERY_COST_LIMITS[dataset]
+    for pattern, limit in QUERY_COST_LIMITS.items():
+        if fnmatch(dataset, pattern):
+            return limit
+    return DEFAULT_QUERY_COST_LIMIT
+
+
+@alru_cache(maxsize=256, ttl=3600.0)
+async def estimate_query_cost(sql: str) -> float:
+    """Ask the planner for the estimated total cost of a scrutinized SQL
+    statement.
+
+    The estimate is cached by SQL string, so repeated queries only pay
+    for the EXPLAIN once.
+    """
+    plan = await get_query_engine().scalar(f"EXPLAIN (FORMAT JSON) {sql}")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0]["Plan"]["Total Cost"])
+
+
+async def check_query_cost(dataset: str, sql: str) -> None:
+    """Reject scrutinized SQL whose estimated cost exceeds the ceiling
+    configured for the dataset."""
+    limit: Optional[float] = get_query_cost_limit(dataset)
+    if limit is None:
+        return
+
+    cost: float = await estimate_query_cost(sql)
+    if cost > limit:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Estimated query cost {cost:.0f} exceeds the limit of {limit:.0f} "
+                "for this dataset. Please add filters, or use the /query/async "
+                "endpoint to run the query as a background job."
+            ),
+        )
@@ -18,6 +18,7 @@ from fastapi import (
     Depends,
     HTTPException,
     Query,
+    Request,
     Response,
     status,
 )
@@ -37,7 +38,10 @@ from ...models.pydantic.asset_metadata import (
     RasterBandsMetadataResponse,
 )
 from ...models.pydantic.authentication import User
-from ...models.pydantic.change_log import ChangeLog, ChangeLogResponse
+from ...models.pydantic.change_log import (
+    ChangeLogResponse,
+    PaginatedChangeLogResponse,
+)
 from ...models.pydantic.creation_options import (
     CreationOptions,
     CreationOptionsResponse,
@@ -61,10 +65,11 @@ from ...models.pydantic.versions import (
     VersionUpdateIn,
 )
 from ...routes import dataset_dependency, dataset_version_dependency, version_dependency
-from ...settings.globals import TILE_CACHE_CLOUDFRONT_ID
+from ...settings.globals import API_URL, TILE_CACHE_CLOUDFRONT_ID
 from ...tasks.aws_tasks import flush_cloudfront_cache
 from ...tasks.default_assets import append_default_asset, create_default_asset
 from ...tasks.delete_assets import delete_all_assets
+from ..change_logs import change_log_response
 from . import _verify_source_file_access
 from .dataset import get_owner
 from .queries import _get_data_environment
@@ -318,16 +323,36 @@ async def delete_version(
     "/{dataset}/{version}/change_log",
     response_class=ORJSONResponse,
     tags=["Versions"],
-    response_model=ChangeLogResponse,
+    response_model=Union[PaginatedChangeLogResponse, ChangeLogResponse],
 )
-async def get_change_log(dv: Tuple[str, str] = Depends(dataset_version_dependency)):
+async def get_change_log(
+    *,
+    dv: Tuple[str, str] = Depends(dataset_version_dependency),
+    request: Request,
+    page_number: Optional[int] = Query(
+        default=None, alias="page[number]", ge=1, description="The page number."
+    ),
+    page_size: Optional[int] = Query(
+        default=None,
+        alias="page[size]",
+        ge=1,
+        description="The number of change log entries per page. Default is `10`.",
+    ),
+) -> Union[PaginatedChangeLogResponse, ChangeLogResponse]:
+    """Get the change log of a dataset version, oldest entries first.
+
+    Will attempt to paginate if `page[size]` or `page[number]` is
+    provided. Otherwise, it will return the entire change log.
+    """
     dataset, version = dv
-    v: ORMVersion = await versions.get_version(dataset, version)
-    change_logs: List[ChangeLog] = [
-        ChangeLog(**change_log) for change_log in v.change_log
-    ]
 
-    return ChangeLogResponse(data=change_logs)
+    return await change_log_response(
+        f"{API_URL}{request.url.path}",
+        page_number,
+        page_size,
+        dataset=dataset,
+        version=version,
+    )
 
 
 @router.get(
@@ -1,7 +1,7 @@
 """Retrieve a geometry using its md5 hash for a given dataset, user defined
 geometries in the datastore."""
 
-from typing import Annotated, Optional
+from typing import Annotated, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Header, HTTPException, Path, Query, Request
@@ -18,11 +18,16 @@ from ...errors import (
 from ...models.pydantic.geostore import (
     AdminGeostoreResponse,
     AdminListResponse,
+    Geometry,
     Geostore,
     GeostoreIn,
+    GeostoreLookupIn,
     GeostoreResponse,
+    GeostoresIn,
+    GeostoresResponse,
     RWGeostoreIn,
 )
+from ...utils.geojson import round_geometry
 from ...utils.rw_api import create_rw_geostore
 from ...utils.rw_api import get_boundary_by_country_id as rw_get_boundary_by_country_id
 from ...utils.rw_api import (
@@ -35,6 +40,14 @@ from ...utils.rw_api import (
 
 router = APIRouter()
 
+PRECISION_QUERY = Query(
+    None,
+    ge=0,
+    le=15,
+    description="Maximum number of decimal places of coordinates. "
+    "Only applies to geostores of the GFW Data API.",
+)
+
 
 @router.post(
     "/",
@@ -64,6 +77,55 @@ async def add_new_geostore(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/bulk",
+    response_class=ORJSONResponse,
+    response_model=GeostoresResponse,
+    status_code=201,
+    tags=["Geostore"],
+)
+async def add_new_geostores(
+    *,
+    request: GeostoresIn,
+    x_api_key: Annotated[str | None, Header()] = None,
+):
+    """Add many geostore features to user area of geostore at once.
+
+    Geostores are returned in the order of the submitted geometries.
+    Only GFW Data API style geometries are supported.
+    """
+    try:
+        new_user_areas: List[Geostore] = await geostore.create_user_areas(
+            request.geometries
+        )
+        return GeostoresResponse(data=new_user_areas)
+    except BadRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/lookup",
+    response_class=ORJSONResponse,
+    response_model=GeostoresResponse,
+    tags=["Geostore"],
+)
+async def get_geostores(
+    *,
+    request: GeostoreLookupIn,
+    x_api_key: Annotated[str | None, Header()] = None,
+):
+    """Retrieve GeoJSON representations for many geostore IDs of any dataset
+    at once.
+
+    Only GFW Data API geostore IDs (UUIDs) are supported. IDs which do
+    not exist are omitted from the response.
+    """
+    result: List[Geostore] = await geostore.get_gfw_geostores_from_any_dataset(
+        request.geostore_ids
+    )
+    return GeostoresResponse(data=result)
+
+
 @router.get(
     "/{geostore_id}",
     response_class=ORJSONResponse,
@@ -74,18 +136,28 @@ async def get_any_geostore(
     *,
     geostore_id: str = Path(..., title="geostore_id"),
     request: Request,
+    precision: Optional[int] = PRECISION_QUERY,
     x_api_key: Annotated[str | None, Header()] = None,
 ):
     """Retrieve GeoJSON representation for a given geostore ID of any dataset.
 
     If the provided ID is in UUID style, get from the GFW Data API.
-    Otherwise, forward request to RW API.
+    Otherwise, forward request to RW API (precision is not supported for
+    these).
     """
     try:
         geostore_uuid = UUID(geostore_id)
         if str(geostore_uuid) == geostore_id:
             try:
                 result = await geostore.get_gfw_geostore_from_any_dataset(geostore_uuid)
+                if precision is not None:
+                    result = result.copy(
+                        update={
+                            "gfw_geojson": Geometry.parse_obj(
+                                round_geometry(result.gfw_geojson.dict(), precision)
+                            )
+                        }
+                    )
                 return GeostoreResponse(data=result)
             except RecordNotFoundError as e:
                 raise HTTPException(status_code=404, detail=str(e))
@@ -150,6 +222,7 @@ async def get_boundary_by_country_id(
         "3.6", alias="source[version]", description="Version of admin boundaries"
     ),
     simplify: Optional[float] = Query(None, description="Simplify tolerance"),
+    precision: Optional[int] = PRECISION_QUERY,
     x_api_key: Annotated[str | None, Header()] = None,
 ):
     """Get an administrative boundary by country ID (proxies requests for GADM
@@ -165,7 +238,12 @@ async def get_boundary_by_country_id(
     else:
         try:
             result = await geostore.get_gadm_geostore(
-                admin_provider, admin_version, 0, simplify, country_id
+                admin_provider,
+                admin_version,
+                0,
+                simplify,
+                country_id,
+                precision=precision,
             )
         except (BadAdminSourceException, BadAdminVersionException) as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -196,6 +274,7 @@ async def rw_get_boundary_by_region_id(
         "3.6", alias="source[version]", description="Version of admin boundaries"
     ),
     simplify: Optional[float] = Query(None, description="Simplify tolerance"),
+    precision: Optional[int] = PRECISION_QUERY,
     x_api_key: Annotated[str | None, Header()] = None,
 ):
     """Get an administrative boundary by country and region IDs (proxies requests for GADM
@@ -211,7 +290,13 @@ async def rw_get_boundary_by_region_id(
     else:
         try:
             result = await geostore.get_gadm_geostore(
-                admin_provider, admin_version, 1, simplify, country_id, region_id
+                admin_provider,
+                admin_version,
+                1,
+                simplify,
+                country_id,
+                region_id,
+                precision=precision,
             )
         except (BadAdminSourceException, BadAdminVersionException) as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -243,6 +328,7 @@ async def rw_get_boundary_by_subregion_id(
         "3.6", alias="source[version]", description="Version of admin boundaries"
     ),
     simplify: Optional[float] = Query(None, description="Simplify tolerance"),
+    precision: Optional[int] = PRECISION_QUERY,
     x_api_key: Annotated[str | None, Header()] = None,
 ):
     """Get an administrative boundary by country, region, and subregion IDs
@@ -265,6 +351,7 @@ async def rw_get_boundary_by_subregion_id(
                 country_id,
                 region_id,
                 subregion_id,
+                precision=precision,
             )
         except (BadAdminSourceException, BadAdminVersionException) as e:
             raise HTTPException(status_code=400, detail=str(e))
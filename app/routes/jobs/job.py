@@ -1,11 +1,12 @@
 """Jobs represent long running analysis tasks. Certain APIs, like querying like
-a list, will return immediately with a job_id. You can poll the job until it's
-complete, and a download like will be provided.
+a list or running an asynchronous table query, will return immediately with a
+job_id. You can poll the job until it's complete, and a download like will be
+provided.
 
 Jobs are only saved for 90 days.
 """
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 import botocore
@@ -13,10 +14,12 @@ from fastapi import APIRouter, HTTPException, Path
 from fastapi.logger import logger
 from fastapi.responses import ORJSONResponse
 
+from ...models.enum.queries import AsyncQueryFormat
 from ...models.pydantic.user_job import UserJob, UserJobResponse
 from ...settings.globals import RASTER_ANALYSIS_STATE_MACHINE_ARN
-from ...utils.aws import get_sfn_client
+from ...utils.aws import get_batch_client, get_sfn_client
 from ..datasets import _get_presigned_url_from_path
+from ..datasets.queries import ASYNC_QUERY_JOB_NAME, get_async_query_results_path
 
 router = APIRouter()
 
@@ -34,9 +37,14 @@ async def get_job(*, job_id: UUID = Path(...)) -> UserJobResponse:
     """
     try:
         job = await _get_user_job(job_id)
-        return UserJobResponse(data=job)
     except botocore.exceptions.ClientError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        # Not a list query, check if it is an asynchronous table query
+        batch_job = await _get_batch_job(job_id)
+        if batch_job is None:
+            raise HTTPException(status_code=404, detail=str(e))
+        job = await _get_async_query_job(job_id, batch_job)
+
+    return UserJobResponse(data=job)
 
 
 async def _get_user_job(job_id: UUID) -> UserJob:
@@ -124,3 +132,51 @@ async def _get_map_run(execution: Dict[str, Any]) -> Dict[str, Any]:
     map_run_arn = map_runs[0]["mapRunArn"]
     map_run = get_sfn_client().describe_map_run(mapRunArn=map_run_arn)
     return map_run
+
+
+async def _get_batch_job(job_id: UUID) -> Optional[Dict[str, Any]]:
+    """Return the Batch job of an asynchronous table query, or None if there
+    is no such job."""
+    try:
+        batch_jobs = get_batch_client().describe_jobs(jobs=[str(job_id)])["jobs"]
+    except botocore.exceptions.ClientError as e:
+        logger.error(e)
+        return None
+
+    # Never report on other Batch jobs, such as asset creation jobs
+    for batch_job in batch_jobs:
+        if batch_job["jobName"] == ASYNC_QUERY_JOB_NAME:
+            return batch_job
+    return None
+
+
+async def _get_async_query_job(job_id: UUID, batch_job: Dict[str, Any]) -> UserJob:
+    if batch_job["status"] == "SUCCEEDED":
+        command = batch_job["container"]["command"]
+        format = AsyncQueryFormat(command[command.index("-F") + 1])
+        download_link = await _get_presigned_url_from_path(
+            get_async_query_results_path(job_id, format)
+        )
+        return UserJob(
+            job_id=job_id,
+            status="success",
+            download_link=download_link,
+            progress="100%",
+        )
+    elif batch_job["status"] == "FAILED":
+        return UserJob(
+            job_id=job_id,
+            status="failed",
+            message=batch_job.get("statusReason"),
+            progress=None,
+        )
+    else:
+        # SUBMITTED, PENDING, RUNNABLE, STARTING or RUNNING. The query
+        # writes its results in a single pass, so there is no finer
+        # progress to report than the stage of the Batch job.
+        return UserJob(
+            job_id=job_id,
+            status="pending",
+            message=f"Batch job status: {batch_job['status']}",
+            progress="0%",
+        )
@@ -1,16 +1,20 @@
 from typing import Annotated, Any, Dict, List
 
 from fastapi import APIRouter, HTTPException, Query
-from unidecode import unidecode
 
+from app.crud.admin_boundaries import get_admin_boundary_index
 from app.models.pydantic.political import (
     AdminIDLookupQueryParams,
     AdminIDLookupResponse,
     AdminIDLookupResponseData,
 )
 from app.routes.datasets.queries import _query_dataset_json
-from app.settings.globals import ENV, per_env_admin_boundary_versions
-from app.utils.gadm import extract_level_id
+from app.settings.globals import (
+    ADMIN_BOUNDARY_DATASETS,
+    ENV,
+    per_env_admin_boundary_versions,
+)
+from app.utils.gadm import extract_level_id, normalize_name
 
 router = APIRouter()
 
@@ -19,16 +23,14 @@ router = APIRouter()
 async def id_lookup(params: Annotated[AdminIDLookupQueryParams, Query()]):
     """Look up administrative boundary IDs matching a specified country name
     (and region name and subregion name, if specified)."""
-    admin_source_to_dataset: Dict[str, str] = {"GADM": "gadm_administrative_boundaries"}
-
     try:
-        dataset: str = admin_source_to_dataset[params.admin_source]
+        dataset: str = ADMIN_BOUNDARY_DATASETS[params.admin_source]
     except KeyError:
         raise HTTPException(
             status_code=400,
             detail=(
                 "Invalid admin boundary source. Valid sources:"
-                f" {[source for source in admin_source_to_dataset.keys()]}"
+                f" {[source for source in ADMIN_BOUNDARY_DATASETS.keys()]}"
             ),
         )
 
@@ -42,13 +44,27 @@ async def id_lookup(params: Annotated[AdminIDLookupQueryParams, Query()]):
 
     adm_level: int = determine_admin_level(*names)
 
-    sql: str = _admin_boundary_lookup_sql(
-        adm_level, params.normalize_search, dataset, *names
-    )
-
-    json_data: List[Dict[str, Any]] = await _query_dataset_json(
-        dataset, version_str, sql, None
-    )
+    json_data: List[Dict[str, Any]]
+    index = get_admin_boundary_index(dataset, version_str)
+    if index is not None:
+        json_data = [
+            boundary._asdict()
+            for boundary in index.find_by_name(
+                adm_level,
+                params.normalize_search,
+                *names,
+                prefix=params.prefix_search,
+            )
+        ]
+    else:
+        sql: str = _admin_boundary_lookup_sql(
+            adm_level,
+            params.normalize_search,
+            dataset,
+            *names,
+            prefix_search=params.prefix_search,
+        )
+        json_data = await _query_dataset_json(dataset, version_str, sql, None)
 
     return form_admin_id_lookup_response(
         params.admin_source, params.admin_version, adm_level, json_data
@@ -73,7 +89,7 @@ def normalize_names(
 
     for name in (country, region, subregion):
         if name and normalize_search:
-            names.append(unidecode(name).lower())
+            names.append(normalize_name(name))
         elif name:
             names.append(name)
         else:
@@ -103,6 +119,7 @@ def _admin_boundary_lookup_sql(
     country_name: str,
     region_name: str | None,
     subregion_name: str | None,
+    prefix_search: bool = False,
 ) -> str:
     """Generate the SQL required to look up administrative boundary IDs by
     name."""
@@ -112,20 +129,37 @@ def _admin_boundary_lookup_sql(
     else:
         match_name_fields = name_fields
 
+    if prefix_search:
+        operator = " LIKE "
+        country_name = _like_prefix(country_name)
+        region_name = _like_prefix(region_name) if region_name else region_name
+        subregion_name = (
+            _like_prefix(subregion_name) if subregion_name else subregion_name
+        )
+    else:
+        operator = "="
+
     sql = (
         f"SELECT gid_0, gid_1, gid_2, {name_fields[0]}, {name_fields[1]}, {name_fields[2]}"
-        f" FROM {dataset} WHERE {match_name_fields[0]}=$country${country_name}$country$"
+        f" FROM {dataset} WHERE {match_name_fields[0]}{operator}$country${country_name}$country$"
     )
     if region_name is not None:
-        sql += f" AND {match_name_fields[1]}=$region${region_name}$region$"
+        sql += f" AND {match_name_fields[1]}{operator}$region${region_name}$region$"
     if subregion_name is not None:
-        sql += f" AND {match_name_fields[2]}=$subregion${subregion_name}$subregion$"
+        sql += f" AND {match_name_fields[2]}{operator}$subregion${subregion_name}$subregion$"
 
     sql += f" AND adm_level='{adm_level}'"
 
     return sql
 
 
+def _like_prefix(name: str) -> str:
+    """Turn a name into a LIKE pattern matching all names starting with
+    it."""
+    escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
 def lookup_admin_source_version(source: str, version: str) -> str:
     # The AdminIDLookupQueryParams validator should have already ensured
     # that the following is safe
@@ -21,7 +21,6 @@ from ...models.enum.change_log import ChangeLogStatus
 from ...models.enum.versions import VersionStatus
 from ...models.orm.assets import Asset as ORMAsset
 from ...models.orm.queries.fields import fields
-from ...models.orm.tasks import Task as ORMTask
 from ...models.pydantic.asset_metadata import (
     DynamicVectorTileCacheMetadata,
     FieldMetadataOut,
@@ -192,58 +191,47 @@ async def _check_completed(asset_id: UUID):
 
     If yes, set asset status to `saved`. If asset is default asset, also
     set version status to `saved`.
+
+    The asset row is locked while checking, so that only one of several
+    tasks completing at the same time saves the asset.
     """
     now = datetime.now()
 
-    all_task_rows: List[ORMTask] = await tasks.get_tasks(asset_id)
-    all_finished = _all_finished(all_task_rows)
+    status_change_log: ChangeLog = ChangeLog(
+        date_time=now,
+        status=ChangeLogStatus.success,
+        message=f"Successfully created asset {asset_id}.",
+    )
 
-    if all_finished:
-        status_change_log: ChangeLog = ChangeLog(
-            date_time=now,
-            status=ChangeLogStatus.success,
-            message=f"Successfully created asset {asset_id}.",
-        )
+    async with db.transaction():
+        asset_row: ORMAsset = await assets.lock_asset(asset_id)
+        if asset_row.status == AssetStatus.saved:
+            return
+        if await tasks.count_unfinished_tasks(asset_id):
+            return
 
         # Set the asset to status saved
-        asset_row: ORMAsset = await assets.update_asset(
+        asset_row = await assets.update_asset(
             asset_id,
             status=AssetStatus.saved,
             change_log=[status_change_log.dict(by_alias=True)],
         )
 
-        # Run any asset type-specific code necessary
-        post_completion_task = _post_completion_task_factory(asset_row.asset_type)
-        if post_completion_task is not None:
-            await post_completion_task(asset_id)
-
-        # If default asset, make sure version is also set to saved
-        if asset_row.is_default:
-            dataset, version = asset_row.dataset, asset_row.version
-
-            await versions.update_version(
-                dataset,
-                version,
-                status=VersionStatus.saved,
-                change_log=[status_change_log.dict(by_alias=True)],
-            )
-
+    # Run any asset type-specific code necessary
+    post_completion_task = _post_completion_task_factory(asset_row.asset_type)
+    if post_completion_task is not None:
+        await post_completion_task(asset_id)
 
-def _all_finished(task_rows: List[ORMTask]) -> bool:
-    """Loop over task list to check if all completed successfully."""
-    all_finished = True
-
-    for row in task_rows:
-        if any(
-            changelog["status"] == ChangeLogStatus.success
-            for changelog in row.change_log
-        ):
-            continue
-        else:
-            all_finished = False
-            break
+    # If default asset, make sure version is also set to saved
+    if asset_row.is_default:
+        dataset, version = asset_row.dataset, asset_row.version
 
-    return all_finished
+        await versions.update_version(
+            dataset,
+            version,
+            status=VersionStatus.saved,
+            change_log=[status_change_log.dict(by_alias=True)],
+        )
 
 
 async def _get_field_metadata(dataset: str, version: str) -> List[Dict[str, Any]]:
@@ -1,6 +1,7 @@
 import json
+import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from starlette.config import Config
 from starlette.datastructures import Secret
@@ -58,6 +59,9 @@ READER_PORT: int = config("DB_PORT_RO", cast=int, default=DB_READER_SECRET["port
 READER_DBNAME = config("DATABASE_RO", cast=str, default=DB_READER_SECRET["dbname"])
 READER_MIN_POOL_SIZE: int = config("READER_MIN_POOL_SIZE", cast=int, default=5)
 READER_MAX_POOL_SIZE: int = config("READER_MAX_POOL_SIZE", cast=int, default=10)
+# Separate pool on the reader for user SQL queries, see application.py
+QUERY_MIN_POOL_SIZE: int = config("QUERY_MIN_POOL_SIZE", cast=int, default=0)
+QUERY_MAX_POOL_SIZE: int = config("QUERY_MAX_POOL_SIZE", cast=int, default=5)
 
 WRITER_USERNAME: Optional[str] = config(
     "DB_USER", cast=str, default=DB_WRITER_SECRET["username"]
@@ -124,6 +128,22 @@ PIXETL_DEFAULT_RESAMPLING = config(
 )
 RASTER_ANALYSIS_LAMBDA_NAME = config("RASTER_ANALYSIS_LAMBDA_NAME", cast=str)
 
+# Executor of Batch jobs, either "aws" for AWS Batch or "local" to run jobs
+# as subprocesses of the API, see app/tasks/local_executor.py. Local jobs
+# share LOCAL_EXECUTOR_VCPUS and find their commands on LOCAL_EXECUTOR_PATH.
+BATCH_EXECUTOR: str = config("BATCH_EXECUTOR", cast=str, default="aws")
+LOCAL_EXECUTOR_VCPUS: int = config(
+    "LOCAL_EXECUTOR_VCPUS", cast=int, default=os.cpu_count() or 1
+)
+LOCAL_EXECUTOR_PATH: str = config(
+    "LOCAL_EXECUTOR_PATH",
+    cast=str,
+    default=os.pathsep.join(
+        str(Path(__file__).parents[2] / "batch" / folder)
+        for folder in ("scripts", "python")
+    ),
+)
+
 
 POLL_WAIT_TIME = config("POLL_WAIT_TIME", cast=int, default=30)
 CHUNK_SIZE = config("CHUNK_SIZE", cast=int, default=50)
@@ -142,6 +162,35 @@ LAMBDA_ENTRYPOINT_URL = config(
 S3_ENTRYPOINT_URL = config("S3_ENTRYPOINT_URL", cast=str, default=None)
 SQL_REQUEST_TIMEOUT = 58
 
+# Optional pre-flight cost guard for user SQL. Queries are EXPLAINed and
+# rejected if the planner's estimated total cost exceeds the ceiling.
+# QUERY_COST_LIMITS maps dataset names (or fnmatch patterns) to ceilings,
+# e.g. {"gadm__tcl__*": 5000000}. Unset means no check.
+DEFAULT_QUERY_COST_LIMIT: Optional[float] = config(
+    "DEFAULT_QUERY_COST_LIMIT", cast=float, default=None
+)
+QUERY_COST_LIMITS: Dict[str, float] = json.loads(
+    config("QUERY_COST_LIMITS", cast=str, default="{}")
+)
+
+# Let PostgreSQL serialize table query results for /query/json instead of
+# building Python objects for each row. Values are rendered by PostgreSQL's
+# to_json: geometries become GeoJSON objects instead of hex EWKB strings,
+# numerics become numbers with all their digits (POST /query/json otherwise
+# renders them as strings), and intervals and bytea values are formatted as
+# PostgreSQL text. Queries with duplicate result column names are rejected.
+QUERY_JSON_PASSTHROUGH: bool = config(
+    "QUERY_JSON_PASSTHROUGH", cast=bool, default=False
+)
+
+# Split query filter geometries with more vertices than this into pieces
+# of at most this many vertices (min 5), so that PostgreSQL tests rows
+# against small pieces instead of one huge polygon. Unset means filter
+# geometries are used as they are.
+QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES: Optional[int] = config(
+    "QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES", cast=int, default=None
+)
+
 AWS_GCS_KEY_SECRET_ARN = config("AWS_GCS_KEY_SECRET_ARN", cast=str, default=None)
 AWS_SECRETSMANAGER_URL = config("AWS_SECRETSMANAGER_URL", cast=str, default=None)
 
@@ -153,11 +202,38 @@ HOUR: int = int(60 * 60)
 # DEFAULT_JOB_DURATION: int = int(HOUR * 2)
 DEFAULT_JOB_DURATION: int = 400000
 
+# Asynchronous table queries run as Batch jobs and export results to the
+# data lake bucket below this prefix, keyed by Batch job ID.
+ASYNC_QUERY_TIMEOUT: int = config("ASYNC_QUERY_TIMEOUT", cast=int, default=HOUR)
+ASYNC_QUERY_RESULTS_PREFIX = "query_results"
+
 API_KEY_NAME = config("API_KEY_NAME", cast=str, default="x-api-key")
 GEOSTORE_SIZE_LIMIT_OTF = config(
     "GEOSTORE_SIZE_LIMIT_OTF", cast=int, default=1000000000
 )
 
+# Geostore cache, see app/utils/geostore_cache.py. Sizes are in bytes of
+# serialized geostores, per worker for the in-process tier and per host for
+# the optional shared tier. Missing RW geostores are cached for a few seconds.
+GEOSTORE_CACHE_MAX_BYTES: int = config(
+    "GEOSTORE_CACHE_MAX_BYTES", cast=int, default=128 * 1024 * 1024
+)
+GEOSTORE_CACHE_NOT_FOUND_TTL: float = config(
+    "GEOSTORE_CACHE_NOT_FOUND_TTL", cast=float, default=30.0
+)
+GEOSTORE_SHARED_CACHE_DIR: Optional[str] = config(
+    "GEOSTORE_SHARED_CACHE_DIR", cast=str, default=None
+)
+GEOSTORE_SHARED_CACHE_MAX_BYTES: int = config(
+    "GEOSTORE_SHARED_CACHE_MAX_BYTES", cast=int, default=1024 * 1024 * 1024
+)
+
+# Seconds to wait for the preferred geostore origin before also querying the
+# other one. Unset means the origins are queried one after the other.
+GEOSTORE_HEDGE_DELAY: Optional[float] = config(
+    "GEOSTORE_HEDGE_DELAY", cast=float, default=None
+)
+
 API_GATEWAY_ID = config("API_GATEWAY_ID", cast=str)
 API_GATEWAY_INTERNAL_USAGE_PLAN = config("API_GATEWAY_INTERNAL_USAGE_PLAN", cast=str)
 API_GATEWAY_EXTERNAL_USAGE_PLAN = config("API_GATEWAY_EXTERNAL_USAGE_PLAN", cast=str)
@@ -190,6 +266,25 @@ RASTER_ANALYSIS_STATE_MACHINE_ARN = config(
     "RASTER_ANALYSIS_STATE_MACHINE_ARN", cast=str, default=None
 )
 
+ADMIN_BOUNDARY_DATASETS: Dict[str, str] = {"GADM": "gadm_administrative_boundaries"}
+
+# Tolerances (in degrees) at which admin boundaries are simplified on
+# ingestion. Requested simplify values are snapped to the nearest one, if
+# it is within a factor of ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO. Other
+# values are simplified on the fly.
+ADMIN_BOUNDARY_SIMPLIFY_TOLERANCES: List[float] = [
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+]
+ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO: float = config(
+    "ADMIN_BOUNDARY_SIMPLIFY_MAX_SNAP_RATIO", cast=float, default=2.0
+)
+
 # TODO: Find a good home for this:
 per_env_admin_boundary_versions: Dict[str, Dict[str, Dict[str, str]]] = {
     "test": {
@@ -1,11 +1,11 @@
-from typing import Any, Awaitable, Callable, Coroutine, List
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List
 from urllib.parse import urljoin
 from uuid import UUID
 
 from ..application import ContextEngine
 from ..crud import assets as crud_assets
 from ..crud import tasks as crud_tasks
-from ..models.orm.tasks import Task as ORMTask, Task
+from ..models.orm.tasks import Task as ORMTask
 from ..models.pydantic.change_log import ChangeLog
 from ..settings.globals import (
     API_URL,
@@ -56,21 +56,44 @@ async def update_asset_status(asset_id, status):
 Callback = Callable[[UUID, ChangeLog], Coroutine[Any, Any, Awaitable[None]]]
 
 
-def callback_constructor(
-    asset_id: UUID,
-) -> Callable[[UUID, ChangeLog], Coroutine[UUID, ChangeLog, Task]]:
-    """Callback constructor.
+class AssetTaskCallback:
+    """Callback creating the task of a job of an asset.
 
-    Assign asset_id in the context of the constructor once. Afterwards
-    you will only need to pass the ChangeLog object.
+    The scheduler reads asset_id to create the tasks of many jobs of an
+    asset at once instead of calling the callback for each job.
     """
 
-    async def callback(task_id: UUID, change_log: ChangeLog) -> ORMTask:
+    def __init__(self, asset_id: UUID) -> None:
+        self.asset_id: UUID = asset_id
+
+    async def __call__(self, task_id: UUID, change_log: ChangeLog) -> ORMTask:
         async with ContextEngine("WRITE"):
             task: ORMTask = await crud_tasks.create_task(
-                task_id, asset_id=asset_id, change_log=[change_log.dict(by_alias=True)]
+                task_id,
+                asset_id=self.asset_id,
+                change_log=[change_log.dict(by_alias=True)],
             )
 
         return task
 
-    return callback
+
+def callback_constructor(asset_id: UUID) -> AssetTaskCallback:
+    """Callback constructor.
+
+    Assign asset_id in the context of the constructor once. Afterwards
+    you will only need to pass the ChangeLog object.
+    """
+    return AssetTaskCallback(asset_id)
+
+
+async def create_tasks(asset_id: UUID, change_logs: Dict[UUID, ChangeLog]) -> None:
+    """Create tasks for the given task IDs and initial change logs in a
+    single transaction."""
+    async with ContextEngine("WRITE"):
+        await crud_tasks.create_tasks(
+            asset_id,
+            {
+                task_id: {"change_log": [change_log.dict(by_alias=True)]}
+                for task_id, change_log in change_logs.items()
+            },
+        )
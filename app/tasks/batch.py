@@ -1,15 +1,31 @@
+import asyncio
 import json
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import UUID
 
 from fastapi.logger import logger
+from starlette.concurrency import run_in_threadpool
 
-from ..errors import TooManyRetriesError
+from ..errors import JobDependencyError
 from ..models.enum.change_log import ChangeLogStatus
 from ..models.pydantic.change_log import ChangeLog
 from ..models.pydantic.jobs import Job
+from ..settings.globals import BATCH_EXECUTOR
 from ..utils.aws import get_batch_client
+from . import AssetTaskCallback, create_tasks
 
 BATCH_DEPENDENCY_LIMIT = 14
 OOM_ERROR = "OutOfMemoryError: Container killed due to memory usage"
@@ -19,8 +35,8 @@ async def execute(
     jobs: List[Job],
 ) -> ChangeLog:
     try:
-        scheduled_jobs = await schedule(jobs)
-    except TooManyRetriesError as e:
+        scheduled_jobs = await _scheduler()(jobs)
+    except JobDependencyError as e:
         status = ChangeLogStatus.failed
         message = e.message
         detail = e.detail
@@ -38,12 +54,30 @@ async def execute(
     )
 
 
+def _scheduler() -> Callable[[List[Job]], Awaitable[Dict[str, UUID]]]:
+    """Return the schedule function of the configured executor."""
+    if BATCH_EXECUTOR == "local":
+        # Local import, the local executor builds on this module
+        from .local_executor import schedule as schedule_locally
+
+        return schedule_locally
+    elif BATCH_EXECUTOR == "aws":
+        return schedule
+    raise ValueError(
+        f"Unknown BATCH_EXECUTOR {BATCH_EXECUTOR}, must be 'aws' or 'local'"
+    )
+
+
 async def schedule(jobs: List[Job]) -> Dict[str, UUID]:
     """Submit multiple batch jobs at once.
 
     Submitted batch jobs can depend on each other. Dependent jobs need
     to be listed in `dependent_jobs` and must have a `parents` attribute
     with the parent job names.
+
+    Jobs are submitted in topological order, all jobs whose parents are
+    already submitted at once. The tasks of each level are created
+    together, before the next level is submitted.
     """
 
     # Since we currently use a dictionary with the job name as key,
@@ -54,63 +88,124 @@ async def schedule(jobs: List[Job]) -> Dict[str, UUID]:
             "Can't schedule multiple jobs with the same name at the same time"
         )
 
-    scheduled_jobs = dict()
+    levels: List[List[Job]] = _dependency_levels(jobs)
 
-    # first schedule all independent jobs
-    for job in jobs:
-        if not job.parents:
-            scheduled_jobs[job.job_name] = submit_batch_job(job)
-            await job.callback(
-                task_id=scheduled_jobs[job.job_name],
-                change_log=ChangeLog(
-                    date_time=datetime.now(),
-                    status=ChangeLogStatus.pending,
-                    message=f"Scheduled job {job.job_name}",
-                    detail=f"Job ID: {scheduled_jobs[job.job_name]}",
-                ),
-            )
+    scheduled_jobs: Dict[str, UUID] = dict()
 
-    if not scheduled_jobs:
-        raise ValueError(
-            "No independent jobs in list, can't start scheduling process due to missing dependencies"
+    for level in levels:
+        depends_on_by_job: List[List[Dict[str, Any]]] = [
+            [
+                {"jobId": str(scheduled_jobs[parent]), "type": "SEQUENTIAL"}
+                for parent in job.parents or list()
+            ]
+            for job in level
+        ]
+        results: List[Union[UUID, BaseException]] = await asyncio.gather(
+            *[
+                run_in_threadpool(submit_batch_job, job, depends_on)
+                for job, depends_on in zip(level, depends_on_by_job)
+            ],
+            return_exceptions=True,
         )
 
-    # then retry to schedule all dependent jobs
-    # until all parent job are scheduled or max retry is reached
-    i = 0
-
-    while len(jobs) != len(scheduled_jobs):
-        for job in jobs:
-            if (
-                job.job_name not in scheduled_jobs
-                and job.parents is not None
-                and all([parent in scheduled_jobs for parent in job.parents])
-            ):
-                depends_on = [
-                    {"jobId": str(scheduled_jobs[parent]), "type": "SEQUENTIAL"}
-                    for parent in job.parents  # type: ignore
-                ]
-                scheduled_jobs[job.job_name] = submit_batch_job(job, depends_on)
-                await job.callback(
-                    task_id=scheduled_jobs[job.job_name],
-                    change_log=ChangeLog(
+        error: Optional[BaseException] = None
+        change_logs: List[Tuple[Job, ChangeLog]] = list()
+        for job, depends_on, result in zip(level, depends_on_by_job, results):
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            scheduled_jobs[job.job_name] = result
+            detail = f"Job ID: {result}"
+            if depends_on:
+                detail += f", parents: {depends_on}"
+            change_logs.append(
+                (
+                    job,
+                    ChangeLog(
                         date_time=datetime.now(),
                         status=ChangeLogStatus.pending,
                         message=f"Scheduled job {job.job_name}",
-                        detail=f"Job ID: {scheduled_jobs[job.job_name]}, parents: {depends_on}",
+                        detail=detail,
                     ),
                 )
-
-        i += 1
-        if i > 10:
-            raise TooManyRetriesError(
-                message="Too many retries while scheduling jobs. Aborting.",
-                detail=f"Failed to schedule job {[job.job_name for job in jobs if job.job_name not in scheduled_jobs]} ",
             )
 
+        # Tasks of a level must exist before the next level is submitted,
+        # since jobs of this level may already report their status. They
+        # are created for the submitted jobs even if another one failed,
+        # so that no running job goes untracked.
+        await _create_tasks(scheduled_jobs, change_logs)
+        if error is not None:
+            raise error
+
     return scheduled_jobs
 
 
+async def _create_tasks(
+    scheduled_jobs: Dict[str, UUID], change_logs: List[Tuple[Job, ChangeLog]]
+) -> None:
+    """Create the tasks of scheduled jobs.
+
+    Tasks of jobs with an AssetTaskCallback are created in bulk per
+    asset, other callbacks are called one by one.
+    """
+    change_logs_by_asset: DefaultDict[UUID, Dict[UUID, ChangeLog]] = defaultdict(dict)
+    for job, change_log in change_logs:
+        task_id: UUID = scheduled_jobs[job.job_name]
+        if isinstance(job.callback, AssetTaskCallback):
+            change_logs_by_asset[job.callback.asset_id][task_id] = change_log
+        else:
+            await job.callback(task_id=task_id, change_log=change_log)
+
+    for asset_id, asset_change_logs in change_logs_by_asset.items():
+        await create_tasks(asset_id, asset_change_logs)
+
+
+def _dependency_levels(jobs: List[Job]) -> List[List[Job]]:
+    """Group jobs into levels, so that the parents of each job are in
+    earlier levels."""
+    job_names: Set[str] = {job.job_name for job in jobs}
+    children: Dict[str, List[Job]] = {name: list() for name in job_names}
+    missing_parents: Dict[str, int] = dict()
+
+    for job in jobs:
+        parents: Set[str] = set(job.parents or list())
+        unknown_parents = parents - job_names
+        if unknown_parents:
+            raise JobDependencyError(
+                message="Unknown parent jobs. Aborting.",
+                detail=f"Job {job.job_name} depends on unknown jobs {sorted(unknown_parents)}",
+            )
+        missing_parents[job.job_name] = len(parents)
+        for parent in parents:
+            children[parent].append(job)
+
+    level: List[Job] = [job for job in jobs if not missing_parents[job.job_name]]
+    if not level:
+        raise ValueError(
+            "No independent jobs in list, can't start scheduling process due to missing dependencies"
+        )
+
+    levels: List[List[Job]] = list()
+    while level:
+        levels.append(level)
+        next_level: List[Job] = list()
+        for job in level:
+            for child in children[job.job_name]:
+                missing_parents[child.job_name] -= 1
+                if not missing_parents[child.job_name]:
+                    next_level.append(child)
+        level = next_level
+
+    if sum(len(level) for level in levels) != len(jobs):
+        raise JobDependencyError(
+            message="Circular dependencies between jobs. Aborting.",
+            detail=f"Failed to schedule job {[name for name, count in missing_parents.items() if count]} ",
+        )
+
+    return levels
+
+
 def submit_batch_job(
     job: Job, depends_on: Optional[List[Dict[str, Any]]] = None
 ) -> UUID:
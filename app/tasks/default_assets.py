@@ -5,7 +5,7 @@ from uuid import UUID
 
 from ..application import ContextEngine
 from ..crud import assets, versions
-from ..models.enum.assets import default_asset_type
+from ..models.enum.assets import AssetStatus, default_asset_type
 from ..models.enum.change_log import ChangeLogStatus
 from ..models.enum.sources import SourceType
 from ..models.pydantic.asset_metadata import asset_metadata_factory
@@ -86,6 +86,12 @@ async def append_default_asset(
 ) -> None:
     source_type = input_data["creation_options"]["source_type"]
 
+    # The asset must be pending before the append jobs are scheduled, so
+    # that the first completed task does not find it saved already and
+    # the asset is saved again once all tasks have completed.
+    async with ContextEngine("WRITE"):
+        await assets.update_asset(asset_id, status=AssetStatus.pending)
+
     try:
         await put_asset(
             source_type,
@@ -1,4 +1,5 @@
 from ..application import ContextEngine, db
+from ..models.orm.geostore import GeostoreLookup as ORMGeostoreLookup
 from ..settings.globals import (
     DATA_LAKE_BUCKET,
     TILE_CACHE_BUCKET,
@@ -67,7 +68,19 @@ async def delete_raster_tileset_assets(
 
 async def delete_database_table_asset(dataset: str, version: str) -> None:
     async with ContextEngine("WRITE"):
-        await db.status(f"""DROP TABLE IF EXISTS "{dataset}"."{version}" CASCADE;""")
+        # Drop the table and its geostore lookup rows together, so that
+        # lookups never point to a table which does not exist
+        async with db.transaction():
+            await db.status(
+                f"""DROP TABLE IF EXISTS "{dataset}"."{version}" CASCADE;"""
+            )
+            # Pre-simplified admin boundaries, see simplify_admin_boundaries.sh
+            await db.status(
+                f"""DROP TABLE IF EXISTS "{dataset}"."{version}__simplified";"""
+            )
+            await ORMGeostoreLookup.delete.where(
+                ORMGeostoreLookup.dataset == dataset
+            ).where(ORMGeostoreLookup.version == version).gino.status()
 
 
 async def delete_single_file_asset(uri: str):
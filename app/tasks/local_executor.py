@@ -0,0 +1,286 @@
+"""Run Batch jobs as local subprocesses instead of submitting them to AWS
+Batch.
+
+Used when BATCH_EXECUTOR is "local", ie to benchmark or profile
+ingestion pipelines without the cloud. Jobs are scheduled like Batch
+jobs: their tasks are created through the job callbacks, and each job
+starts once all its parents succeeded. Jobs share LOCAL_EXECUTOR_VCPUS
+CPUs, each reserving as many as it requests. Like report_status.sh,
+jobs killed with exit code 137 are retried with half as many processes,
+and the result of each job is reported to its task, along with its wall
+time and peak RSS.
+"""
+
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from fastapi.logger import logger
+from starlette.concurrency import run_in_threadpool
+
+from ..application import ContextEngine
+from ..models.enum.change_log import ChangeLogStatus
+from ..models.pydantic.change_log import ChangeLog
+from ..models.pydantic.jobs import Job
+from ..models.pydantic.tasks import TaskUpdateIn
+from ..settings.globals import LOCAL_EXECUTOR_PATH, LOCAL_EXECUTOR_VCPUS
+from .batch import _create_tasks, _dependency_levels
+
+OOM_EXIT_CODE = 137
+OUTPUT_TAIL_BYTES = 1000
+SECRET_OUTPUT = re.compile(
+    r"^(AWS_SECRET_ACCESS_KEY|AWS_ACCESS_KEY_ID|PGPASSWORD|PGUSER|PGDATABASE"
+    r"|PGHOST|SERVICE_ACCOUNT_TOKEN|GPG_KEY)=.*$",
+    re.MULTILINE,
+)
+
+# Keep references to running job graphs, so that they aren't garbage
+# collected before they finish
+_running: Set["asyncio.Task[Dict[str, Optional[JobResult]]]"] = set()
+
+
+class JobResult(NamedTuple):
+    exit_code: int
+    output: str  # Tail of stdout and stderr
+    wall_time: float  # Seconds
+    max_rss: int  # Bytes, of the largest process of the job
+
+
+class _CPUPool:
+    def __init__(self, vcpus: int):
+        self.vcpus = max(vcpus, 1)
+        self._available = self.vcpus
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, vcpus: int) -> AsyncIterator[int]:
+        """Wait until vcpus CPUs are available and reserve them.
+
+        Jobs requesting more CPUs than the pool has get all of them.
+        """
+        vcpus = min(max(vcpus, 1), self.vcpus)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._available >= vcpus)
+            self._available -= vcpus
+        try:
+            yield vcpus
+        finally:
+            async with self._condition:
+                self._available += vcpus
+                self._condition.notify_all()
+
+
+async def schedule(jobs: List[Job]) -> Dict[str, UUID]:
+    """Create the tasks of jobs and start running them in the
+    background.
+
+    Job IDs are generated locally and used as task IDs, just like AWS
+    Batch job IDs.
+    """
+    if len(set([job.job_name for job in jobs])) != len(jobs):
+        raise ValueError(
+            "Can't schedule multiple jobs with the same name at the same time"
+        )
+
+    levels: List[List[Job]] = _dependency_levels(jobs)
+
+    scheduled_jobs: Dict[str, UUID] = dict()
+    change_logs: List[Tuple[Job, ChangeLog]] = list()
+    for level in levels:
+        for job in level:
+            job_id: UUID = uuid4()
+            scheduled_jobs[job.job_name] = job_id
+            detail = f"Job ID: {job_id}, local"
+            if job.parents:
+                detail += f", parents: {job.parents}"
+            change_logs.append(
+                (
+                    job,
+                    ChangeLog(
+                        date_time=datetime.now(),
+                        status=ChangeLogStatus.pending,
+                        message=f"Scheduled job {job.job_name}",
+                        detail=detail,
+                    ),
+                )
+            )
+
+    await _create_tasks(scheduled_jobs, change_logs)
+
+    running = asyncio.create_task(run_jobs(jobs, scheduled_jobs))
+    _running.add(running)
+    running.add_done_callback(_running.discard)
+
+    return scheduled_jobs
+
+
+async def run_jobs(
+    jobs: List[Job], job_ids: Dict[str, UUID], vcpus: Optional[int] = None
+) -> Dict[str, Optional[JobResult]]:
+    """Run jobs once their parents succeeded and report their results.
+
+    Returns the result of each job by job name, or None for jobs which
+    didn't run because a parent failed, or which failed unexpectedly.
+    """
+    cpus = _CPUPool(vcpus or LOCAL_EXECUTOR_VCPUS)
+    runs: Dict[str, "asyncio.Task[Optional[JobResult]]"] = dict()
+
+    async def run(job: Job) -> Optional[JobResult]:
+        parent_results = await asyncio.gather(
+            *[runs[parent] for parent in job.parents or list()]
+        )
+        if any(result is None or result.exit_code for result in parent_results):
+            logger.warning(f"Not running job {job.job_name}, a parent job failed")
+            return None
+
+        job_id: UUID = job_ids[job.job_name]
+        try:
+            async with cpus.reserve(job.vcpus) as job_vcpus:
+                result = await _run_job(job, job_id, job_vcpus)
+
+            logger.info(
+                f"Job {job.job_name} exited with code {result.exit_code} after "
+                f"{result.wall_time:.1f}s, peak RSS {result.max_rss / 2 ** 20:.0f} MiB"
+            )
+            await _report_status(job_id, _change_log(job, result))
+        except Exception as e:
+            # Report the job as failed rather than failing the runs of its
+            # children, so that the remaining tasks are still updated
+            logger.exception(f"Job {job.job_name} failed unexpectedly")
+            await _report_error(job_id, job, e)
+            return None
+        return result
+
+    # Levels are in topological order, so parent runs exist before their
+    # children start
+    for level in _dependency_levels(jobs):
+        for job in level:
+            runs[job.job_name] = asyncio.create_task(run(job))
+
+    return {name: await job_run for name, job_run in runs.items()}
+
+
+async def _run_job(job: Job, job_id: UUID, vcpus: int) -> JobResult:
+    env: Dict[str, str] = _job_environment(job, job_id, vcpus)
+    attempts: int = max(job.attempts, 1)
+
+    for attempt in range(1, attempts + 1):
+        env["AWS_BATCH_JOB_ATTEMPT"] = str(attempt)
+        result: JobResult = await run_in_threadpool(run_command, job.command, env)
+        if result.exit_code != OOM_EXIT_CODE or attempt == attempts:
+            break
+
+        # Likely out of memory, retry with more memory per process
+        num_processes = int(env.get("NUM_PROCESSES", vcpus))
+        env["NUM_PROCESSES"] = str(max(num_processes // 2, 1))
+        logger.warning(
+            f"Job {job.job_name} was killed, retrying with "
+            f"NUM_PROCESSES={env['NUM_PROCESSES']}"
+        )
+
+    return result
+
+
+def _job_environment(job: Job, job_id: UUID, vcpus: int) -> Dict[str, str]:
+    env: Dict[str, str] = dict(os.environ)
+    env.update({item["name"]: str(item["value"]) for item in job.environment})
+    env["PATH"] = os.pathsep.join([LOCAL_EXECUTOR_PATH, env.get("PATH", "")])
+    env["AWS_BATCH_JOB_ID"] = str(job_id)
+    # Jobs can't use more CPUs than they reserved
+    env["CORES"] = str(vcpus)
+    return env
+
+
+def run_command(command: List[str], env: Dict[str, str]) -> JobResult:
+    """Run a command and measure its wall time and peak RSS.
+
+    Exit codes of processes killed by a signal are reported like a
+    shell does, ie 137 for SIGKILL.
+    """
+    start = time.monotonic()
+    try:
+        process = subprocess.Popen(
+            command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+    except OSError as e:
+        return JobResult(127, str(e), time.monotonic() - start, 0)
+
+    assert process.stdout is not None
+    tail = b""
+    with process.stdout:
+        for chunk in iter(lambda: process.stdout.read(65536), b""):  # type: ignore
+            tail = (tail + chunk)[-OUTPUT_TAIL_BYTES:]
+
+    # Wait for the process ourselves to get its resource usage
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.monotonic() - start
+
+    exit_code = process.returncode
+    if exit_code < 0:
+        exit_code = 128 - exit_code
+
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+    max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+    output = SECRET_OUTPUT.sub(r"\1=***", tail.decode(errors="replace"))
+    return JobResult(exit_code, output, wall_time, max_rss)
+
+
+def _change_log(job: Job, result: JobResult) -> ChangeLog:
+    command = " ".join(job.command)
+    metrics = (
+        f"Wall time: {result.wall_time:.3f}s, "
+        f"peak RSS: {result.max_rss / 2 ** 20:.1f} MiB"
+    )
+    if result.exit_code == 0:
+        status = ChangeLogStatus.success
+        message = f"Successfully ran command [ {command} ]"
+        detail = metrics
+    else:
+        status = ChangeLogStatus.failed
+        message = f"Command [ {command} ] encountered errors"
+        detail = f"{metrics}\n{result.output}"
+
+    return ChangeLog(
+        date_time=datetime.now(), status=status, message=message, detail=detail
+    )
+
+
+async def _report_status(job_id: UUID, change_log: ChangeLog) -> None:
+    """Update the task of a job, like report_status.sh does through the
+    task endpoint."""
+    # Local import, the task routes depend on the tasks package
+    from ..routes.tasks.task import update_task
+
+    try:
+        async with ContextEngine("WRITE"):
+            await update_task(
+                task_id=job_id,
+                request=TaskUpdateIn(change_log=[change_log]),
+                is_authorized=True,
+            )
+    except HTTPException as e:
+        logger.error(f"Cannot report status of job {job_id}: {e.detail}")
+
+
+async def _report_error(job_id: UUID, job: Job, error: Exception) -> None:
+    """Report a job which failed with an unexpected error, if possible."""
+    change_log = ChangeLog(
+        date_time=datetime.now(),
+        status=ChangeLogStatus.failed,
+        message=f"Command [ {' '.join(job.command)} ] could not be run",
+        detail=str(error),
+    )
+    try:
+        await _report_status(job_id, change_log)
+    except Exception:
+        logger.exception(f"Cannot report status of job {job_id}")
@@ -1,10 +1,12 @@
 import json
 from collections import defaultdict
 from copy import deepcopy
-from typing import Any, DefaultDict, Dict, List, Optional
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional
 from uuid import UUID
 
+import numpy as np
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 
 from app.crud.assets import get_asset, get_default_asset, update_asset
 from app.errors import RecordNotFoundError
@@ -15,9 +17,8 @@ from app.models.orm.assets import Asset as ORMAsset
 from app.models.pydantic.change_log import ChangeLog
 from app.models.pydantic.creation_options import PixETLCreationOptions
 from app.models.pydantic.extent import Extent
-from app.models.pydantic.geostore import FeatureCollection
 from app.models.pydantic.jobs import Job
-from app.models.pydantic.statistics import BandStats, Histogram, RasterStats
+from app.models.pydantic.statistics import BandStats, RasterStats
 from app.settings.globals import DATA_LAKE_BUCKET
 from app.tasks import Callback, callback_constructor
 from app.tasks.batch import execute
@@ -30,7 +31,10 @@ from app.utils.path import (
     tile_uri_to_extent_geojson,
     tile_uri_to_tiles_geojson,
 )
-from app.utils.stats import merge_n_histograms
+from app.utils.geojson import iter_features
+from app.utils.stats import HistogramArrays, merge_n_histograms
+
+TILES_GEOJSON_CHUNK_SIZE = 1024 * 1024
 
 
 async def raster_tile_set_asset(
@@ -117,6 +121,12 @@ async def raster_tile_set_asset(
     return log
 
 
+def _read_geojson(bucket: str, key: str) -> Dict[str, Any]:
+    s3_client = get_s3_client()
+    resp = s3_client.get_object(Bucket=bucket, Key=key)
+    return json.loads(resp["Body"].read().decode("utf-8"))
+
+
 async def get_extent(asset_id: UUID) -> Optional[Extent]:
     asset_row: ORMAsset = await get_asset(asset_id)
     asset_uri: str = get_asset_uri(
@@ -128,43 +138,59 @@ async def get_extent(asset_id: UUID) -> Optional[Extent]:
     )
     bucket, key = split_s3_path(tile_uri_to_extent_geojson(asset_uri))
 
-    s3_client = get_s3_client()
-    resp = s3_client.get_object(Bucket=bucket, Key=key)
-    extent_geojson: Dict[str, Any] = json.loads(resp["Body"].read().decode("utf-8"))
+    extent_geojson: Dict[str, Any] = await run_in_threadpool(
+        _read_geojson, bucket, key
+    )
 
     if extent_geojson:
         return Extent(**extent_geojson)
     return None
 
 
-def _collect_bandstats(fc: FeatureCollection) -> List[BandStats]:
-    stats_by_band: DefaultDict[int, DefaultDict[str, List[int]]] = defaultdict(
-        lambda: defaultdict(lambda: [])
+def _collect_bandstats(features: Iterable[Dict[str, Any]]) -> List[BandStats]:
+    """Merge the band stats and histograms of all tiles."""
+    stats_by_band: Dict[int, Dict[str, float]] = dict()
+    histograms_by_band: DefaultDict[int, List[HistogramArrays]] = defaultdict(
+        lambda: []
     )
-    histograms_by_band: DefaultDict[int, List[Histogram]] = defaultdict(lambda: [])
 
-    for f_i, feature in enumerate(fc.features):
-        for i, band in enumerate(feature.properties.get("bands", list())):
-            if band.get("stats") is not None:
-                for val in ("min", "max", "mean"):
-                    stats_by_band[i][val].append(band["stats"][val])
+    for feature in features:
+        properties: Dict[str, Any] = feature.get("properties") or dict()
+        for i, band in enumerate(properties.get("bands", list())):
+            band_stats = band.get("stats")
+            if band_stats is not None:
+                if i not in stats_by_band:
+                    stats_by_band[i] = {
+                        "min": band_stats["min"],
+                        "max": band_stats["max"],
+                        "mean_sum": 0.0,
+                        "count": 0,
+                    }
+                stats_i = stats_by_band[i]
+                stats_i["min"] = min(stats_i["min"], band_stats["min"])
+                stats_i["max"] = max(stats_i["max"], band_stats["max"])
+                stats_i["mean_sum"] += band_stats["mean"]
+                stats_i["count"] += 1
 
             feature_histo_dict_i = band.get("histogram")
             if feature_histo_dict_i is not None:
-                histo_i = Histogram(
-                    min=feature_histo_dict_i["min"],
-                    max=feature_histo_dict_i["max"],
-                    bin_count=feature_histo_dict_i["count"],
-                    value_count=feature_histo_dict_i["buckets"],
+                histograms_by_band[i].append(
+                    HistogramArrays(
+                        min=feature_histo_dict_i["min"],
+                        max=feature_histo_dict_i["max"],
+                        bin_count=feature_histo_dict_i["count"],
+                        value_count=np.asarray(
+                            feature_histo_dict_i["buckets"], dtype=np.int64
+                        ),
+                    )
                 )
-                histograms_by_band[i].append(histo_i)
 
     bandstats: List[BandStats] = []
-    for i, band in stats_by_band.items():
+    for i, stats_i in stats_by_band.items():
         bs = BandStats(
-            min=min(stats_by_band[i]["min"]),
-            max=max(stats_by_band[i]["max"]),
-            mean=sum(stats_by_band[i]["mean"]) / len(stats_by_band[i]["mean"]),
+            min=stats_i["min"],
+            max=stats_i["max"],
+            mean=stats_i["mean_sum"] / stats_i["count"],
         )
         bs.histogram = merge_n_histograms(histograms_by_band[i])
         bandstats.append(bs)
@@ -172,6 +198,15 @@ def _collect_bandstats(fc: FeatureCollection) -> List[BandStats]:
     return bandstats
 
 
+def _read_raster_stats(bucket: str, tiles_key: str) -> List[BandStats]:
+    """Stream tiles.geojson from S3 and merge the stats of its tiles."""
+    s3_client = get_s3_client()
+    tiles_resp = s3_client.get_object(Bucket=bucket, Key=tiles_key)
+    features = iter_features(tiles_resp["Body"].iter_chunks(TILES_GEOJSON_CHUNK_SIZE))
+
+    return _collect_bandstats(features)
+
+
 async def _get_raster_stats(asset_id: UUID) -> RasterStats:
     asset_row: ORMAsset = await get_asset(asset_id)
 
@@ -184,14 +219,12 @@ async def _get_raster_stats(asset_id: UUID) -> RasterStats:
     )
     bucket, tiles_key = split_s3_path(tile_uri_to_tiles_geojson(asset_uri))
 
-    s3_client = get_s3_client()
-    tiles_resp = s3_client.get_object(Bucket=bucket, Key=tiles_key)
-    tiles_geojson: Dict[str, Any] = json.loads(
-        tiles_resp["Body"].read().decode("utf-8")
+    # Parsing is CPU bound and boto3 is blocking, so keep both off the
+    # event loop
+    bandstats: List[BandStats] = await run_in_threadpool(
+        _read_raster_stats, bucket, tiles_key
     )
 
-    bandstats: List[BandStats] = _collect_bandstats(FeatureCollection(**tiles_geojson))
-
     return RasterStats(bands=bandstats)
 
 
@@ -10,6 +10,10 @@ from ..models.enum.creation_options import VectorDrivers
 from ..models.pydantic.change_log import ChangeLog
 from ..models.pydantic.creation_options import FieldType, VectorSourceCreationOptions
 from ..models.pydantic.jobs import GdalPythonImportJob, PostgresqlClientJob
+from ..settings.globals import (
+    ADMIN_BOUNDARY_DATASETS,
+    ADMIN_BOUNDARY_SIMPLIFY_TOLERANCES,
+)
 from ..utils.path import get_layer_name, is_zipped
 from . import Callback, callback_constructor, writer_secrets
 from .batch import BATCH_DEPENDENCY_LIMIT, execute
@@ -261,15 +265,9 @@ async def vector_source_asset(
             attempt_duration_seconds=creation_options.timeout,
         )
 
-    clip_and_reproject_geom_job: PostgresqlClientJob = PostgresqlClientJob(
-        dataset=dataset,
-        job_name="clip_and_reproject_geom",
-        command=["clip_and_reproject_geom.sh", "-d", dataset, "-v", version],
-        parents=[job.job_name for job in final_load_data_jobs],
-        environment=job_env,
-        callback=callback,
-        attempt_duration_seconds=creation_options.timeout,
-    )
+    # Web mercator geometries and other GFW columns are computed while
+    # loading, so the table is complete once all data is loaded
+    load_data_parents: List[str] = [job.job_name for job in final_load_data_jobs]
 
     index_jobs: List[PostgresqlClientJob] = list()
     for index in creation_options.indices:
@@ -288,7 +286,7 @@ async def vector_source_asset(
                     "-x",
                     index.index_type,
                 ],
-                parents=[clip_and_reproject_geom_job.job_name],
+                parents=load_data_parents,
                 environment=job_env,
                 callback=callback,
                 attempt_duration_seconds=creation_options.timeout,
@@ -325,22 +323,44 @@ async def vector_source_asset(
             dataset=dataset,
             job_name="inherit_from_geostore",
             command=["inherit_geostore.sh", "-d", dataset, "-v", version],
-            parents=[clip_and_reproject_geom_job.job_name],
+            parents=load_data_parents,
             environment=job_env,
             callback=callback,
             attempt_duration_seconds=creation_options.timeout,
         )
         geostore_jobs.append(inherit_geostore_job)
 
+    simplify_jobs: List[PostgresqlClientJob] = list()
+    if dataset in ADMIN_BOUNDARY_DATASETS.values():
+        simplify_jobs.append(
+            PostgresqlClientJob(
+                dataset=dataset,
+                job_name="simplify_admin_boundaries",
+                command=[
+                    "simplify_admin_boundaries.sh",
+                    "-d",
+                    dataset,
+                    "-v",
+                    version,
+                    "--tolerances",
+                    ",".join(str(t) for t in ADMIN_BOUNDARY_SIMPLIFY_TOLERANCES),
+                ],
+                parents=load_data_parents,
+                environment=job_env,
+                callback=callback,
+                attempt_duration_seconds=creation_options.timeout,
+            )
+        )
+
     log: ChangeLog = await execute(
         [
             create_schema_job,
             add_gfw_fields_job,
             *load_data_jobs,
-            clip_and_reproject_geom_job,
             *index_jobs,
             *cluster_jobs,
             *geostore_jobs,
+            *simplify_jobs,
         ]
     )
 
@@ -378,9 +398,8 @@ async def append_vector_source_asset(
             callback=callback,
             attempt_duration_seconds=creation_options.timeout,
         )
-        final_load_data_jobs: List[GdalPythonImportJob] = load_data_jobs
     else:
-        load_data_jobs, final_load_data_jobs = await _create_load_other_data_jobs(
+        load_data_jobs, _ = await _create_load_other_data_jobs(
             dataset,
             version,
             first_source_uri,
@@ -393,21 +412,8 @@ async def append_vector_source_asset(
             attempt_duration_seconds=creation_options.timeout,
         )
 
-    clip_and_reproject_geom_job: PostgresqlClientJob = PostgresqlClientJob(
-        dataset=dataset,
-        job_name="clip_and_reproject_geom",
-        command=["clip_and_reproject_geom.sh", "-d", dataset, "-v", version],
-        parents=[job.job_name for job in final_load_data_jobs],
-        environment=job_env,
-        callback=callback,
-        attempt_duration_seconds=creation_options.timeout,
-    )
-
-    log: ChangeLog = await execute(
-        [
-            *load_data_jobs,
-            clip_and_reproject_geom_job,
-        ]
-    )
+    # Load jobs only compute GFW columns of appended rows and register
+    # their geostore IDs, if the table inherits from geostore
+    log: ChangeLog = await execute(load_data_jobs)
 
     return log
@@ -1,3 +1,5 @@
+from unidecode import unidecode
+
 GADM_41_IDS_MISSING_REVISION = (
     "IDN.35.4",
     "IDN.35.8",
@@ -34,3 +36,8 @@ def fix_id_pattern(adm_level: int, id_pattern_string: str, provider: str, versio
             new_pattern = new_pattern.rstrip(r"\__")
 
     return new_pattern
+
+
+def normalize_name(name: str) -> str:
+    """Unaccent and decapitalize an admin boundary name."""
+    return unidecode(name).lower()
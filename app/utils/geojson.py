@@ -0,0 +1,114 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+WHITESPACE = " \t\n\r"
+
+
+def round_coordinates(coordinates: Any, precision: int) -> Any:
+    """Round (nested lists of) coordinates to the given number of decimal
+    places."""
+    if isinstance(coordinates, (int, float)):
+        return round(coordinates, precision)
+    return [round_coordinates(c, precision) for c in coordinates]
+
+
+def round_geometry(geometry: Dict[str, Any], precision: int) -> Dict[str, Any]:
+    """Return a copy of a GeoJSON geometry with coordinates rounded to the
+    given number of decimal places, like ST_AsGeoJSON's maxdecimaldigits."""
+    return {
+        **geometry,
+        "coordinates": round_coordinates(geometry["coordinates"], precision),
+    }
+
+
+class _JSONStream:
+    """Decode JSON values one by one from chunks of UTF-8 encoded bytes."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was already
+        consumed.
+
+        Return False at the end of the input.
+        """
+        if self._eof:
+            return False
+        chunk: Optional[bytes] = next(self._chunks, None)
+        self._eof = chunk is None
+        self._buffer = self._buffer[self._pos :] + self._utf8.decode(
+            chunk or b"", final=self._eof
+        )
+        self._pos = 0
+        return not self._eof
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character."""
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE
+            ):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def consume(self, char: str) -> bool:
+        """Consume the next character if it is char."""
+        if self.peek() != char:
+            return False
+        self._pos += 1
+        return True
+
+    def expect(self, char: str) -> None:
+        if not self.consume(char):
+            raise ValueError(f"Expected {char!r} at {self._buffer[self._pos:][:20]!r}")
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Value might be incomplete
+                if self._fill():
+                    continue
+                raise
+            # A number might continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_features(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield the features of a GeoJSON FeatureCollection read from chunks
+    of bytes, without holding the whole collection in memory."""
+    stream = _JSONStream(chunks)
+    stream.expect("{")
+    if stream.consume("}"):
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "features":
+            stream.expect("[")
+            if not stream.consume("]"):
+                while True:
+                    yield stream.value()
+                    if not stream.consume(","):
+                        stream.expect("]")
+                        break
+        else:
+            stream.value()
+        if not stream.consume(","):
+            stream.expect("}")
+            return
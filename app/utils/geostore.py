@@ -1,7 +1,7 @@
-from typing import List
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
 from uuid import UUID
 
-from async_lru import alru_cache
 from fastapi import HTTPException
 from fastapi.logger import logger
 
@@ -9,10 +9,14 @@ from app.crud.geostore import get_gfw_geostore_from_any_dataset
 from app.errors import BadResponseError, RecordNotFoundError
 from app.models.enum.geostore import GeostoreOrigin
 from app.models.pydantic.geostore import Geostore, GeostoreCommon
+from app.settings.globals import GEOSTORE_HEDGE_DELAY
 from app.utils import rw_api
+from app.utils.geostore_cache import geostore_cache
 
 
-@alru_cache(maxsize=128)
+# Missing IDs are not cached, as they may be created as user areas at any
+# time, through any worker
+@geostore_cache("gfw", cache_not_found=False)
 async def _get_gfw_geostore(geostore_id: UUID) -> GeostoreCommon:
     """Get GFW Geostore geometry."""
 
@@ -42,37 +46,40 @@ async def _get_gfw_geostore(geostore_id: UUID) -> GeostoreCommon:
 async def get_geostore(
     geostore_id: UUID, geostore_origin: GeostoreOrigin
 ) -> GeostoreCommon:
-    """Looks for geometry in all geostores, beginning with client's choice."""
+    """Looks for geometry in all geostores, beginning with client's choice.
+
+    If GEOSTORE_HEDGE_DELAY is set, other geostores are queried as well
+    once the preferred one didn't answer within that many seconds (at
+    once, if set to 0), and the first geometry found is returned.
+    """
 
     geostore_constructor = {
         GeostoreOrigin.gfw: _get_gfw_geostore,
         GeostoreOrigin.rw: rw_api.get_geostore,
     }
 
-    geo_func = geostore_constructor.pop(geostore_origin)
+    # Will we really ever have >2 geostore sources?
+    # Preserve the possibility for now.
+    geo_funcs: List[Callable[[UUID], Awaitable[GeostoreCommon]]] = [
+        geostore_constructor.pop(geostore_origin),
+        *geostore_constructor.values(),
+    ]
 
     # If we get a geostore from any origin return it,
     # if we get all 404s return a 404,
     # if we get a mixture of errors return a 500 with explanation
-    exceptions: List[Exception] = []
-    try:
-        return await geo_func(geostore_id)
-    except RecordNotFoundError as e:
-        exceptions.append(e)
-    except Exception as e:
-        logger.exception(e)
-        exceptions.append(e)
+    exceptions: List[BaseException] = []
+    if GEOSTORE_HEDGE_DELAY is None:
+        geostore: Optional[GeostoreCommon] = await _get_geostore_sequential(
+            geostore_id, geo_funcs, exceptions
+        )
+    else:
+        geostore = await _get_geostore_hedged(
+            geostore_id, geo_funcs, exceptions, GEOSTORE_HEDGE_DELAY
+        )
 
-    # Will we really ever have >2 geostore sources?
-    # Preserve the possibility for now.
-    for geo_func in geostore_constructor.values():
-        try:
-            return await geo_func(geostore_id)
-        except RecordNotFoundError as e:
-            exceptions.append(e)
-        except Exception as e:
-            logger.exception(e)
-            exceptions.append(e)
+    if geostore is not None:
+        return geostore
 
     if all(isinstance(exception, RecordNotFoundError) for exception in exceptions):
         raise HTTPException(status_code=404, detail=f"Geostore {geostore_id} not found")
@@ -82,3 +89,62 @@ async def get_geostore(
             f"{geostore_id}. Please email data@wri.org for help."
         )
         raise HTTPException(status_code=500, detail=msg)
+
+
+async def _get_geostore_sequential(
+    geostore_id: UUID,
+    geo_funcs: List[Callable[[UUID], Awaitable[GeostoreCommon]]],
+    exceptions: List[BaseException],
+) -> Optional[GeostoreCommon]:
+    """Query geostores one after the other and return the first geometry
+    found."""
+    for geo_func in geo_funcs:
+        try:
+            return await geo_func(geostore_id)
+        except RecordNotFoundError as e:
+            exceptions.append(e)
+        except Exception as e:
+            logger.exception(e)
+            exceptions.append(e)
+
+    return None
+
+
+async def _get_geostore_hedged(
+    geostore_id: UUID,
+    geo_funcs: List[Callable[[UUID], Awaitable[GeostoreCommon]]],
+    exceptions: List[BaseException],
+    delay: float,
+) -> Optional[GeostoreCommon]:
+    """Query the next geostore whenever the running queries didn't answer
+    within delay seconds or all failed, and return the first geometry
+    found."""
+
+    async def _get(geo_func) -> GeostoreCommon:
+        return await geo_func(geostore_id)
+
+    remaining = list(geo_funcs)
+    pending: Set[asyncio.Future] = {asyncio.ensure_future(_get(remaining.pop(0)))}
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=delay if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                exception: Optional[BaseException] = task.exception()
+                if exception is None:
+                    return task.result()
+                if not isinstance(exception, RecordNotFoundError):
+                    logger.exception(exception)
+                exceptions.append(exception)
+
+            if remaining and (not done or not pending):
+                pending.add(asyncio.ensure_future(_get(remaining.pop(0))))
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return None
@@ -0,0 +1,240 @@
+"""Caches for geostore geometries.
+
+Geostores range from tiny polygons to multi-megabyte country boundaries,
+so the in-process cache is bounded by the size of the serialized
+geometries instead of the number of entries. Sizes are estimated from
+the number of positions, so that geometries are only serialized for the
+shared tier. Optionally, geometries are also written to a directory
+shared by all workers on the same host (preferably on a tmpfs such as
+/dev/shm), so that each worker doesn't have to fetch the same large
+geometries again. Missing geostores of origins which this API cannot
+create are remembered for a short time only, in process.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from uuid import UUID, uuid4
+
+from fastapi.logger import logger
+from starlette.concurrency import run_in_threadpool
+
+from ..errors import RecordNotFoundError
+from ..models.pydantic.geostore import GeostoreCommon
+from ..settings.globals import (
+    GEOSTORE_CACHE_MAX_BYTES,
+    GEOSTORE_CACHE_NOT_FOUND_TTL,
+    GEOSTORE_SHARED_CACHE_DIR,
+    GEOSTORE_SHARED_CACHE_MAX_BYTES,
+)
+
+# Approximate size of a negative entry, so that they count against the budget
+NOT_FOUND_ENTRY_SIZE = 128
+# Approximate serialized size of a position, e.g. "[-12.34567891, 1.2345678]",
+# and of the ID, area and bounding box of a geostore
+POSITION_SIZE = 32
+GEOSTORE_SIZE = 256
+
+
+class _Entry(NamedTuple):
+    geostore: Optional[GeostoreCommon]
+    size: int
+    expires_at: Optional[float]
+
+
+def _count_positions(coordinates: List[Any]) -> int:
+    if not coordinates:
+        return 0
+    if not isinstance(coordinates[0], list):
+        return 1
+    if coordinates[0] and not isinstance(coordinates[0][0], list):
+        return len(coordinates)
+    return sum(_count_positions(child) for child in coordinates)
+
+
+def estimate_size(geostore: GeostoreCommon) -> int:
+    """Estimate the serialized size of a geostore from its number of
+    positions, without serializing it."""
+    return GEOSTORE_SIZE + POSITION_SIZE * _count_positions(
+        geostore.geojson.coordinates
+    )
+
+
+class GeostoreCache:
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int = GEOSTORE_CACHE_MAX_BYTES,
+        not_found_ttl: float = GEOSTORE_CACHE_NOT_FOUND_TTL,
+        shared_dir: Optional[str] = GEOSTORE_SHARED_CACHE_DIR,
+        shared_max_bytes: int = GEOSTORE_SHARED_CACHE_MAX_BYTES,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.not_found_ttl = not_found_ttl
+        self.shared_dir = shared_dir
+        self.shared_max_bytes = shared_max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._shared_bytes_written = 0
+
+    def get(self, key: str) -> Optional[GeostoreCommon]:
+        """Return cached geostore or None if not cached.
+
+        Raises RecordNotFoundError if the geostore is known to be
+        missing.
+        """
+        entry: Optional[_Entry] = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at < time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.geostore is None:
+            raise RecordNotFoundError(f"Geostore {key} not found")
+        return entry.geostore
+
+    def set(self, key: str, geostore: GeostoreCommon, size: int) -> None:
+        self._add(key, _Entry(geostore, size, None))
+
+    def set_not_found(self, key: str) -> None:
+        expires_at = time.monotonic() + self.not_found_ttl
+        self._add(key, _Entry(None, NOT_FOUND_ENTRY_SIZE, expires_at))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _add(self, key: str, entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+
+    def _remove(self, key: str) -> None:
+        entry: Optional[_Entry] = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    def _shared_path(self, key: str) -> str:
+        return os.path.join(str(self.shared_dir), f"{self.name}-{key}.json")
+
+    def read_shared(self, key: str) -> Optional[bytes]:
+        """Read serialized geostore from shared tier and mark it as
+        recently used."""
+        path = self._shared_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def write_shared(self, key: str, data: bytes) -> None:
+        """Atomically write serialized geostore to shared tier.
+
+        Least recently used files are pruned once this worker has written
+        a tenth of the shared budget since the last pruning.
+        """
+        os.makedirs(str(self.shared_dir), exist_ok=True)
+        tmp_path = os.path.join(str(self.shared_dir), f".{uuid4()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._shared_path(key))
+
+        self._shared_bytes_written += len(data)
+        if self._shared_bytes_written > self.shared_max_bytes / 10:
+            self._shared_bytes_written = 0
+            self.prune_shared()
+
+    def prune_shared(self) -> None:
+        files = []
+        for dir_entry in os.scandir(str(self.shared_dir)):
+            if dir_entry.name.endswith(".json"):
+                stat = dir_entry.stat()
+                files.append((stat.st_mtime, stat.st_size, dir_entry.path))
+
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_bytes <= self.shared_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+def geostore_cache(
+    name: str,
+    cache_not_found: bool = True,
+) -> Callable[
+    [Callable[[UUID], Awaitable[GeostoreCommon]]],
+    Callable[[UUID], Awaitable[GeostoreCommon]],
+]:
+    """Cache geostores returned by the decorated function.
+
+    Concurrent calls for the same geostore share a single fetch. With
+    cache_not_found, RecordNotFoundErrors are cached for a short time.
+    Other errors are not cached.
+    """
+
+    def decorator(func):
+        cache = GeostoreCache(name)
+        pending: Dict[str, asyncio.Future] = dict()
+
+        async def fetch(geostore_id: UUID, key: str) -> GeostoreCommon:
+            if cache.shared_dir:
+                data: Optional[bytes] = await run_in_threadpool(
+                    cache.read_shared, key
+                )
+                if data is not None:
+                    geostore = GeostoreCommon.parse_raw(data)
+                    cache.set(key, geostore, len(data))
+                    return geostore
+
+            try:
+                geostore = await func(geostore_id)
+            except RecordNotFoundError:
+                if cache_not_found:
+                    cache.set_not_found(key)
+                raise
+
+            if not cache.shared_dir:
+                cache.set(key, geostore, estimate_size(geostore))
+                return geostore
+
+            data = geostore.json().encode()
+            cache.set(key, geostore, len(data))
+            try:
+                await run_in_threadpool(cache.write_shared, key, data)
+            except OSError as e:
+                logger.warning(f"Cannot write geostore {key} to shared cache: {e}")
+            return geostore
+
+        @functools.wraps(func)
+        async def wrapper(geostore_id: UUID) -> GeostoreCommon:
+            key = str(geostore_id)
+            geostore: Optional[GeostoreCommon] = cache.get(key)
+            if geostore is not None:
+                return geostore
+
+            if key not in pending:
+                pending[key] = asyncio.ensure_future(fetch(geostore_id, key))
+                pending[key].add_done_callback(lambda _: pending.pop(key, None))
+            return await asyncio.shield(pending[key])
+
+        wrapper.cache = cache  # type: ignore
+        return wrapper
+
+    return decorator
@@ -1,7 +1,6 @@
 from typing import Dict
 from uuid import UUID
 
-from async_lru import alru_cache
 from fastapi import HTTPException
 from fastapi.logger import logger
 from httpx import AsyncClient, ReadTimeout
@@ -23,9 +22,10 @@ from ..models.pydantic.geostore import (
     RWGeostoreIn,
 )
 from ..settings.globals import RW_API_KEY, RW_API_URL, SERVICE_ACCOUNT_TOKEN
+from .geostore_cache import geostore_cache
 
 
-@alru_cache(maxsize=128)
+@geostore_cache("rw")
 async def get_geostore(geostore_id: UUID) -> GeostoreCommon:
     """Get RW Geostore geometry."""
 
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import NamedTuple, Optional, Sequence, Union
 
 import numpy as np
 from pydantic import StrictFloat, StrictInt
@@ -6,84 +6,111 @@ from pydantic import StrictFloat, StrictInt
 from app.models.pydantic.statistics import Histogram
 
 
+class HistogramArrays(NamedTuple):
+    """Histogram with counts in a numpy array, for merging many histograms
+    without validating each of them."""
+
+    min: float
+    max: float
+    bin_count: int
+    value_count: np.ndarray
+
+
+AnyHistogram = Union[Histogram, HistogramArrays]
+
+
 def _reconstruct_edges(
     min_val: Union[StrictInt, float],
     max_val: Union[StrictInt, float],
     num_bins: StrictInt,
-) -> List[Union[StrictInt, float]]:
-    """Returns the reconstructed edges of a histogram."""
-    return np.linspace(min_val, max_val, num=num_bins)
-
-
-def _extract_vals(histo: Histogram) -> List[Union[StrictInt, StrictFloat]]:
-    """Returns an *approximation* of the original values represented in the
-    histogram."""
-    reconstructed_edges = _reconstruct_edges(histo.min, histo.max, histo.bin_count)
-    reconstructed_values = [
-        [d] * c for c, d in zip(histo.value_count, reconstructed_edges)
-    ]
-    # Return a flattened list.
-    return [z for s in reconstructed_values for z in s]
+) -> np.ndarray:
+    """Returns the reconstructed edges of a histogram's bins, assuming
+    uniformly spaced bins."""
+    return np.linspace(min_val, max_val, num=num_bins + 1)
 
 
-def _extract_bin_resolution(reconstructed_edges: List[Union[StrictInt, StrictFloat]]):
+def _extract_bin_resolution(histo: AnyHistogram) -> Union[StrictInt, StrictFloat]:
     """Return the 'size' of a bin, assumes bins are uniformly spaced."""
-    return reconstructed_edges[1] - reconstructed_edges[0]
+    return (histo.max - histo.min) / histo.bin_count
 
 
 def _generate_num_bins(minval, maxval, bin_res) -> StrictInt:
-    return StrictInt(int(np.ceil((maxval - minval) / bin_res)))
+    return StrictInt(max(int(np.ceil((maxval - minval) / bin_res)), 1))
 
 
-def merge_n_histograms(histos: List[Histogram]) -> Optional[Histogram]:
-    """Merge multiple histograms, preserving as much accuracy as possible.
+def _redistribute_counts(histo: AnyHistogram, edges: np.ndarray) -> np.ndarray:
+    """Redistribute the counts of a histogram onto the bins between edges.
 
-    Code adapted from this Stack Overflow answer:
-    https://stackoverflow.com/a/47183002.
+    Values are assumed to be spread evenly within each original bin, so
+    a new bin receives counts proportional to its overlap with original
+    bins.
+    """
+    counts = np.asarray(histo.value_count, dtype=np.float64)
+    if histo.max == histo.min:
+        # All values are the same, they all belong to a single bin
+        new_counts = np.zeros(len(edges) - 1)
+        i = np.searchsorted(edges, histo.min, side="right") - 1
+        new_counts[min(max(i, 0), len(new_counts) - 1)] = counts.sum()
+        return new_counts
+
+    # The cumulative counts are piecewise linear between original edges
+    cumulative = np.concatenate(([0.0], np.cumsum(counts)))
+    original_edges = _reconstruct_edges(histo.min, histo.max, histo.bin_count)
+    return np.diff(np.interp(edges, original_edges, cumulative))
+
+
+def merge_n_histograms(histos: Sequence[AnyHistogram]) -> Optional[Histogram]:
+    """Merge multiple histograms onto a common bin grid, preserving as much
+    accuracy as possible.
+
+    The merged histogram spans all histograms with bins as small as the
+    smallest original ones. Counts are redistributed bin by bin, so this
+    takes time and memory proportional to the number of bins, not to the
+    number of values.
     """
 
     if not histos:
         return None
     if len(histos) == 1:
-        return histos[0]
+        histo = histos[0]
+        if isinstance(histo, HistogramArrays):
+            return Histogram(
+                min=histo.min,
+                max=histo.max,
+                bin_count=histo.bin_count,
+                value_count=np.asarray(histo.value_count).tolist(),
+            )
+        return histo
 
     # Find the min and max of all histograms to be merged, to be used as the
     # new min and max of the final histogram
-    new_min = min(*[histo.min for histo in histos])
-    # print(f"New histogram min is: {new_min}")
-
-    new_max = max(*[histo.max for histo in histos])
-    # print(f"New histogram max is: {new_max}")
-
-    # Approximate the structure of the original histograms in order to find
-    # the overall minimum bin spacing needed to accurately differentiate
-    # bins. Use this to figure out how many bins will be required in the
-    # final histogram
-    all_bins = [
-        _reconstruct_edges(histo.min, histo.max, histo.bin_count) for histo in histos
-    ]
-    min_bin_resolution = min([_extract_bin_resolution(bins) for bins in all_bins])
-    # print(f"New histogram bin size is: {min_bin_resolution}")
+    new_min = min(histo.min for histo in histos)
+    new_max = max(histo.max for histo in histos)
 
-    num_bins = _generate_num_bins(new_min, new_max, min_bin_resolution)
-    # print(f"Number of bins in new histogram is: {num_bins}")
+    # Use the smallest bin size of the original histograms to figure out
+    # how many bins will be required in the final histogram
+    bin_resolutions = [
+        _extract_bin_resolution(histo) for histo in histos if histo.max > histo.min
+    ]
+    if new_max > new_min and bin_resolutions:
+        num_bins = _generate_num_bins(new_min, new_max, min(bin_resolutions))
+    else:
+        num_bins = StrictInt(1)
 
-    # Reconstruct approximate values for each feature and create a histogram
-    # with the new min, max, and number of bins. Then because the parameters
-    # are the same we can add the histogram, element-wise, into a final
-    # histogram.
-    final_np_histo = np.histogram([], bins=num_bins, range=(new_min, new_max))
+    edges = _reconstruct_edges(new_min, new_max, num_bins)
+    final_counts = np.zeros(num_bins)
     for histo in histos:
-        histo_vals = _extract_vals(histo)
-        np_histo = np.histogram(histo_vals, bins=num_bins, range=(new_min, new_max))
-        for i, new_vals in enumerate(np_histo[0]):
-            final_np_histo[0][i] += new_vals
+        final_counts += _redistribute_counts(histo, edges)
+
+    # Round cumulative counts, so that the total count is preserved
+    cumulative = np.rint(np.cumsum(final_counts)).astype(np.int64)
+    value_count = np.diff(cumulative, prepend=0)
 
-    # np.histogram actually produces an array of type numpy.int64, but
-    # our Histograms are picky about datatype
+    # np.diff actually produces an array of type numpy.int64, but our
+    # Histograms are picky about datatype
     return Histogram(
         min=new_min,
         max=new_max,
         bin_count=num_bins,
-        value_count=[StrictInt(x) for x in final_np_histo[0]],
+        value_count=value_count.tolist(),
     )
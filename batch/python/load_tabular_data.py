@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+"""Load CSV and TSV files into an existing table.
+
+Sources are streamed concurrently, each over its own database
+connection. The raw bytes of each source are sent to the database with
+COPY ... (FORMAT CSV, HEADER), which parses them into a temporary
+staging table with the column types of the table. Temporary tables,
+like unlogged tables, skip the WAL. The staging rows are then inserted
+in a single statement, skipping rows which conflict with existing ones.
+Each source is loaded in its own transaction.
+
+The number of connections is capped to half of the connection slots
+which are free on the database when the load starts, leaving the rest
+to the API and to other load jobs.
+
+Columns are matched by position, like COPY does. If --lat and --lng are
+given, point geometries are computed from these columns with
+ST_MakePoint while inserting the staging rows.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import BinaryIO, List, NamedTuple, Optional, Sequence, Tuple
+
+import asyncpg
+import click
+from aws_utils import get_s3_client, get_s3_path_parts
+from logger import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+class LoadResult(NamedTuple):
+    source: str
+    copied: int
+    inserted: int
+    seconds: float
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_name(columns: Sequence[str], name: str) -> str:
+    # Unquoted column names in the shell scripts matched case-insensitively
+    if name in columns:
+        return name
+    for column in columns:
+        if column.lower() == name.lower():
+            return column
+    raise ValueError(f"Column {name} not found in {list(columns)}")
+
+
+def open_source(uri: str) -> BinaryIO:
+    """Open a CSV file on S3 or on disk as a binary stream."""
+    if uri.startswith("s3://"):
+        bucket, key = get_s3_path_parts(uri)
+        return get_s3_client().get_object(Bucket=bucket, Key=key)["Body"]
+    return open(uri, "rb")
+
+
+async def get_columns(conn: asyncpg.Connection, table: str) -> List[str]:
+    rows = await conn.fetch(
+        """
+        SELECT attname
+        FROM pg_attribute
+        WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum
+        """,
+        table,
+    )
+    return [row[0] for row in rows]
+
+
+async def get_connection_limit(conn: asyncpg.Connection) -> int:
+    """Return the number of connections a load may open, i.e. half of
+    the connection slots not reserved to superusers and not in use."""
+    free = await conn.fetchval(
+        """
+        SELECT current_setting('max_connections')::int
+          - current_setting('superuser_reserved_connections')::int
+          - count(*)
+        FROM pg_stat_activity
+        WHERE backend_type = 'client backend'
+        """
+    )
+    # This connection is closed before the load starts
+    return max((free + 1) // 2, 1)
+
+
+def split_columns(
+    columns: List[str], geometry_name: str, with_points: bool
+) -> Tuple[List[str], List[str]]:
+    """Split table columns into those read from the sources and the
+    computed geometry columns.
+
+    Geometry columns are never read from the sources. They are only
+    loaded when point geometries are computed.
+    """
+    geometry_names = [geometry_name, f"{geometry_name}_wm"]
+    source_columns = [column for column in columns if column not in geometry_names]
+    if not with_points:
+        return source_columns, list()
+
+    missing = [name for name in geometry_names if name not in columns]
+    if missing:
+        raise ValueError(f"Table has no geometry columns {missing}")
+    return source_columns, geometry_names
+
+
+def staging_sql(table: str, staging: str, geometry_name: str) -> str:
+    return (
+        f"CREATE TEMP TABLE {quote(staging)} (LIKE {table} INCLUDING DEFAULTS) "
+        f"ON COMMIT DROP; "
+        f"ALTER TABLE {quote(staging)} "
+        f"DROP COLUMN IF EXISTS {quote(geometry_name)}, "
+        f"DROP COLUMN IF EXISTS {quote(geometry_name + '_wm')}"
+    )
+
+
+def insert_sql(
+    table: str,
+    staging: str,
+    columns: Sequence[str],
+    geometry_columns: Sequence[str],
+    point_columns: Optional[Tuple[str, str]],
+) -> str:
+    """Return the statement inserting the staging rows into the table.
+
+    If point_columns, the longitude and latitude columns, are given,
+    point geometries are computed from them for the geometry columns.
+    """
+    names = [quote(column) for column in columns]
+    values = list(names)
+    if point_columns is not None:
+        lng, lat = (quote(column) for column in point_columns)
+        point = f"ST_SetSRID(ST_MakePoint({lng}, {lat}), 4326)"
+        names += [quote(column) for column in geometry_columns]
+        values += [point, f"ST_Transform({point}, 3857)"]
+
+    return (
+        f"INSERT INTO {table} ({', '.join(names)}) "
+        f"SELECT {', '.join(values)} FROM {quote(staging)} "
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+async def load_source(
+    pool: asyncpg.Pool,
+    table: str,
+    columns: Sequence[str],
+    geometry_columns: Sequence[str],
+    point_columns: Optional[Tuple[str, str]],
+    uri: str,
+    delimiter: str,
+    geometry_name: str,
+) -> LoadResult:
+    loop = asyncio.get_running_loop()
+    staging = f"staging_{uuid.uuid4().hex}"
+
+    async with pool.acquire() as conn:
+        start = time.monotonic()
+        async with conn.transaction():
+            await conn.execute(staging_sql(table, staging, geometry_name))
+
+            # asyncpg reads file-like sources in the default executor
+            source = await loop.run_in_executor(None, open_source, uri)
+            try:
+                status = await conn.copy_to_table(
+                    staging,
+                    source=source,
+                    format="csv",
+                    header=True,
+                    delimiter=delimiter,
+                )
+            finally:
+                source.close()
+            copied = int(status.split()[-1])
+
+            status = await conn.execute(
+                insert_sql(table, staging, columns, geometry_columns, point_columns)
+            )
+
+    inserted = int(status.split()[-1])
+    return LoadResult(uri, copied, inserted, time.monotonic() - start)
+
+
+async def load(
+    dataset: str,
+    version: str,
+    sources: Sequence[str],
+    delimiter: str,
+    lat: Optional[str],
+    lng: Optional[str],
+    geometry_name: str,
+    concurrency: int,
+) -> List[LoadResult]:
+    table = f"{quote(dataset)}.{quote(version)}"
+
+    # Connection parameters are read from PGHOST, PGPORT, PGUSER, PGPASSWORD
+    # and PGDATABASE
+    conn = await asyncpg.connect()
+    try:
+        connection_limit = await get_connection_limit(conn)
+    finally:
+        await conn.close()
+    if concurrency > connection_limit:
+        LOGGER.warning(
+            f"Loading {connection_limit} sources at once instead of {concurrency} "
+            "to leave database connections to other clients"
+        )
+        concurrency = connection_limit
+
+    async with asyncpg.create_pool(min_size=1, max_size=concurrency) as pool:
+        async with pool.acquire() as conn:
+            columns = await get_columns(conn, table)
+
+        point_columns: Optional[Tuple[str, str]] = None
+        if lat is not None and lng is not None:
+            point_columns = (_column_name(columns, lng), _column_name(columns, lat))
+        source_columns, geometry_columns = split_columns(
+            columns, geometry_name, point_columns is not None
+        )
+
+        results = await asyncio.gather(
+            *[
+                load_source(
+                    pool,
+                    table,
+                    source_columns,
+                    geometry_columns,
+                    point_columns,
+                    uri,
+                    delimiter,
+                    geometry_name,
+                )
+                for uri in sources
+            ],
+            return_exceptions=True,
+        )
+
+    errors = [
+        (uri, result)
+        for uri, result in zip(sources, results)
+        if isinstance(result, BaseException)
+    ]
+    for uri, error in errors:
+        LOGGER.error(f"Failed to load {uri}: {error}")
+    if errors:
+        raise errors[0][1]
+
+    return results  # type: ignore
+
+
+@click.command()
+@click.option("-d", "--dataset", type=str, required=True, help="Dataset name")
+@click.option("-v", "--version", type=str, required=True, help="Version name")
+@click.option(
+    "-s",
+    "--source",
+    "sources",
+    type=str,
+    multiple=True,
+    required=True,
+    help="Source URI",
+)
+@click.option("-D", "--delimiter", type=str, default=",", help="Delimiter")
+@click.option("--lat", type=str, default=None, help="Latitude column")
+@click.option("--lng", type=str, default=None, help="Longitude column")
+@click.option("-g", "--geometry_name", type=str, default="geom", help="Geometry column")
+@click.option(
+    "--concurrency",
+    type=int,
+    default=lambda: int(os.environ.get("NUM_PROCESSES", os.environ.get("CORES", 1))),
+    help="Number of sources loaded at once. Defaults to NUM_PROCESSES or CORES.",
+)
+def cli(
+    dataset: str,
+    version: str,
+    sources: Tuple[str, ...],
+    delimiter: str,
+    lat: Optional[str],
+    lng: Optional[str],
+    geometry_name: str,
+    concurrency: int,
+) -> None:
+    # Unescape TAB character
+    if delimiter == "\\t":
+        delimiter = "\t"
+
+    start = time.monotonic()
+    results = asyncio.run(
+        load(
+            dataset,
+            version,
+            sources,
+            delimiter,
+            lat,
+            lng,
+            geometry_name,
+            max(concurrency, 1),
+        )
+    )
+    seconds = time.monotonic() - start
+
+    for result in results:
+        LOGGER.info(
+            f"Loaded {result.source}: copied {result.copied} rows, inserted "
+            f"{result.inserted} in {result.seconds:.1f}s"
+        )
+    copied = sum(result.copied for result in results)
+    LOGGER.info(
+        f"Copied {copied} rows from {len(results)} sources in {seconds:.1f}s "
+        f"({copied / max(seconds, 1e-9):.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    cli()
@@ -2,20 +2,34 @@
 set -u
 
 # This script is meant to be sourced by another shell script, and all it
-# does is compose a SQL snippet and set a variable to it. Note that it
+# does is compose SQL snippets and set variables to them. Note that it
 # requires the environment variables used below to be set, and exits with
 # an error if one is not (thanks to the set -u).
 
+# GFW columns computed from the geometry of loaded rows. They are filled
+# while copying rows into the table, so that each row is only written
+# once, rather than updating all rows of the table after loading.
+GFW_FIELDS="${GEOMETRY_NAME}_wm, gfw_area__ha, gfw_geostore_id, gfw_geojson, gfw_bbox"
+
+# Columns which are set by default values or computed, and never copied
+NOT_COPIED_COLUMNS="'${GEOMETRY_NAME}_wm', 'gfw_area__ha', 'gfw_geostore_id', 'gfw_geojson', 'gfw_bbox', 'created_on', 'updated_on'"
+
+# Transform to web mercator (WM), clipping geometries which overflow WM
+# lat bounds of -85/85 degrees first
+WM_BOUNDS="ST_MakeEnvelope(-180, -85, 180, 85, 4326)"
+
 FILL_GFW_FIELDS_SQL="
-  UPDATE
-    $TABLE_MISSING_COLUMNS
-  SET
-    gfw_area__ha = ST_Area($GEOMETRY_NAME::geography)/10000,
-    gfw_geostore_id = md5(ST_asgeojson($GEOMETRY_NAME))::uuid,
-    gfw_geojson = ST_asGeojson($GEOMETRY_NAME),
-    gfw_bbox = ARRAY[
+    CASE
+      WHEN ST_Within($GEOMETRY_NAME, $WM_BOUNDS)
+      THEN ST_Multi(ST_Transform(ST_Force2D($GEOMETRY_NAME), 3857))
+      ELSE ST_Multi(ST_Transform(ST_Force2D(ST_Buffer(ST_Intersection($GEOMETRY_NAME, $WM_BOUNDS), 0)), 3857))
+    END,
+    ST_Area($GEOMETRY_NAME::geography)/10000,
+    md5(ST_asgeojson($GEOMETRY_NAME))::uuid,
+    ST_asGeojson($GEOMETRY_NAME),
+    ARRAY[
       ST_XMin(ST_Envelope($GEOMETRY_NAME)::geometry),
       ST_YMin(ST_Envelope($GEOMETRY_NAME)::geometry),
       ST_XMax(ST_Envelope($GEOMETRY_NAME)::geometry),
       ST_YMax(ST_Envelope($GEOMETRY_NAME)::geometry)
-    ]::NUMERIC[]"
\ No newline at end of file
+    ]::NUMERIC[]"
@@ -0,0 +1,20 @@
+#!/bin/bash
+set -u
+
+# This script is meant to be sourced by another shell script, and all it
+# does is compose a SQL snippet and set a variable to it. Note that it
+# requires the environment variables used below to be set, and exits with
+# an error if one is not (thanks to the set -u).
+
+# Register the geostore IDs of GEOSTORE_IDS_SOURCE rows in the geostore
+# lookup table. Tables which do not inherit from geostore are skipped.
+REGISTER_GEOSTORE_IDS_SQL="
+  INSERT INTO public.geostore_lookup (gfw_geostore_id, dataset, version)
+  SELECT DISTINCT gfw_geostore_id, '$DATASET', '$VERSION'
+  FROM $GEOSTORE_IDS_SOURCE
+  WHERE EXISTS (
+    SELECT 1 FROM pg_inherits
+    WHERE inhrelid = '\"$DATASET\".\"$VERSION\"'::regclass
+    AND inhparent = 'public.geostore'::regclass
+  )
+  ON CONFLICT DO NOTHING"
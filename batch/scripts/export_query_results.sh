@@ -0,0 +1,49 @@
+#!/bin/bash
+
+set -e
+set -o pipefail
+
+# requires arguments
+# --sql_uri
+# -F | --format
+# --target_bucket
+# --prefix
+
+# optional arguments
+# -D | --delimiter
+
+ME=$(basename "$0")
+. get_arguments.sh "$@"
+
+# Unescape TAB character
+if [ "$DELIMITER" == "\t" ]; then
+  DELIMITER=$(echo -e "\t")
+fi
+
+# Results are keyed by Batch job ID so the API can find them again
+TARGET="s3://${TARGET_BUCKET}/${PREFIX}/${AWS_BATCH_JOB_ID}/results.${FORMAT}"
+
+# The query is too large to be passed in the job command, see
+# _async_query_command
+echo "AWSCLI: COPY QUERY FROM $SQL_URI"
+aws s3 cp "$SQL_URI" query.sql --no-progress
+
+if [ "${FORMAT}" == "parquet" ]; then
+  echo "OGR2OGR: Export query results to Parquet"
+  ogr2ogr -f Parquet results.parquet PG:"password=$PGPASSWORD host=$PGHOST port=$PGPORT dbname=$PGDATABASE user=$PGUSER" \
+    -sql @query.sql
+
+  echo "AWSCLI: COPY DATA FROM results.parquet TO $TARGET"
+  aws s3 cp results.parquet "$TARGET"
+else
+  # Stream rows straight into S3, aws s3 cp uses multipart upload for stdin
+  echo "PSQL: Stream query results as CSV to $TARGET"
+  {
+    echo "COPY ("
+    cat query.sql
+    echo ") TO STDOUT WITH (FORMAT CSV, DELIMITER '${DELIMITER:-,}', HEADER);"
+  } > copy.sql
+  psql -X -v ON_ERROR_STOP=1 -f copy.sql | aws s3 cp - "$TARGET"
+fi
+
+echo "Done"
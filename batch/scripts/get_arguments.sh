@@ -186,6 +186,11 @@ do
       SKIP="TRUE"
       shift # past argument
       ;;
+      --sql_uri)
+      SQL_URI="$2"
+      shift # past argument
+      shift # past value
+      ;;
       --subset)
       SUBSET="$2"
       shift # past argument
@@ -211,6 +216,11 @@ do
       shift # past argument
       shift # past value
       ;;
+      --tolerances)
+      TOLERANCES="$2"
+      shift # past argument
+      shift # past value
+      ;;
       -u|--unique_constraint)
       UNIQUE_CONSTRAINT_COLUMN_NAMES="$2"
       shift # past argument
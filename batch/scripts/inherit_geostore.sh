@@ -10,4 +10,6 @@ ME=$(basename "$0")
 
 # Inherit from geostore
 echo "PSQL: ALTER TABLE. Inherit from geostore"
-psql -c "ALTER TABLE \"$DATASET\".\"$VERSION\" INHERIT public.geostore;"
\ No newline at end of file
+psql -c "ALTER TABLE \"$DATASET\".\"$VERSION\" INHERIT public.geostore;"
+
+update_geostore_lookup.sh -d "$DATASET" -v "$VERSION"
@@ -36,22 +36,9 @@ fi
 UUID=$(python -c 'import uuid; print(uuid.uuid4(), end="")' | sed s/-//g)
 TEMP_TABLE="temp_${UUID}"
 
-# Add GFW-specific columns to the new table
-TABLE_MISSING_COLUMNS=$TEMP_TABLE
-
-# GEOMETRY_TYPE_SQL is defined by sourcing _get_geometry_type_sql.sh
-# It contains the SQL snippet we'll pass to the psql client command
-. _get_geometry_type_sql.sh
-
-# Get the geometry type of the new table
-GEOMETRY_TYPE=$(psql -X -A -t -c "${GEOMETRY_TYPE_SQL}")
-
-# ADD_GFW_FIELDS_SQL is defined by sourcing _add_gfw_fields_sql.sh
-# It contains the SQL snippet we'll pass to ogr2ogr
-. _add_gfw_fields_sql.sh
-
-# FILL_GFW_FIELDS_SQL is defined by sourcing _fill_gfw_fields_sql.sh
-# It contains a SQL snippet we'll pass to ogr2ogr
+# GFW_FIELDS and FILL_GFW_FIELDS_SQL are defined by sourcing
+# _fill_gfw_fields_sql.sh. They contain the GFW columns of the table and
+# the SQL snippet computing them, which we'll pass to ogr2ogr
 . _fill_gfw_fields_sql.sh
 
 # Credit to this answer for the next SQL query: https://dba.stackexchange.com/a/115315
@@ -60,11 +47,24 @@ ALL_NON_SERIAL_COLUMNS_SQL="SELECT string_agg(quote_ident(attname), ', ' ORDER B
   WHERE  attrelid = '\"$DATASET\".\"$VERSION\"'::regclass
   AND    NOT attisdropped         -- no dropped (dead) columns
   AND    attnum > 0               -- no system columns
-  AND    attname <> '$FID_NAME';  -- case sensitive!"
+  AND    attname <> '$FID_NAME'   -- case sensitive!
+  AND    attname NOT IN ($NOT_COPIED_COLUMNS);"
 
 ALL_NON_SERIAL_COLUMNS=$(psql -X -A -t -c "$ALL_NON_SERIAL_COLUMNS_SQL")
 
-COPY_FROM_TEMP_SQL="INSERT INTO \"$DATASET\".\"$VERSION\"($ALL_NON_SERIAL_COLUMNS) SELECT $ALL_NON_SERIAL_COLUMNS FROM $TEMP_TABLE"
+# REGISTER_GEOSTORE_IDS_SQL is defined by sourcing _register_geostore_ids_sql.sh
+# Only the geostore IDs of inserted rows are registered, so that appends
+# don't scan the whole table
+GEOSTORE_IDS_SOURCE="inserted"
+. _register_geostore_ids_sql.sh
+
+# Compute GFW columns while copying rows from the temp table
+COPY_FROM_TEMP_SQL="WITH inserted AS (
+    INSERT INTO \"$DATASET\".\"$VERSION\"($ALL_NON_SERIAL_COLUMNS, $GFW_FIELDS)
+    SELECT $ALL_NON_SERIAL_COLUMNS, $FILL_GFW_FIELDS_SQL FROM $TEMP_TABLE
+    RETURNING gfw_geostore_id
+  )
+  $REGISTER_GEOSTORE_IDS_SQL"
 
 LCO_ARGS=(-lco TEMPORARY=ON -lco GEOMETRY_NAME="$GEOMETRY_NAME" -lco SPATIAL_INDEX=NONE -lco FID="$FID_NAME")
 
@@ -88,7 +88,7 @@ fi
 echo "OGR2OGR: Import \"${DATASET}\".\"${VERSION}\" from ${LOCAL_FILE} ${SRC_LAYER}"
 ogr2ogr -f "PostgreSQL" PG:"password=$PGPASSWORD host=$PGHOST port=$PGPORT dbname=$PGDATABASE user=$PGUSER" \
   "$LOCAL_FILE" "$SRC_LAYER" \
-  -doo CLOSING_STATEMENTS="$ADD_GFW_FIELDS_SQL; $FILL_GFW_FIELDS_SQL; $COPY_FROM_TEMP_SQL;" \
+  -doo CLOSING_STATEMENTS="$COPY_FROM_TEMP_SQL;" \
   "${LCO_ARGS[@]}" \
   -nlt PROMOTE_TO_MULTI \
   -nln $TEMP_TABLE \
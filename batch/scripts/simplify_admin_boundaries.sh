@@ -0,0 +1,40 @@
+#!/bin/bash
+
+set -e
+
+# requires arguments
+# -d | --dataset
+# -v | --version
+# --tolerances (comma separated list of simplification tolerances)
+
+# optional arguments
+# -g | --geometry_name (get_arguments.sh specifies default)
+
+ME=$(basename "$0")
+. get_arguments.sh "$@"
+
+set -u
+
+SIMPLIFIED_TABLE="\"$DATASET\".\"${VERSION}__simplified\""
+
+# Store pre-simplified GeoJSON of each boundary for every tolerance, so that
+# the API doesn't need to simplify large boundaries at request time
+echo "PSQL: CREATE TABLE $SIMPLIFIED_TABLE"
+psql -c "DROP TABLE IF EXISTS $SIMPLIFIED_TABLE;
+         CREATE TABLE $SIMPLIFIED_TABLE (
+           gfw_geostore_id UUID NOT NULL,
+           tolerance NUMERIC NOT NULL,
+           geojson TEXT,
+           PRIMARY KEY (gfw_geostore_id, tolerance)
+         );"
+
+echo "PSQL: INSERT INTO $SIMPLIFIED_TABLE. Simplify geometries"
+psql -c "INSERT INTO $SIMPLIFIED_TABLE (gfw_geostore_id, tolerance, geojson)
+         SELECT DISTINCT ON (gfw_geostore_id, tolerance)
+           gfw_geostore_id,
+           tolerance,
+           ST_AsGeoJSON(ST_Simplify($GEOMETRY_NAME, tolerance::double precision))
+         FROM \"$DATASET\".\"$VERSION\"
+         CROSS JOIN unnest('{${TOLERANCES}}'::NUMERIC[]) AS tolerance;"
+
+psql -c "ANALYZE $SIMPLIFIED_TABLE;"
@@ -0,0 +1,17 @@
+#!/bin/bash
+
+set -e
+
+# requires arguments
+# -d | --dataset
+# -v | --version
+ME=$(basename "$0")
+. get_arguments.sh "$@"
+
+# Register geostore IDs of the table in the geostore lookup table.
+# Tables which do not inherit from geostore are skipped.
+GEOSTORE_IDS_SOURCE="\"$DATASET\".\"$VERSION\""
+. _register_geostore_ids_sql.sh
+
+echo "PSQL: INSERT INTO public.geostore_lookup. Register geostore IDs"
+psql -c "$REGISTER_GEOSTORE_IDS_SQL;"
@@ -0,0 +1,93 @@
+"""Benchmark simplified admin boundaries.
+
+Compares simplifying a boundary with ST_Simplify at request time, as
+build_gadm_geostore did before, with reading the GeoJSON pre-computed by
+batch/scripts/simplify_admin_boundaries.sh from the "<version>__simplified"
+table (see app.crud.geostore._simplified_geojson).
+
+Runs against a database holding an admin boundary version and its
+__simplified table, given by PGHOST, PGPORT, PGUSER, PGPASSWORD and
+PGDATABASE. The boundaries with the most vertices are timed, as these are
+the requests that were slow.
+
+Usage, from the repository root:
+    python scripts/benchmark_admin_boundary_simplify.py \
+        [--dataset gadm_administrative_boundaries] [--version v4.1.85] \
+        [--adm-level 0] [--tolerance 0.005] [--boundaries 10]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+import asyncpg
+
+
+async def bench(label: str, func: Callable[[], Awaitable], repeat: int) -> None:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    print(f"  {label:<30} {min(timings) * 1000:10.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default="gadm_administrative_boundaries")
+    parser.add_argument("--version", default="v4.1.85")
+    parser.add_argument("--adm-level", default="0")
+    parser.add_argument("--tolerance", type=float, default=0.005)
+    parser.add_argument("--boundaries", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = f'"{args.dataset}"."{args.version}"'
+    simplified_table = f'"{args.dataset}"."{args.version}__simplified"'
+
+    conn = await asyncpg.connect()
+    try:
+        boundaries = await conn.fetch(
+            f"""SELECT gfw_geostore_id, gid_0, ST_NPoints(geom) AS points
+                FROM {table}
+                WHERE adm_level = $1
+                ORDER BY ST_NPoints(geom) DESC
+                LIMIT $2""",
+            args.adm_level,
+            args.boundaries,
+        )
+
+        print(
+            f"Tolerance {args.tolerance}, best of {args.repeat}, "
+            f"{len(boundaries)} largest level {args.adm_level} boundaries"
+        )
+        for boundary in boundaries:
+            print(f"{boundary['gid_0']} ({boundary['points']} points)")
+            await bench(
+                "ST_Simplify at request time",
+                lambda: conn.fetchval(
+                    f"""SELECT ST_AsGeoJSON(ST_Simplify(geom, $2))
+                        FROM {table} WHERE gfw_geostore_id = $1""",
+                    boundary["gfw_geostore_id"],
+                    args.tolerance,
+                ),
+                args.repeat,
+            )
+            await bench(
+                "pre-computed __simplified",
+                lambda: conn.fetchval(
+                    f"""SELECT geojson FROM {simplified_table}
+                        WHERE gfw_geostore_id = $1
+                        AND tolerance = $2::float8::numeric""",
+                    boundary["gfw_geostore_id"],
+                    args.tolerance,
+                ),
+                args.repeat,
+            )
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
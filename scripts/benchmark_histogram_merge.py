@@ -0,0 +1,99 @@
+"""Benchmark merging raster tile histograms.
+
+Compares the previous merge_n_histograms, which rebuilt one value per
+pixel of every tile histogram and binned them again, with the current
+app.utils.stats.merge_n_histograms, which redistributes counts bin by bin.
+
+Tiles are drawn from normal distributions with shifted means. The error
+of each merge is the L1 distance to the histogram of the raw values on
+the same bins, divided by the number of values.
+
+Usage, from the repository root:
+    PYTHONPATH=. python scripts/benchmark_histogram_merge.py [--tiles 20] [--pixels 100000]
+"""
+
+import argparse
+import timeit
+from typing import List, Tuple
+
+import numpy as np
+from pydantic import StrictInt
+
+from app.models.pydantic.statistics import Histogram
+from app.utils.stats import merge_n_histograms
+
+
+def merge_by_reconstructing_values(histos: List[Histogram]) -> Histogram:
+    """merge_n_histograms as it was before counts were redistributed."""
+    new_min = min(histo.min for histo in histos)
+    new_max = max(histo.max for histo in histos)
+    all_edges = [np.linspace(h.min, h.max, num=h.bin_count) for h in histos]
+    min_bin_resolution = min(edges[1] - edges[0] for edges in all_edges)
+    num_bins = StrictInt(int(np.ceil((new_max - new_min) / min_bin_resolution)))
+
+    final_np_histo = np.histogram([], bins=num_bins, range=(new_min, new_max))
+    for histo, edges in zip(histos, all_edges):
+        histo_vals = [z for c, d in zip(histo.value_count, edges) for z in [d] * c]
+        np_histo = np.histogram(histo_vals, bins=num_bins, range=(new_min, new_max))
+        for i, new_vals in enumerate(np_histo[0]):
+            final_np_histo[0][i] += new_vals
+
+    return Histogram(
+        min=new_min,
+        max=new_max,
+        bin_count=num_bins,
+        value_count=[StrictInt(x) for x in final_np_histo[0]],
+    )
+
+
+def tile_histograms(
+    tiles: int, pixels: int, bins: int
+) -> Tuple[List[Histogram], np.ndarray]:
+    rng = np.random.default_rng(0)
+    values = [rng.normal(loc=i, scale=3, size=pixels) for i in range(tiles)]
+    histos = []
+    for tile in values:
+        counts, edges = np.histogram(tile, bins=bins)
+        histos.append(
+            Histogram(
+                min=float(edges[0]),
+                max=float(edges[-1]),
+                bin_count=bins,
+                value_count=counts.tolist(),
+            )
+        )
+    return histos, np.concatenate(values)
+
+
+def l1_error(histo: Histogram, values: np.ndarray) -> float:
+    expected, _ = np.histogram(
+        values, bins=histo.bin_count, range=(histo.min, histo.max)
+    )
+    return float(np.abs(np.array(histo.value_count) - expected).sum() / values.size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiles", type=int, default=20)
+    parser.add_argument("--pixels", type=int, default=100_000)
+    parser.add_argument("--bins", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    histos, values = tile_histograms(args.tiles, args.pixels, args.bins)
+
+    print(
+        f"Merging {args.tiles} tiles of {args.pixels} pixels"
+        f" ({args.bins} bins each), best of {args.repeat}"
+    )
+    for label, merge in (
+        ("reconstructed values", merge_by_reconstructing_values),
+        ("redistributed counts", merge_n_histograms),
+    ):
+        best = min(timeit.repeat(lambda: merge(histos), number=1, repeat=args.repeat))
+        error = l1_error(merge(histos), values)
+        print(f"{label:<25} {best * 1000:8.1f} ms   L1 error {error:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/bin/bash
+
+# Compare end-to-end throughput of batch/python/load_tabular_data.py with
+# the previous psql COPY loader on a generated CSV set.
+#
+# Usage: scripts/benchmark_load_tabular_data.sh [NUM_FILES] [ROWS_PER_FILE]
+#
+# Requires psql and the Python packages of the batch image, and loads into
+# a scratch PostgreSQL/PostGIS database given by PGHOST, PGPORT, PGUSER,
+# PGPASSWORD and PGDATABASE. The schema "benchmark" is dropped and
+# recreated. The defaults generate 8 files of about 330 MB each.
+
+set -e
+
+NUM_FILES=${1:-8}
+ROWS_PER_FILE=${2:-5000000}
+DATA_DIR=$(mktemp -d)
+TABLE='"benchmark"."v1"'
+trap 'rm -rf "$DATA_DIR"' EXIT
+
+echo "Generating $NUM_FILES files of $ROWS_PER_FILE rows in $DATA_DIR"
+for i in $(seq 1 "$NUM_FILES"); do
+  python - "$DATA_DIR/data_$i.csv" "$(( (i - 1) * ROWS_PER_FILE ))" "$ROWS_PER_FILE" <<'EOF'
+import csv
+import random
+import sys
+
+path, offset, rows = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+random.seed(offset)
+with open(path, "w", newline="") as f:
+    writer = csv.writer(f)
+    writer.writerow(["id", "name", "value", "latitude", "longitude"])
+    for i in range(offset, offset + rows):
+        writer.writerow(
+            [
+                i,
+                f"feature {i}",
+                f"{random.uniform(0, 1e6):.4f}",
+                f"{random.uniform(-80, 80):.6f}",
+                f"{random.uniform(-180, 180):.6f}",
+            ]
+        )
+EOF
+done
+du -sh "$DATA_DIR"
+
+reset_table() {
+  psql -X -q -v ON_ERROR_STOP=1 -c "
+    DROP SCHEMA IF EXISTS benchmark CASCADE;
+    CREATE SCHEMA benchmark;
+    CREATE TABLE $TABLE (
+      id integer PRIMARY KEY,
+      name text,
+      value numeric,
+      latitude double precision,
+      longitude double precision,
+      geom geometry(Point, 4326),
+      geom_wm geometry(Point, 3857)
+    );"
+}
+
+timed() {
+  local label=$1
+  shift
+  local start end
+  start=$(date +%s.%N)
+  "$@"
+  end=$(date +%s.%N)
+  echo "$label: $(echo "$end - $start" | bc) s"
+}
+
+# Previous loader: one psql COPY per file into a temporary table, then
+# the point geometries are filled and the rows inserted.
+psql_loader() {
+  for file in "$DATA_DIR"/*.csv; do
+    psql -X -q -v ON_ERROR_STOP=1 -c "BEGIN;
+      CREATE TEMP TABLE staging (LIKE $TABLE INCLUDING DEFAULTS) ON COMMIT DROP;
+      COPY staging (id, name, value, latitude, longitude)
+        FROM STDIN WITH (FORMAT CSV, HEADER);
+      UPDATE staging SET
+        geom = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326),
+        geom_wm = ST_Transform(ST_SetSRID(ST_MakePoint(longitude, latitude), 4326), 3857);
+      INSERT INTO $TABLE SELECT * FROM staging ON CONFLICT DO NOTHING;
+      COMMIT;" < "$file"
+  done
+}
+
+python_loader() {
+  local concurrency=$1
+  local sources=()
+  for file in "$DATA_DIR"/*.csv; do
+    sources+=("--source" "$file")
+  done
+  PYTHONPATH=batch/python python batch/python/load_tabular_data.py \
+    --dataset benchmark --version v1 --lat latitude --lng longitude \
+    --concurrency "$concurrency" "${sources[@]}"
+}
+
+reset_table
+timed "psql COPY loader" psql_loader
+
+reset_table
+timed "load_tabular_data.py, concurrency 1" python_loader 1
+
+reset_table
+timed "load_tabular_data.py, concurrency 4" python_loader 4
+
+psql -X -q -c "DROP SCHEMA benchmark CASCADE;"
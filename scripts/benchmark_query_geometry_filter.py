@@ -0,0 +1,110 @@
+"""Benchmark filtering large tables by large geometries.
+
+Compares the plain ST_Intersects filter of a query geometry with the
+filter on its subdivided pieces, as built by
+app.routes.datasets.utils.query_helpers._geometry_filter_sql when the
+geometry has more than QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES vertices.
+
+Runs against a database holding a GADM version and a large vector table
+with a "geom" column in EPSG:4326, given by PGHOST, PGPORT, PGUSER,
+PGPASSWORD and PGDATABASE. The level 0 boundaries of the given countries
+are used as query geometries, and the matching rows are counted.
+
+Usage, from the repository root:
+    python scripts/benchmark_query_geometry_filter.py \
+        --dataset umd_glad_landsat_alerts --version v20240101 \
+        [--countries BRA,IDN,COD] [--max-vertices 256]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import asyncpg
+
+
+def plain_filter(geojson: str) -> str:
+    return f"ST_Intersects(geom, ST_SetSRID(ST_GeomFromGeoJSON('{geojson}'),4326))"
+
+
+def subdivided_filter(bounds: List[float], pieces: List[str]) -> str:
+    xmin, ymin, xmax, ymax = bounds
+    pieces_array = ", ".join(f"'{piece}'" for piece in pieces)
+    return (
+        f"geom && ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}, 4326)"
+        " AND EXISTS (SELECT 1 FROM"
+        f" unnest(CAST(ARRAY[{pieces_array}] AS geometry[])) AS piece"
+        " WHERE ST_Intersects(geom, piece))"
+    )
+
+
+async def bench(conn, label: str, sql: str, repeat: int) -> None:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = await conn.fetchval(sql)
+        timings.append(time.perf_counter() - start)
+    print(f"  {label:<20} {min(timings) * 1000:10.1f} ms ({count} rows)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", required=True)
+    parser.add_argument("--version", required=True)
+    parser.add_argument("--gadm-version", default="v4.1.85")
+    parser.add_argument("--countries", default="BRA,IDN,COD")
+    parser.add_argument("--max-vertices", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    table = f'"{args.dataset}"."{args.version}"'
+    gadm_table = f'"gadm_administrative_boundaries"."{args.gadm_version}"'
+
+    conn = await asyncpg.connect()
+    try:
+        print(f"Counting rows of {table}, best of {args.repeat}")
+        for country in args.countries.split(","):
+            boundary = await conn.fetchrow(
+                f"""SELECT ST_AsGeoJSON(geom) AS geojson, ST_NPoints(geom) AS points,
+                      ARRAY[ST_XMin(geom), ST_YMin(geom), ST_XMax(geom), ST_YMax(geom)]
+                        AS bounds
+                    FROM {gadm_table}
+                    WHERE adm_level = '0' AND gid_0 = $1""",
+                country,
+            )
+            start = time.perf_counter()
+            pieces: List[str] = [
+                row["piece"]
+                for row in await conn.fetch(
+                    """SELECT encode(ST_AsEWKB(ST_Subdivide(
+                         ST_SetSRID(ST_GeomFromGeoJSON($1), 4326), $2
+                       )), 'hex') AS piece""",
+                    boundary["geojson"],
+                    args.max_vertices,
+                )
+            ]
+            subdivide_ms = (time.perf_counter() - start) * 1000
+            print(
+                f"{country} ({boundary['points']} points, {len(pieces)} pieces,"
+                f" subdivided in {subdivide_ms:.1f} ms)"
+            )
+            await bench(
+                conn,
+                "ST_Intersects",
+                f"SELECT count(*) FROM {table} WHERE {plain_filter(boundary['geojson'])}",
+                args.repeat,
+            )
+            await bench(
+                conn,
+                "subdivided",
+                f"SELECT count(*) FROM {table}"
+                f" WHERE {subdivided_filter(boundary['bounds'], pieces)}",
+                args.repeat,
+            )
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Benchmark serializing table query results as JSON.
+
+Compares rows as asyncpg decodes them by default (numeric as Decimal,
+uuid as UUID objects) with rows decoded by the codecs of the user query
+pool (see app.application.init_query_connection).
+
+Usage, from the repository root:
+    PYTHONPATH=. python scripts/benchmark_query_serialization.py [--rows 100000]
+"""
+
+import argparse
+import random
+import timeit
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+import orjson
+from asyncpg.pgproto.pgproto import UUID
+from pydantic.json import pydantic_encoder
+
+from app.responses import jsonencoder_lite
+
+
+def default_rows(count: int) -> List[Dict[str, Any]]:
+    random.seed(0)
+    return [
+        {
+            "id": i,
+            "gfw_geostore_id": UUID(uuid.uuid4().bytes),
+            "area__ha": Decimal(f"{random.uniform(0, 1e6):.4f}"),
+            "loss__ha": Decimal(f"{random.uniform(0, 1e3):.4f}"),
+            "name": f"feature {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def query_pool_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            key: (
+                float(value)
+                if isinstance(value, Decimal)
+                else str(value) if isinstance(value, uuid.UUID) else value
+            )
+            for key, value in row.items()
+        }
+        for row in rows
+    ]
+
+
+def bench(label: str, func: Callable[[], Any], repeat: int) -> None:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<45} {best * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = default_rows(args.rows)
+    decoded_rows = query_pool_rows(rows)
+
+    print(f"orjson.dumps of {args.rows} rows, best of {args.repeat}")
+    bench(
+        "Decimal/UUID, jsonencoder_lite",
+        lambda: orjson.dumps(rows, default=jsonencoder_lite),
+        args.repeat,
+    )
+    bench(
+        "Decimal/UUID, pydantic_encoder",
+        lambda: orjson.dumps(rows, default=pydantic_encoder),
+        args.repeat,
+    )
+    bench(
+        "float/str (query pool codecs)",
+        lambda: orjson.dumps(decoded_rows, default=pydantic_encoder),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
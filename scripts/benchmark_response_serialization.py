@@ -0,0 +1,106 @@
+"""Benchmark rendering /query/json and /features responses.
+
+Compares the previous path, where routes returned pydantic models which
+FastAPI validated against the response_model and ran through
+jsonable_encoder before rendering, with returning an ORJSONLiteResponse
+directly (see app.routes.datasets.queries.query_dataset_json and
+app.routes.datasets.features._features_response).
+
+FastAPI turns a returned model into a dict, validates the dict against
+the response_model and encodes the result with jsonable_encoder. The
+previous path is reproduced with these same steps.
+
+Usage, from the repository root:
+    PYTHONPATH=. python scripts/benchmark_response_serialization.py [--rows 50000]
+"""
+
+import argparse
+import random
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic.json import pydantic_encoder
+
+from app.models.pydantic.features import FeaturesResponse
+from app.models.pydantic.responses import Response
+from app.responses import ORJSONLiteResponse
+
+
+def query_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows as decoded by the user query pool, numeric as float."""
+    random.seed(0)
+    return [
+        {
+            "iso": "BRA",
+            "adm1": i % 27,
+            "adm2": i % 5000,
+            "umd_tree_cover_loss__year": 2001 + i % 23,
+            "umd_tree_cover_loss__ha": random.uniform(0, 1e4),
+            "gfw_gross_emissions_co2e_all_gases__Mg": random.uniform(0, 1e6),
+        }
+        for i in range(count)
+    ]
+
+
+def feature_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows as decoded by the ORM engines, numeric as Decimal."""
+    random.seed(0)
+    return [
+        {
+            "latitude": Decimal(f"{random.uniform(-60, 60):.5f}"),
+            "longitude": Decimal(f"{random.uniform(-180, 180):.5f}"),
+            "alert__date": date(2020, 1, 1) + timedelta(days=i % 1000),
+            "confidence__cat": "h",
+            "gfw_geostore_id": None,
+        }
+        for i in range(count)
+    ]
+
+
+def model_response(model, rows: List[Dict[str, Any]]) -> bytes:
+    content = model(data=rows).dict()
+    validated = model.parse_obj(content)
+    return orjson.dumps(jsonable_encoder(validated))
+
+
+def lite_response(rows: List[Dict[str, Any]]) -> bytes:
+    return ORJSONLiteResponse(
+        {"data": rows, "status": "success"}, default=pydantic_encoder
+    ).body
+
+
+def bench(label: str, func: Callable[[], Any], repeat: int) -> None:
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<45} {best * 1000:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = query_rows(args.rows)
+    features = feature_rows(args.rows)
+
+    print(f"Rendering {args.rows} rows, best of {args.repeat}")
+    bench(
+        "query/json, Response model",
+        lambda: model_response(Response, rows),
+        args.repeat,
+    )
+    bench("query/json, ORJSONLiteResponse", lambda: lite_response(rows), args.repeat)
+    bench(
+        "features, FeaturesResponse model",
+        lambda: model_response(FeaturesResponse, features),
+        args.repeat,
+    )
+    bench("features, ORJSONLiteResponse", lambda: lite_response(features), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
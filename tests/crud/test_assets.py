@@ -1,4 +1,3 @@
-import json
 from datetime import datetime
 from uuid import UUID, uuid4
 
@@ -13,6 +12,7 @@ from app.crud.assets import (
     get_assets_by_filter,
     update_asset,
 )
+from app.crud.change_logs import get_asset_change_logs
 from app.crud.datasets import create_dataset
 from app.crud.versions import create_version
 from app.errors import RecordAlreadyExistsError, RecordNotFoundError
@@ -157,9 +157,10 @@ async def test_assets(app):
     assert row.metadata.fields[0].name == fields[0]["name"]
     assert row.metadata.fields[0].data_type == fields[0]["data_type"]
 
-    assert row.change_log[0]["date_time"] == json.loads(logs.json())["date_time"]
-    assert row.change_log[0]["status"] == logs.dict(by_alias=True)["status"]
-    assert row.change_log[0]["message"] == logs.dict(by_alias=True)["message"]
+    change_logs = await get_asset_change_logs(asset_id)
+    assert change_logs[0].date_time == logs.date_time
+    assert change_logs[0].status == logs.dict(by_alias=True)["status"]
+    assert change_logs[0].message == logs.dict(by_alias=True)["message"]
 
     # When deleting asset, method should return the deleted object
     async with ContextEngine("WRITE"):
@@ -1,10 +1,10 @@
-import json
 from datetime import datetime
 
 import asyncpg
 import pytest
 
 from app.application import ContextEngine
+from app.crud.change_logs import get_version_change_logs
 from app.crud.datasets import create_dataset
 from app.crud.versions import (
     create_version,
@@ -116,9 +116,10 @@ async def test_versions(app):
             change_log=[logs.dict(by_alias=True)],
         )
     assert row.metadata.spatial_resolution == version_metadata["spatial_resolution"]
-    assert row.change_log[0]["date_time"] == json.loads(logs.json())["date_time"]
-    assert row.change_log[0]["status"] == logs.dict(by_alias=True)["status"]
-    assert row.change_log[0]["message"] == logs.dict(by_alias=True)["message"]
+    change_logs = await get_version_change_logs(dataset_name, version_name)
+    assert change_logs[0].date_time == logs.date_time
+    assert change_logs[0].status == logs.dict(by_alias=True)["status"]
+    assert change_logs[0].message == logs.dict(by_alias=True)["message"]
 
     # When deleting a dataset, method should return the deleted object
     async with ContextEngine("WRITE"):
@@ -5,7 +5,7 @@ from uuid import UUID
 from sqlalchemy.sql.ddl import CreateSchema
 
 from app.application import ContextEngine, db
-from app.crud import assets, datasets, tasks, versions
+from app.crud import assets, change_logs, datasets, tasks, versions
 from app.models.enum.assets import AssetStatus, AssetType
 from app.models.orm.assets import Asset as AssetORM
 from app.settings.globals import READER_USERNAME
@@ -60,7 +60,7 @@ async def create_version(dataset, version, input_data) -> None:
     # and dataset schema should exist
     row = await versions.get_version(dataset, version)
     assert row.status == "pending"
-    assert row.change_log == []
+    assert await change_logs.get_version_change_logs(dataset, version) == []
 
 
 async def create_asset(dataset, version, asset_type, asset_uri, input_data) -> AssetORM:
@@ -99,14 +99,15 @@ async def check_version_status(dataset, version, log_count):
     row = await versions.get_version(dataset, version)
     assert row.status == "saved"
 
+    change_log = await change_logs.get_version_change_logs(dataset, version)
     try:
-        assert len(row.change_log) == log_count
+        assert len(change_log) == log_count
     except AssertionError:
-        print(f"Expected {log_count} changelog rows, observed {len(row.change_log)}")
-        for cl in row.change_log:
-            print(cl)
+        print(f"Expected {log_count} changelog rows, observed {len(change_log)}")
+        for cl in change_log:
+            print(cl.to_dict())
         raise
-    assert row.change_log[0]["message"] == "Successfully scheduled batch jobs"
+    assert change_log[0].message == "Successfully scheduled batch jobs"
 
 
 async def check_asset_status(dataset, version, nb_assets):
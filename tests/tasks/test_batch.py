@@ -2,7 +2,6 @@ import pytest
 
 from app.application import ContextEngine
 from app.crud import assets, datasets, versions
-from app.errors import TooManyRetriesError
 from app.models.pydantic.jobs import PostgresqlClientJob
 from app.tasks import callback_constructor, writer_secrets
 from app.tasks.batch import execute
@@ -62,11 +61,5 @@ async def test_batch_failure():
         callback=callback,
         parents=[job1.job_name, job2.job_name],
     )
-    message = ""
 
-    try:
-        await execute([job1, job2, job3])
-    except TooManyRetriesError as e:
-        message = str(e)
-
-    assert message == ""
+    await execute([job1, job2, job3])
@@ -74,7 +74,7 @@ async def test_vector_source_asset(batch_client, async_client: AsyncClient):
 
         await check_version_status(dataset, version, 3)
         await check_asset_status(dataset, version, 2)
-        await check_task_status(asset_id, 8, "inherit_from_geostore")
+        await check_task_status(asset_id, 7, "inherit_from_geostore")
 
         # There should be a table called "test"."v1.1.1" with one row
         async with ContextEngine("READ"):
@@ -291,7 +291,7 @@ async def test_vector_source_asset_csv(batch_client, async_client: AsyncClient):
 
     await check_version_status(dataset, version, 3)
     await check_asset_status(dataset, version, 2)
-    await check_task_status(asset_id, 8, "inherit_from_geostore")
+    await check_task_status(asset_id, 7, "inherit_from_geostore")
 
     # There should be a table called "test"."v1.1.1" with one row
     async with ContextEngine("READ"):
@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.crud import admin_boundaries
+from app.crud.admin_boundaries import (
+    AdminBoundary,
+    AdminBoundaryIndex,
+    load_admin_boundary_index,
+    warm_admin_boundary_indexes,
+)
+from app.crud.geostore import get_admin_boundary_list, get_gadm_geostore_id
+from app.errors import RecordNotFoundError
+
+DATASET = "gadm_administrative_boundaries"
+VERSION = "v4.1.64"
+
+
+def _boundary(adm_level, gid_0, gid_1=None, gid_2=None, names=("Mexico",)):
+    names = tuple(names) + (None,) * (3 - len(names))
+    return AdminBoundary(adm_level, uuid4(), gid_0, gid_1, gid_2, *names)
+
+
+MEX = _boundary(0, "MEX")
+CHIAPAS = _boundary(1, "MEX", "MEX.7_1", names=("Mexico", "Chiapas"))
+ACACOYAGUA = _boundary(
+    2, "MEX", "MEX.7_1", "MEX.7.2_1", names=("Mexico", "Chiapas", "Acacoyagua")
+)
+IDN_BOUNDARY = _boundary(
+    2, "IDN", "IDN.35_1", "IDN.35.4", names=("Indonesia", "Sulawesi", "Banggai")
+)
+ARG = _boundary(0, "ARG", names=("Argentina",))
+MERIDA = _boundary(1, "MEX", "MEX.31_1", names=("México", "Mérida"))
+
+
+@pytest.fixture
+def index():
+    index = AdminBoundaryIndex(
+        [MEX, CHIAPAS, ACACOYAGUA, IDN_BOUNDARY, ARG, MERIDA]
+    )
+    admin_boundaries._indexes[(DATASET, VERSION)] = index
+    yield index
+    admin_boundaries._indexes.clear()
+
+
+def test_index_gets_boundaries_by_id_without_revision(index):
+    assert index.get_by_id(0, "MEX") == MEX
+    assert index.get_by_id(1, "MEX", "7") == CHIAPAS
+    assert index.get_by_id(2, "MEX", "7", "2") == ACACOYAGUA
+    assert index.get_by_id(2, "IDN", "35", "4") == IDN_BOUNDARY
+    assert index.get_by_id(1, "MEX", "8") is None
+
+
+def test_index_finds_boundaries_by_name(index):
+    assert index.find_by_name(1, False, "Mexico", "Chiapas", None) == [CHIAPAS]
+    assert index.find_by_name(1, True, "mexico", "chiapas", None) == [CHIAPAS]
+    assert index.find_by_name(1, False, "mexico", "chiapas", None) == []
+    assert index.find_by_name(1, True, "mexico", "merida", None) == [MERIDA]
+    assert index.find_by_name(1, False, "México", "Mérida", None) == [MERIDA]
+
+
+def test_index_finds_boundaries_by_name_prefix(index):
+    assert index.find_by_name(0, True, "m", prefix=True) == [MEX]
+    assert index.find_by_name(1, True, "mex", "", None, prefix=True) == [
+        CHIAPAS,
+        MERIDA,
+    ]
+    assert index.find_by_name(1, True, "mexico", "me", None, prefix=True) == [
+        MERIDA
+    ]
+    assert index.find_by_name(2, True, "mexico", "chia", "aca", prefix=True) == [
+        ACACOYAGUA
+    ]
+    assert index.find_by_name(1, True, "mexico", "mer", None) == []
+
+
+def test_index_lists_countries_sorted(index):
+    assert index.countries == [ARG, MEX]
+
+
+@pytest.mark.asyncio
+async def test_get_gadm_geostore_id_uses_loaded_index(index):
+    with patch("app.crud.geostore.get_first_row") as mock_get_first_row:
+        geostore_id = await get_gadm_geostore_id("gadm", "4.1", 2, "MEX", "7", "2")
+
+    assert geostore_id == ACACOYAGUA.gfw_geostore_id
+    mock_get_first_row.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_gadm_geostore_id_raises_not_found_from_index(index):
+    with pytest.raises(RecordNotFoundError):
+        await get_gadm_geostore_id("gadm", "4.1", 1, "MEX", "99")
+
+
+@pytest.mark.asyncio
+async def test_get_admin_boundary_list_uses_loaded_index(index):
+    with patch("app.crud.geostore.get_all_rows") as mock_get_all_rows:
+        result = await get_admin_boundary_list("gadm", "4.1")
+
+    mock_get_all_rows.assert_not_called()
+    assert [item.iso for item in result.data] == ["ARG", "MEX"]
+
+
+@pytest.mark.asyncio
+async def test_load_admin_boundary_index_casts_adm_level():
+    rows = [{**MEX._asdict(), "adm_level": "0"}]
+
+    with patch.object(admin_boundaries.db, "all", AsyncMock(return_value=rows)):
+        try:
+            index = await load_admin_boundary_index(DATASET, VERSION)
+            assert admin_boundaries.get_admin_boundary_index(DATASET, VERSION) is index
+        finally:
+            admin_boundaries._indexes.clear()
+
+    assert index.get_by_id(0, "MEX") == MEX
+
+
+@pytest.mark.asyncio
+async def test_warm_admin_boundary_indexes_ignores_failures():
+    with patch.object(
+        admin_boundaries, "load_admin_boundary_index", side_effect=Exception("boom")
+    ) as mock_load:
+        await warm_admin_boundary_indexes()
+
+    assert mock_load.called
+    assert admin_boundaries._indexes == {}
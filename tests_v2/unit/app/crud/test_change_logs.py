@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.crud import change_logs, update_data
+from app.models.orm.assets import Asset as ORMAsset
+from app.models.orm.tasks import Task as ORMTask
+from app.models.orm.versions import Version as ORMVersion
+
+CHANGE_LOG = {
+    "date_time": "2026-10-18T12:00:00",
+    "status": "success",
+    "message": "Asset created",
+}
+
+
+@pytest.fixture
+def mock_insert():
+    insert = MagicMock()
+    insert.values.return_value.gino.status = AsyncMock()
+    with patch.object(change_logs.ORMChangeLog, "insert", return_value=insert):
+        yield insert
+
+
+@pytest.mark.asyncio
+async def test_create_change_logs_of_asset(mock_insert):
+    asset_id = uuid4()
+
+    await change_logs.create_change_logs(
+        ORMAsset(asset_id=asset_id), [CHANGE_LOG, {**CHANGE_LOG, "detail": "Done"}]
+    )
+
+    rows = mock_insert.values.call_args.args[0]
+    assert rows == [
+        {
+            "asset_id": asset_id,
+            "date_time": datetime(2026, 10, 18, 12),
+            "status": "success",
+            "message": "Asset created",
+            "detail": None,
+        },
+        {
+            "asset_id": asset_id,
+            "date_time": datetime(2026, 10, 18, 12),
+            "status": "success",
+            "message": "Asset created",
+            "detail": "Done",
+        },
+    ]
+    mock_insert.values.return_value.gino.status.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_change_logs_of_version_in_utc(mock_insert):
+    date_time = datetime(2026, 10, 18, 14, tzinfo=timezone(timedelta(hours=2)))
+
+    await change_logs.create_change_logs(
+        ORMVersion(dataset="my_dataset", version="v1"),
+        [{**CHANGE_LOG, "date_time": date_time}],
+    )
+
+    (row,) = mock_insert.values.call_args.args[0]
+    assert row["dataset"] == "my_dataset"
+    assert row["version"] == "v1"
+    assert "asset_id" not in row
+    assert row["date_time"] == datetime(2026, 10, 18, 12)
+
+
+@pytest.mark.asyncio
+async def test_update_data_appends_asset_change_log_to_table():
+    row = ORMAsset(asset_id=uuid4(), change_log=[])
+
+    with patch.object(
+        change_logs, "create_change_logs", AsyncMock()
+    ) as mock_create, patch.object(ORMAsset, "update") as mock_update:
+        mock_update.return_value.apply = AsyncMock()
+        await update_data(row, {"status": "saved", "change_log": [CHANGE_LOG]})
+
+    mock_create.assert_awaited_once_with(row, [CHANGE_LOG])
+    mock_update.assert_called_once_with(status="saved")
+    assert row.change_log == []
+
+
+@pytest.mark.asyncio
+async def test_update_data_skips_row_update_for_change_log_only():
+    row = ORMVersion(dataset="my_dataset", version="v1")
+
+    with patch.object(
+        change_logs, "create_change_logs", AsyncMock()
+    ) as mock_create, patch.object(ORMVersion, "update") as mock_update:
+        await update_data(row, {"change_log": [CHANGE_LOG]})
+
+    mock_create.assert_awaited_once()
+    mock_update.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_data_keeps_task_change_log_in_row():
+    row = ORMTask(task_id=uuid4(), change_log=[])
+
+    with patch.object(
+        change_logs, "create_change_logs", AsyncMock()
+    ) as mock_create, patch.object(ORMTask, "update") as mock_update:
+        mock_update.return_value.apply = AsyncMock()
+        await update_data(row, {"change_log": [CHANGE_LOG]})
+
+    mock_create.assert_not_called()
+    (entry,) = mock_update.call_args.kwargs["change_log"]
+    assert entry["status"] == "success"
@@ -1,9 +1,17 @@
-from unittest.mock import patch
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.crud.geostore import get_gadm_geostore, get_gadm_geostore_id
+from app.crud import geostore as geostore_crud
+from app.crud.geostore import (
+    create_user_area,
+    get_gadm_geostore,
+    get_gadm_geostore_id,
+)
 from app.errors import RecordNotFoundError
+from app.models.pydantic.geostore import Geometry
 
 
 @pytest.mark.asyncio
@@ -209,3 +217,200 @@ class TestGadmGeostoreIDLookup:
 
         assert mock_get_first_row.called is True
         assert actual_sql == expected_sql
+
+
+@pytest.mark.asyncio
+async def test_create_user_area_uses_single_upsert():
+    geometry = Geometry(
+        type="Polygon", coordinates=[[[0, 0], [0, 1], [1, 1], [1, 0], [0, 0]]]
+    )
+    row = SimpleNamespace(
+        gfw_geostore_id="d8a5a8fc-2c7b-3f8a-0e5d-6b8a9b1c2d3e",
+        gfw_geojson=geometry.json(),
+        gfw_area__ha=1232921.6,
+        gfw_bbox=[0, 0, 1, 1],
+        created_on=datetime(2024, 1, 1),
+        updated_on=datetime(2024, 1, 1),
+    )
+
+    with patch.object(geostore_crud.db, "all", new_callable=AsyncMock) as mock_all:
+        mock_all.return_value = [row]
+        geostore = await create_user_area(geometry)
+
+    mock_all.assert_awaited_once()
+    sql = mock_all.call_args.args[0]
+    assert "ON CONFLICT (gfw_geostore_id)" in sql.text
+    assert "RETURNING" in sql.text
+    assert sql.compile().params["geos"] == [geometry.json()]
+    assert geostore.gfw_bbox == [0, 0, 1, 1]
+
+
+def _geostore_row(geostore_id: str, **kwargs) -> SimpleNamespace:
+    return SimpleNamespace(
+        gfw_geostore_id=geostore_id,
+        gfw_geojson='{"type": "Polygon", "coordinates": []}',
+        gfw_bbox=[0, 0, 1, 1],
+        gfw_area__ha=1.0,
+        created_on=datetime(2026, 10, 18),
+        updated_on=datetime(2026, 10, 18),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_gfw_geostores_from_any_dataset_takes_one_round_trip():
+    geostore_id = "db2b4428-bad2-fc94-1ea8-041597dc482c"
+    row = _geostore_row(geostore_id)
+
+    with patch.object(geostore_crud.db, "all", new_callable=AsyncMock) as mock_all:
+        mock_all.return_value = [row, row]
+        geostores = await geostore_crud.get_gfw_geostores_from_any_dataset(
+            [geostore_id]
+        )
+
+    assert [str(geostore.gfw_geostore_id) for geostore in geostores] == [geostore_id]
+    mock_all.assert_awaited_once()
+    sql = mock_all.await_args.args[0]
+    assert "FROM gfw_get_geostores(" in str(sql)
+    assert "FROM geostore" not in str(sql)
+    assert sql.compile().params["geostore_ids"] == [geostore_id]
+
+
+@pytest.mark.asyncio
+async def test_get_gfw_geostores_from_any_dataset_registers_unregistered_ids():
+    geostore_id = "db2b4428-bad2-fc94-1ea8-041597dc482c"
+    unregistered_id = "0d6d2c5c-6b0e-4b8e-2e0b-8d4f0fa4f6d1"
+    missing_id = "b9faa657-34c9-96d4-fce4-8bb8a1507cb3"
+
+    row = _geostore_row(geostore_id)
+    unregistered_row = _geostore_row(
+        unregistered_id, dataset="some_dataset", version="v1"
+    )
+
+    mock_engine = AsyncMock()
+    with patch.object(
+        geostore_crud.db, "all", new_callable=AsyncMock
+    ) as mock_all, patch.object(
+        geostore_crud, "get_write_engine", return_value=mock_engine
+    ):
+        mock_all.side_effect = [[row], [unregistered_row]]
+        geostores = await geostore_crud.get_gfw_geostores_from_any_dataset(
+            [geostore_id, unregistered_id, missing_id]
+        )
+
+    assert [str(geostore.gfw_geostore_id) for geostore in geostores] == [
+        geostore_id,
+        unregistered_id,
+    ]
+    assert mock_all.await_count == 2
+    fallback_sql = mock_all.await_args_list[1].args[0]
+    assert "FROM geostore AS g" in str(fallback_sql)
+    assert fallback_sql.compile().params["geostore_ids"] == [
+        unregistered_id,
+        missing_id,
+    ]
+
+    mock_engine.status.assert_awaited_once()
+    insert_sql = mock_engine.status.await_args.args[0]
+    assert "INSERT INTO geostore_lookup" in str(insert_sql)
+    params = insert_sql.compile().params
+    assert params["geostore_ids"] == [unregistered_id]
+    assert params["datasets"] == ["some_dataset"]
+    assert params["versions"] == ["v1"]
+
+
+@pytest.mark.parametrize(
+    "simplify, expected",
+    [
+        (0.00001, None),
+        (0.0002, 0.0001),
+        (0.00022, None),
+        (0.004, 0.005),
+        (0.007, 0.005),
+        (0.008, 0.01),
+        (0.2, 0.1),
+        (1, None),
+    ],
+)
+def test_snap_simplify_tolerance(simplify, expected):
+    assert geostore_crud.snap_simplify_tolerance(simplify) == expected
+
+
+@pytest.mark.asyncio
+async def test_get_gadm_geostore_uses_pre_computed_simplified_boundaries():
+    with patch("app.crud.geostore.get_first_row") as mock_get_first_row, patch(
+        "app.crud.geostore.has_simplified_boundaries", return_value=True
+    ):
+        mock_get_first_row.return_value = None
+        try:
+            _ = await get_gadm_geostore("gadm", "4.1", 0, 0.004, "MEX")
+        except RecordNotFoundError:
+            pass
+
+    expected_sql = (
+        "SELECT adm_level, gfw_area__ha, gfw_bbox, gfw_geostore_id, "
+        "gid_0 AS level_id, country AS name, coalesce((SELECT geojson "
+        '\nFROM gadm_administrative_boundaries."v4.1.64__simplified" '
+        "\nWHERE gfw_geostore_id = "
+        'gadm_administrative_boundaries."v4.1.64".gfw_geostore_id '
+        "AND tolerance = 0.005), ST_AsGeoJSON(ST_Simplify(geom, 0.005))) AS geojson "
+        '\nFROM gadm_administrative_boundaries."v4.1.64" \n'
+        "WHERE adm_level='0' AND gid_0='MEX'"
+    )
+
+    actual_sql = str(
+        mock_get_first_row.call_args.args[0].compile(
+            compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert actual_sql == expected_sql
+
+
+@pytest.mark.asyncio
+async def test_has_simplified_boundaries_caches_results_briefly():
+    with patch.dict(geostore_crud._simplified_boundaries_cache, clear=True), patch(
+        "app.crud.geostore.db.scalar", side_effect=[False, True]
+    ) as mock_scalar, patch("app.crud.geostore.time.monotonic") as mock_monotonic:
+        mock_monotonic.return_value = 0.0
+        assert not await geostore_crud.has_simplified_boundaries("gadm", "v4.1")
+        assert not await geostore_crud.has_simplified_boundaries("gadm", "v4.1")
+        assert mock_scalar.await_count == 1
+
+        mock_monotonic.return_value = geostore_crud.SIMPLIFIED_BOUNDARIES_CACHE_TTL
+        assert await geostore_crud.has_simplified_boundaries("gadm", "v4.1")
+        assert await geostore_crud.has_simplified_boundaries("gadm", "v4.1")
+        assert mock_scalar.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_gadm_geostore_simplifies_far_tolerances_on_the_fly():
+    with patch("app.crud.geostore.get_first_row") as mock_get_first_row, patch(
+        "app.crud.geostore.has_simplified_boundaries", return_value=True
+    ) as mock_has_simplified_boundaries:
+        mock_get_first_row.return_value = None
+        with pytest.raises(RecordNotFoundError):
+            await get_gadm_geostore("gadm", "4.1", 0, 1, "MEX")
+
+    mock_has_simplified_boundaries.assert_not_called()
+    actual_sql = str(mock_get_first_row.call_args.args[0].compile())
+    assert "__simplified" not in actual_sql
+    assert "ST_Simplify(geom" in actual_sql
+
+
+@pytest.mark.asyncio
+async def test_get_gadm_geostore_limits_precision():
+    with patch("app.crud.geostore.get_first_row") as mock_get_first_row:
+        mock_get_first_row.return_value = None
+        try:
+            _ = await get_gadm_geostore("gadm", "4.1", 0, None, "MEX", precision=4)
+        except RecordNotFoundError:
+            pass
+
+    actual_sql = str(
+        mock_get_first_row.call_args.args[0].compile(
+            compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert "ST_AsGeoJSON(geom, 4) AS geojson" in actual_sql
@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from asyncpg import ForeignKeyViolationError
+
+from app.crud import tasks as crud_tasks
+from app.errors import RecordNotFoundError
+
+
+@pytest.fixture
+def mock_insert():
+    insert = MagicMock()
+    insert.values.return_value.gino.status = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(crud_tasks.ORMTask, "insert", return_value=insert):
+        with patch.object(crud_tasks.db, "transaction", return_value=transaction):
+            yield insert
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_inserts_all_rows_at_once(mock_insert):
+    asset_id = uuid4()
+    task_ids = [uuid4(), uuid4()]
+
+    await crud_tasks.create_tasks(
+        asset_id, {task_id: {"change_log": [{"status": "pending"}]} for task_id in task_ids}
+    )
+
+    mock_insert.values.assert_called_once()
+    rows = mock_insert.values.call_args.args[0]
+    assert [row["task_id"] for row in rows] == task_ids
+    assert all(row["asset_id"] == asset_id for row in rows)
+    assert rows[0]["change_log"] == [{"status": "pending"}]
+    mock_insert.values.return_value.gino.status.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_missing_asset(mock_insert):
+    mock_insert.values.return_value.gino.status.side_effect = ForeignKeyViolationError()
+
+    with pytest.raises(RecordNotFoundError):
+        await crud_tasks.create_tasks(uuid4(), {uuid4(): {"change_log": []}})
+
+
+@pytest.mark.asyncio
+async def test_count_unfinished_tasks_counts_in_sql():
+    asset_id = uuid4()
+
+    with patch.object(crud_tasks.db, "scalar", AsyncMock(return_value=2)) as mock_scalar:
+        count = await crud_tasks.count_unfinished_tasks(asset_id)
+
+    assert count == 2
+    sql = mock_scalar.await_args.args[0]
+    assert "NOT EXISTS" in str(sql)
+    assert sql.compile().params == {"asset_id": asset_id, "status": "success"}
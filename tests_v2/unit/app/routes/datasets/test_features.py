@@ -0,0 +1,19 @@
+from datetime import date
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from app.routes.datasets.features import _features_response
+
+
+@pytest.mark.asyncio
+async def test_features_response_serializes_rows_like_fastapi():
+    rows = [{"frp__mw": Decimal("1.5"), "alert__date": date(2024, 1, 2)}]
+
+    response = await _features_response(rows)
+
+    assert orjson.loads(response.body) == {
+        "data": [{"frp__mw": 1.5, "alert__date": "2024-01-02"}],
+        "status": "success",
+    }
@@ -1,6 +1,8 @@
 import re
+from datetime import timedelta
+from decimal import Decimal
 from typing import List, Tuple
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 from urllib.parse import parse_qsl, urlparse
 from uuid import UUID
 
@@ -24,6 +26,7 @@ from app.routes.datasets.queries import (
     _get_data_environment_sql,
     _get_date_conf_derived_layers,
     _query_dataset_json,
+    _query_dataset_json_bytes,
     _query_raster,
     _query_raster_lambda,
 )
@@ -190,6 +193,30 @@ async def test_query_dataset_raster_post(
     assert response.json()["status"] == "success"
 
 
+@pytest.mark.asyncio
+async def test_query_dataset_json_encodes_non_json_types(
+    generic_raster_version,
+    apikey,
+    monkeypatch: MonkeyPatch,
+    async_client: AsyncClient,
+):
+    dataset_name, version_name, _ = generic_raster_version
+
+    async def _query_dataset_json_mocked(*args, **kwargs):
+        return [{"duration": timedelta(minutes=1), "data": b"abc"}]
+
+    monkeypatch.setattr(queries, "_query_dataset_json", _query_dataset_json_mocked)
+
+    response = await async_client.get(
+        f"/dataset/{dataset_name}/{version_name}/query/json",
+        params={"sql": "select 1 from data"},
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"duration": 60.0, "data": "abc"}]
+
+
 @pytest.mark.asyncio
 async def test_redirect_post_query(
     generic_raster_version,
@@ -862,3 +889,141 @@ def test__get_date_conf_derived_layers_encode_decode_roundtrip():
                 layer.decode_expression, {"datetime64": datetime64, "A": encoded}
             )
             assert decoded == original_date
+
+
+@pytest.mark.asyncio
+async def test_query_async_table(
+    generic_vector_source_version,
+    apikey,
+    monkeypatch: MonkeyPatch,
+    async_client: AsyncClient,
+):
+    dataset_name, version_name, _ = generic_vector_source_version
+    batch_job_id = UUID("0ad7d9a1-8a56-4a4f-b1de-1f2c4c4b0b3e")
+
+    submitted_jobs = []
+
+    def submit_batch_job_mocked(job):
+        submitted_jobs.append(job)
+        return batch_job_id
+
+    monkeypatch.setattr(queries, "submit_batch_job", submit_batch_job_mocked)
+    mock_s3_client = MagicMock()
+    monkeypatch.setattr(queries, "get_s3_client", lambda: mock_s3_client)
+
+    payload = {"sql": "select count(*) from data", "format": "csv"}
+
+    response = await async_client.post(
+        f"/dataset/{dataset_name}/{version_name}/query/async",
+        json=payload,
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 202
+
+    data = response.json()["data"]
+    assert data["job_id"] == str(batch_job_id)
+    assert data["job_link"].endswith(f"/job/{batch_job_id}")
+    assert data["status"] == "pending"
+
+    assert len(submitted_jobs) == 1
+    command = submitted_jobs[0].command
+    assert command[0] == "export_query_results.sh"
+    # The SQL is uploaded to S3 rather than passed in the job command
+    kwargs = mock_s3_client.put_object.call_args.kwargs
+    assert kwargs["Body"] == (
+        f"SELECT count(*) FROM {dataset_name}.{version_name}"
+    ).encode()
+    assert command[command.index("--sql_uri") + 1] == (
+        f"s3://{kwargs['Bucket']}/{kwargs['Key']}"
+    )
+    assert command[command.index("-F") + 1] == "csv"
+
+
+@pytest.mark.asyncio
+async def test_query_async_raster_not_supported(
+    generic_raster_version,
+    apikey,
+    async_client: AsyncClient,
+):
+    dataset_name, version_name, _ = generic_raster_version
+
+    response = await async_client.post(
+        f"/dataset/{dataset_name}/{version_name}/query/async",
+        json={"sql": "select count(*) from data"},
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_query_dataset_json_passthrough(
+    generic_vector_source_version,
+    apikey,
+    monkeypatch: MonkeyPatch,
+    async_client: AsyncClient,
+):
+    dataset_name, version_name, _ = generic_vector_source_version
+    monkeypatch.setattr(queries, "QUERY_JSON_PASSTHROUGH", True)
+
+    params = {"sql": "select count(*) as count from data"}
+    response = await async_client.get(
+        f"/dataset/{dataset_name}/{version_name}/query/json",
+        params=params,
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"data": [{"count": 1}], "status": "success"}
+    assert response.headers["Cache-Control"] == "max-age=7200"
+
+    params = {"sql": "select * from data where false"}
+    response = await async_client.get(
+        f"/dataset/{dataset_name}/{version_name}/query/json",
+        params=params,
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"data": [], "status": "success"}
+
+    params = {"sql": "select 1 as n, 2 as n from data"}
+    response = await async_client.get(
+        f"/dataset/{dataset_name}/{version_name}/query/json",
+        params=params,
+        headers=get_headers_with_origin(apikey),
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_query_dataset_json_bytes_encodes_raster_results_like_table_results():
+    geostore = MagicMock()
+    with patch.object(queries.assets, "get_default_asset", AsyncMock()), patch.object(
+        queries, "_get_query_type", return_value=queries.QueryType.raster
+    ), patch.object(
+        queries,
+        "_query_raster",
+        AsyncMock(return_value={"data": [{"area__ha": Decimal("1.5"), "ids": {1}}]}),
+    ):
+        result = await _query_dataset_json_bytes(
+            "some_dataset", "v1", "select 1", geostore
+        )
+
+    assert result == b'[{"area__ha":1.5,"ids":[1]}]'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exact_numeric", [True, False])
+async def test_query_dataset_json_table_numeric_type(exact_numeric):
+    # Downloads, datamart and the political ID lookup rely on the default
+    mock_query_table = AsyncMock(return_value=[])
+    kwargs = {} if exact_numeric else {"exact_numeric": False}
+    with patch.object(queries.assets, "get_default_asset", AsyncMock()), patch.object(
+        queries, "_get_query_type", return_value=queries.QueryType.table
+    ), patch.object(queries, "_query_table", mock_query_table):
+        await _query_dataset_json("some_dataset", "v1", "select 1", None, **kwargs)
+
+    assert mock_query_table.await_args.kwargs == {"exact_numeric": exact_numeric}
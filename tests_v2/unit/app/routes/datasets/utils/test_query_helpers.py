@@ -1,8 +1,17 @@
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from asyncpg import InternalServerError, QueryCanceledError
 from fastapi import HTTPException
 
 from app.models.pydantic.geostore import Geometry
-from app.routes.datasets.utils.query_helpers import scrutinize_sql
+from app.routes.datasets.utils import query_helpers
+from app.routes.datasets.utils.query_helpers import (
+    check_query_cost,
+    ensure_unique_column_names,
+    scrutinize_sql,
+    translate_query_errors,
+)
 
 test_dataset: str = "test_dataset"
 test_version: str = "v2025"
@@ -177,6 +186,92 @@ async def test_scrutinize_sql_with_geom_no_where():
     assert result == sql_expected
 
 
+@pytest.mark.asyncio
+async def test_scrutinize_sql_with_subdivided_geom(monkeypatch):
+    monkeypatch.setattr(query_helpers, "QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES", 4)
+    geometry = Geometry(
+        type="Polygon", coordinates=[[[0, 0], [2, 0], [2, 1], [0, 1], [0, 0]]]
+    )
+    sql_in: str = "SELECT * FROM mytable WHERE id = 1"
+    sql_expected: str = (
+        "SELECT * FROM test_dataset.v2025 WHERE id = 1"
+        " AND (geom && st_makeenvelope(0.0, 0.0, 2.0, 1.0, 4326)"
+        " AND EXISTS (SELECT 1 FROM unnest(CAST(ARRAY['piece1', 'piece2'] AS geometry[])) AS piece"
+        " WHERE st_intersects(geom, piece)))"
+    )
+
+    with patch.object(
+        query_helpers,
+        "subdivide_geometry",
+        AsyncMock(return_value=["piece1", "piece2"]),
+    ) as mock_subdivide:
+        result = await scrutinize_sql(test_dataset, test_version, geometry, sql_in)
+
+    assert result == sql_expected
+    mock_subdivide.assert_awaited_once_with(geometry.json(), 4)
+
+
+@pytest.mark.asyncio
+async def test_scrutinize_sql_does_not_subdivide_small_geom(monkeypatch):
+    monkeypatch.setattr(query_helpers, "QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES", 5)
+    geometry = Geometry(
+        type="Polygon", coordinates=[[[0, 0], [2, 0], [2, 1], [0, 1], [0, 0]]]
+    )
+
+    with patch.object(query_helpers, "subdivide_geometry") as mock_subdivide:
+        result = await scrutinize_sql(
+            test_dataset, test_version, geometry, "SELECT * FROM mytable"
+        )
+
+    mock_subdivide.assert_not_called()
+    assert "st_geomfromgeojson" in result
+
+
+@pytest.mark.asyncio
+async def test_scrutinize_sql_rejects_invalid_geom(monkeypatch):
+    monkeypatch.setattr(query_helpers, "QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES", 5)
+    geometry = Geometry(type="Polygon", coordinates=[[[0, 0], [2, 0]]])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await scrutinize_sql(test_dataset, test_version, geometry, "SELECT * FROM t")
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail.startswith("Invalid geometry.")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        InternalServerError("GEOSIntersects: TopologyException"),
+        QueryCanceledError("canceling statement due to statement timeout"),
+    ],
+)
+async def test_scrutinize_sql_translates_subdivide_errors(monkeypatch, error):
+    monkeypatch.setattr(query_helpers, "QUERY_GEOMETRY_SUBDIVIDE_MAX_VERTICES", 4)
+    geometry = Geometry(
+        type="Polygon", coordinates=[[[0, 0], [2, 0], [2, 1], [0, 1], [0, 0]]]
+    )
+
+    with patch.object(
+        query_helpers, "subdivide_geometry", AsyncMock(side_effect=error)
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await scrutinize_sql(
+                test_dataset, test_version, geometry, "SELECT * FROM t"
+            )
+
+    assert exc_info.value.status_code == 400
+
+
+def test_translate_query_errors_keeps_query_timeouts():
+    error = QueryCanceledError("canceling statement due to statement timeout")
+
+    with pytest.raises(QueryCanceledError):
+        with translate_query_errors():
+            raise error
+
+
 @pytest.mark.asyncio
 async def test_scrutinize_sql_gibberish():
     sql: str = "foo;"
@@ -195,3 +290,76 @@ async def test_scrutinize_sql_replaces_from_clause_when_column_and_table_are_ali
 
     result = await scrutinize_sql(test_dataset, test_version, None, sql)
     assert result == expected_sql_out
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM ds.v1",
+        "SELECT id, t.id AS other_id, count(*), sum(area) FROM ds.v1 AS t",
+        "SELECT 1, 1::int, CASE WHEN id > 1 THEN 1 END FROM ds.v1",
+    ],
+)
+def test_ensure_unique_column_names_passes_unique_names(sql):
+    ensure_unique_column_names(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1 AS n, 2 AS n FROM ds.v1",
+        "SELECT id, t.id FROM ds.v1 AS t",
+        "SELECT count(*), count(id) FROM ds.v1",
+        "SELECT 1, 2 FROM ds.v1",
+        "SELECT name, other::text AS name FROM ds.v1",
+    ],
+)
+def test_ensure_unique_column_names_rejects_duplicates(sql):
+    with pytest.raises(HTTPException) as exc_info:
+        ensure_unique_column_names(sql)
+
+    assert exc_info.value.status_code == 400
+
+
+def test_get_query_cost_limit_prefers_exact_match_over_pattern(monkeypatch):
+    monkeypatch.setattr(
+        query_helpers,
+        "QUERY_COST_LIMITS",
+        {"gadm__tcl__*": 100.0, "gadm__tcl__iso_summary": 50.0},
+    )
+    monkeypatch.setattr(query_helpers, "DEFAULT_QUERY_COST_LIMIT", None)
+
+    assert query_helpers.get_query_cost_limit("gadm__tcl__iso_summary") == 50.0
+    assert query_helpers.get_query_cost_limit("gadm__tcl__adm2_summary") == 100.0
+    assert query_helpers.get_query_cost_limit("wdpa_protected_areas") is None
+
+
+@pytest.mark.asyncio
+async def test_check_query_cost_skips_explain_without_limit(monkeypatch):
+    monkeypatch.setattr(query_helpers, "QUERY_COST_LIMITS", {})
+    monkeypatch.setattr(query_helpers, "DEFAULT_QUERY_COST_LIMIT", None)
+
+    with patch.object(
+        query_helpers, "estimate_query_cost", new_callable=AsyncMock
+    ) as mock_estimate:
+        await check_query_cost(test_dataset, "SELECT * FROM test_dataset.v2025")
+
+    mock_estimate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_check_query_cost_rejects_expensive_queries(monkeypatch):
+    monkeypatch.setattr(query_helpers, "QUERY_COST_LIMITS", {test_dataset: 1000.0})
+
+    with patch.object(
+        query_helpers, "estimate_query_cost", new_callable=AsyncMock
+    ) as mock_estimate:
+        mock_estimate.return_value = 1000.0
+        await check_query_cost(test_dataset, "SELECT * FROM test_dataset.v2025")
+
+        mock_estimate.return_value = 1000.5
+        with pytest.raises(HTTPException) as exc_info:
+            await check_query_cost(test_dataset, "SELECT * FROM test_dataset.v2025")
+
+    assert exc_info.value.status_code == 400
+    assert "exceeds the limit" in exc_info.value.detail
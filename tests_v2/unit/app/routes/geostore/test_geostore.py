@@ -416,6 +416,50 @@ async def test_add_geostore_sends_gfw_style_payloads_to_gfw(async_client: AsyncC
     assert mock_create_gfw_geostore.called is True
 
 
+@pytest.mark.asyncio
+async def test_add_geostores_in_bulk(async_client: AsyncClient):
+    url = "/geostore/bulk"
+    payload = {
+        "geometries": [
+            create_gfw_geostore_payload["geometry"],
+            create_gfw_geostore_payload["geometry"],
+        ]
+    }
+
+    with patch(
+        "app.routes.geostore.geostore.geostore.create_user_areas",
+        return_value=[create_gfw_geostore_data, create_gfw_geostore_data],
+    ) as mock_create_user_areas:
+        resp = await async_client.post(url, json=payload)
+
+    assert resp.status_code == 201
+    assert len(resp.json()["data"]) == 2
+    assert len(mock_create_user_areas.call_args.args[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_lookup_geostores(async_client: AsyncClient):
+    url = "/geostore/lookup"
+    payload = {
+        "geostore_ids": [
+            create_gfw_geostore_data["gfw_geostore_id"],
+            "00000000-0000-0000-0000-000000000000",
+        ]
+    }
+
+    with patch(
+        "app.routes.geostore.geostore.geostore.get_gfw_geostores_from_any_dataset",
+        return_value=[create_gfw_geostore_data],
+    ) as mock_get_geostores:
+        resp = await async_client.post(url, json=payload)
+
+    assert resp.status_code == 200
+    assert [g["gfw_geostore_id"] for g in resp.json()["data"]] == [
+        create_gfw_geostore_data["gfw_geostore_id"]
+    ]
+    assert len(mock_get_geostores.call_args.args[0]) == 2
+
+
 @pytest.mark.asyncio
 async def test_get_geostore_by_rw_style_id_proxies_to_rw(async_client: AsyncClient):
     url = "/geostore/88db597b6bcd096fb80d1542cdc442be"
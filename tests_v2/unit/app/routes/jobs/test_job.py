@@ -1,5 +1,6 @@
 import json
 
+import botocore
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from httpx import AsyncClient
@@ -189,3 +190,111 @@ async def test_job_failed(
     assert data["status"] == "failed"
     assert data["download_link"] is None
     assert data["progress"] is None
+
+
+async def _get_sfn_execution_mocked_missing(job_id):
+    raise botocore.exceptions.ClientError(
+        {"Error": {"Code": "ExecutionDoesNotExist", "Message": "Not found"}},
+        "DescribeExecution",
+    )
+
+
+async def _get_batch_job_mocked_succeeded(job_id):
+    return {
+        "jobId": TEST_JOB_ID,
+        "jobName": "async_table_query",
+        "status": "SUCCEEDED",
+        "container": {"command": ["export_query_results.sh", "-F", "parquet"]},
+    }
+
+
+async def _get_batch_job_mocked_failed(job_id):
+    return {
+        "jobId": TEST_JOB_ID,
+        "jobName": "async_table_query",
+        "status": "FAILED",
+        "statusReason": "Job attempt duration exceeded timeout",
+        "container": {"command": ["export_query_results.sh", "-F", "csv"]},
+    }
+
+
+async def _get_batch_job_mocked_runnable(job_id):
+    return {
+        "jobId": TEST_JOB_ID,
+        "jobName": "async_table_query",
+        "status": "RUNNABLE",
+        "container": {"command": ["export_query_results.sh", "-F", "csv"]},
+    }
+
+
+async def _get_batch_job_mocked_missing(job_id):
+    return None
+
+
+@pytest.mark.asyncio
+async def test_async_query_job_success(
+    async_client: AsyncClient,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(job, "_get_sfn_execution", _get_sfn_execution_mocked_missing)
+    monkeypatch.setattr(job, "_get_batch_job", _get_batch_job_mocked_succeeded)
+
+    resp = await async_client.get(f"job/{TEST_JOB_ID}")
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+
+    assert data["job_id"] == TEST_JOB_ID
+    assert data["status"] == "success"
+    assert f"query_results/{TEST_JOB_ID}/results.parquet" in data["download_link"]
+    assert data["progress"] == "100%"
+
+
+@pytest.mark.asyncio
+async def test_async_query_job_failed(
+    async_client: AsyncClient,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(job, "_get_sfn_execution", _get_sfn_execution_mocked_missing)
+    monkeypatch.setattr(job, "_get_batch_job", _get_batch_job_mocked_failed)
+
+    resp = await async_client.get(f"job/{TEST_JOB_ID}")
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+
+    assert data["status"] == "failed"
+    assert data["message"] == "Job attempt duration exceeded timeout"
+    assert data["download_link"] is None
+
+
+@pytest.mark.asyncio
+async def test_async_query_job_pending(
+    async_client: AsyncClient,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(job, "_get_sfn_execution", _get_sfn_execution_mocked_missing)
+    monkeypatch.setattr(job, "_get_batch_job", _get_batch_job_mocked_runnable)
+
+    resp = await async_client.get(f"job/{TEST_JOB_ID}")
+
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+
+    assert data["status"] == "pending"
+    assert data["message"] == "Batch job status: RUNNABLE"
+    assert data["progress"] == "0%"
+    assert data["download_link"] is None
+
+
+@pytest.mark.asyncio
+async def test_job_not_found(
+    async_client: AsyncClient,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(job, "_get_sfn_execution", _get_sfn_execution_mocked_missing)
+    monkeypatch.setattr(job, "_get_batch_job", _get_batch_job_mocked_missing)
+
+    resp = await async_client.get(f"job/{TEST_JOB_ID}")
+
+    assert resp.status_code == 404
@@ -114,6 +114,19 @@ async def test__admin_boundary_lookup_sql_all_normalized() -> None:
     )
 
 
+@pytest.mark.asyncio
+async def test__admin_boundary_lookup_sql_prefix_search() -> None:
+    sql = _admin_boundary_lookup_sql(
+        1, True, "some_dataset", "some_country", "50%_off", None, prefix_search=True
+    )
+    assert sql == (
+        "SELECT gid_0, gid_1, gid_2, country, name_1, name_2 FROM some_dataset"
+        " WHERE country_normalized LIKE $country$some\\_country%$country$"
+        " AND name_1_normalized LIKE $region$50\\%\\_off%$region$"
+        " AND adm_level='1'"
+    )
+
+
 @pytest.mark.asyncio
 async def test__admin_boundary_lookup_sql_no_single_quotes() -> None:
     sql = _admin_boundary_lookup_sql(
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.enum.assets import AssetStatus, AssetType
+from app.models.enum.versions import VersionStatus
+from app.routes.tasks import task
+
+
+@pytest.fixture
+def mock_transaction():
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(task.db, "transaction", return_value=transaction):
+        yield transaction
+
+
+def _asset(status, is_default=True):
+    return SimpleNamespace(
+        status=status,
+        asset_type=AssetType.raster_tile_cache,
+        is_default=is_default,
+        dataset="some_dataset",
+        version="v1",
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_completed_saves_asset_when_no_task_is_unfinished(
+    mock_transaction,
+):
+    asset_id = uuid4()
+    post_completion_task = AsyncMock()
+
+    with patch.object(
+        task.assets, "lock_asset", AsyncMock(return_value=_asset(AssetStatus.pending))
+    ), patch.object(
+        task.tasks, "count_unfinished_tasks", AsyncMock(return_value=0)
+    ), patch.object(
+        task.assets,
+        "update_asset",
+        AsyncMock(return_value=_asset(AssetStatus.saved)),
+    ) as mock_update_asset, patch.object(
+        task, "_post_completion_task_factory", return_value=post_completion_task
+    ), patch.object(
+        task.versions, "update_version", AsyncMock()
+    ) as mock_update_version:
+        await task._check_completed(asset_id)
+
+    mock_transaction.__aenter__.assert_awaited_once()
+    assert mock_update_asset.await_args.kwargs["status"] == AssetStatus.saved
+    post_completion_task.assert_awaited_once_with(asset_id)
+    assert mock_update_version.await_args.kwargs["status"] == VersionStatus.saved
+
+
+@pytest.mark.parametrize(
+    "status, unfinished",
+    [(AssetStatus.pending, 3), (AssetStatus.saved, 0)],
+)
+@pytest.mark.asyncio
+async def test_check_completed_leaves_asset_alone(mock_transaction, status, unfinished):
+    with patch.object(
+        task.assets, "lock_asset", AsyncMock(return_value=_asset(status))
+    ), patch.object(
+        task.tasks, "count_unfinished_tasks", AsyncMock(return_value=unfinished)
+    ), patch.object(
+        task.assets, "update_asset", AsyncMock()
+    ) as mock_update_asset, patch.object(
+        task.versions, "update_version", AsyncMock()
+    ) as mock_update_version:
+        await task._check_completed(uuid4())
+
+    mock_update_asset.assert_not_awaited()
+    mock_update_version.assert_not_awaited()
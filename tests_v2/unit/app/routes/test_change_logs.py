@@ -0,0 +1,89 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.orm.change_logs import ChangeLog as ORMChangeLog
+from app.models.pydantic.change_log import (
+    ChangeLogResponse,
+    PaginatedChangeLogResponse,
+)
+from app.routes import change_logs
+from app.routes.change_logs import change_log_response
+
+REQUEST_URL = "http://localhost/dataset/my_dataset/v1/change_log"
+
+
+def _rows(count):
+    return [
+        ORMChangeLog(
+            change_log_id=i,
+            dataset="my_dataset",
+            version="v1",
+            date_time=datetime(2026, 10, 18, i),
+            status="pending",
+            message=f"Step {i}",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_change_log_response_returns_entire_version_change_log():
+    with patch.object(
+        change_logs.change_logs,
+        "get_version_change_logs",
+        AsyncMock(return_value=_rows(3)),
+    ) as mock_get:
+        response = await change_log_response(
+            REQUEST_URL, dataset="my_dataset", version="v1"
+        )
+
+    mock_get.assert_awaited_once_with("my_dataset", "v1")
+    assert isinstance(response, ChangeLogResponse)
+    assert [entry.message for entry in response.data] == ["Step 0", "Step 1", "Step 2"]
+
+
+@pytest.mark.asyncio
+async def test_change_log_response_paginates_asset_change_log():
+    asset_id = uuid4()
+    paged_items_fn = AsyncMock(return_value=_rows(2))
+
+    with patch.object(
+        change_logs.change_logs,
+        "get_filtered_change_logs_fn",
+        AsyncMock(return_value=paged_items_fn),
+    ) as mock_get_fn, patch.object(
+        change_logs.change_logs,
+        "count_filtered_change_logs_fn",
+        AsyncMock(return_value=AsyncMock(return_value=5)),
+    ):
+        response = await change_log_response(
+            REQUEST_URL, page_number=2, page_size=2, asset_id=asset_id
+        )
+
+    mock_get_fn.assert_awaited_once_with(asset_id=asset_id)
+    paged_items_fn.assert_awaited_once_with(2, 2)
+    assert isinstance(response, PaginatedChangeLogResponse)
+    assert len(response.data) == 2
+    assert response.meta.total_items == 5
+    assert response.meta.total_pages == 3
+
+
+@pytest.mark.asyncio
+async def test_change_log_response_page_out_of_range():
+    with patch.object(
+        change_logs.change_logs,
+        "get_filtered_change_logs_fn",
+        AsyncMock(return_value=AsyncMock()),
+    ), patch.object(
+        change_logs.change_logs,
+        "count_filtered_change_logs_fn",
+        AsyncMock(return_value=AsyncMock(return_value=1)),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await change_log_response(REQUEST_URL, page_number=2, asset_id=uuid4())
+
+    assert exc_info.value.status_code == 422
@@ -0,0 +1,66 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from app.tasks.raster_tile_set_assets import raster_tile_set_assets
+from app.tasks.raster_tile_set_assets.raster_tile_set_assets import (
+    _collect_bandstats,
+    _read_raster_stats,
+)
+
+
+def _tile(band_stats):
+    return {"type": "Feature", "properties": {"bands": band_stats}}
+
+
+TILES = [
+    _tile(
+        [
+            {
+                "stats": {"min": 0, "max": 4, "mean": 1.0},
+                "histogram": {"min": 0, "max": 4, "count": 4, "buckets": [1, 2, 3, 4]},
+            },
+            {"stats": {"min": -1, "max": 1, "mean": 0.5}},
+        ]
+    ),
+    _tile(
+        [
+            {
+                "stats": {"min": 2, "max": 6, "mean": 3.0},
+                "histogram": {
+                    "min": 2,
+                    "max": 6,
+                    "count": 4,
+                    "buckets": [10, 20, 30, 40],
+                },
+            },
+            {"stats": {"min": -3, "max": 0, "mean": 1.5}},
+        ]
+    ),
+]
+
+
+def test_collect_bandstats_merges_tiles():
+    bandstats = _collect_bandstats(TILES)
+
+    assert len(bandstats) == 2
+    assert (bandstats[0].min, bandstats[0].max, bandstats[0].mean) == (0, 6, 2.0)
+    assert bandstats[0].histogram is not None
+    assert bandstats[0].histogram.value_count == [1, 2, 13, 24, 30, 40]
+    assert (bandstats[1].min, bandstats[1].max, bandstats[1].mean) == (-3, 1, 1.0)
+    assert bandstats[1].histogram is None
+
+
+def test_read_raster_stats_streams_tiles_geojson():
+    data = json.dumps({"type": "FeatureCollection", "features": TILES}).encode()
+    body = MagicMock()
+    body.iter_chunks.return_value = [data[:100], data[100:]]
+    s3_client = MagicMock()
+    s3_client.get_object.return_value = {"Body": body}
+
+    with patch.object(
+        raster_tile_set_assets, "get_s3_client", return_value=s3_client
+    ):
+        bandstats = _read_raster_stats("bucket", "tiles.geojson")
+
+    s3_client.get_object.assert_called_once_with(Bucket="bucket", Key="tiles.geojson")
+    assert bandstats == _collect_bandstats(TILES)
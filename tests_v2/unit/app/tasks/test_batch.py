@@ -1,9 +1,15 @@
-from typing import Dict, List
-from unittest.mock import MagicMock, patch
+from typing import Dict, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
 
+import pytest
 from fastapi.logger import logger
 
-from app.tasks.batch import submit_batch_job
+from app.errors import JobDependencyError
+from app.models.enum.change_log import ChangeLogStatus
+from app.models.pydantic.jobs import Job, PostgresqlClientJob
+from app.tasks import AssetTaskCallback
+from app.tasks.batch import execute, schedule, submit_batch_job
 from app.tasks.vector_source_assets import _create_add_gfw_fields_job
 from tests_v2.conftest import mock_callback
 
@@ -38,3 +44,168 @@ async def test_submit_batch_job(mock_uuid, mock_logging_info, mock_boto3_client)
     # Assert that the logger.info was called with the expected log message
     assert "add_gfw_fields" in mock_logging_info.call_args.args[0]
     assert "DON'T LOG ME" not in mock_logging_info.call_args.args[0]
+
+
+def _job(name: str, parents: Optional[List[str]] = None, callback=None) -> Job:
+    return PostgresqlClientJob(
+        dataset="some_dataset",
+        job_name=name,
+        command=["some_script.sh"],
+        parents=parents,
+        callback=callback or AsyncMock(spec=[]),
+    )
+
+
+@pytest.mark.asyncio
+async def test_schedule_submits_jobs_in_dependency_order():
+    submitted: Dict[str, UUID] = dict()
+    depends_on_by_job: Dict[str, List[str]] = dict()
+
+    def submit(job, depends_on=None):
+        # Parents must have been submitted before their children
+        depends_on_by_job[job.job_name] = [dep["jobId"] for dep in depends_on]
+        assert all(parent in submitted for parent in job.parents or [])
+        submitted[job.job_name] = uuid4()
+        return submitted[job.job_name]
+
+    callback = AsyncMock(spec=[])
+    jobs = [
+        _job("merge", ["zoom_1", "zoom_2"], callback),
+        _job("zoom_2", ["create"], callback),
+        _job("create", callback=callback),
+        _job("zoom_1", ["create"], callback),
+    ]
+
+    with patch("app.tasks.batch.submit_batch_job", side_effect=submit):
+        scheduled_jobs = await schedule(jobs)
+
+    assert scheduled_jobs == submitted
+    assert depends_on_by_job["create"] == []
+    assert depends_on_by_job["merge"] == [
+        str(submitted["zoom_1"]),
+        str(submitted["zoom_2"]),
+    ]
+    assert callback.await_count == 4
+    assert {call.kwargs["task_id"] for call in callback.await_args_list} == set(
+        submitted.values()
+    )
+
+
+@pytest.mark.asyncio
+async def test_schedule_detects_circular_dependencies():
+    jobs = [_job("create"), _job("a", ["create", "b"]), _job("b", ["a"])]
+
+    with patch("app.tasks.batch.submit_batch_job") as mock_submit:
+        with pytest.raises(JobDependencyError) as exc_info:
+            await schedule(jobs)
+
+    mock_submit.assert_not_called()
+    assert "'a'" in exc_info.value.detail and "'b'" in exc_info.value.detail
+
+
+@pytest.mark.asyncio
+async def test_schedule_requires_independent_job():
+    with pytest.raises(ValueError):
+        await schedule([_job("a", ["b"]), _job("b", ["a"])])
+
+
+@pytest.mark.asyncio
+async def test_execute_reports_unknown_parents_as_failed():
+    with patch("app.tasks.batch.submit_batch_job") as mock_submit:
+        change_log = await execute([_job("create"), _job("a", ["missing"])])
+
+    mock_submit.assert_not_called()
+    assert change_log.status == ChangeLogStatus.failed
+    assert "missing" in change_log.detail
+
+
+@pytest.mark.asyncio
+async def test_schedule_creates_tasks_of_an_asset_at_once():
+    asset_id = uuid4()
+    asset_callback = AsyncMock(spec=AssetTaskCallback)
+    asset_callback.asset_id = asset_id
+    other_callback = AsyncMock(spec=[])
+    jobs = [
+        _job("create", callback=asset_callback),
+        _job("index", callback=asset_callback),
+        _job("other", callback=other_callback),
+    ]
+
+    with patch("app.tasks.batch.submit_batch_job", side_effect=lambda *_: uuid4()):
+        with patch("app.tasks.batch.create_tasks") as mock_create_tasks:
+            scheduled_jobs = await schedule(jobs)
+
+    asset_callback.assert_not_awaited()
+    other_callback.assert_awaited_once()
+    mock_create_tasks.assert_awaited_once()
+    created_asset_id, change_logs = mock_create_tasks.await_args.args
+    assert created_asset_id == asset_id
+    assert set(change_logs) == {scheduled_jobs["create"], scheduled_jobs["index"]}
+    assert change_logs[scheduled_jobs["create"]].message == "Scheduled job create"
+
+
+@pytest.mark.asyncio
+async def test_schedule_creates_tasks_of_submitted_jobs_on_failure():
+    submitted: Dict[str, UUID] = dict()
+
+    def submit(job, depends_on=None):
+        if job.job_name == "zoom_2":
+            raise RuntimeError("Submission failed")
+        submitted[job.job_name] = uuid4()
+        return submitted[job.job_name]
+
+    callback = AsyncMock(spec=[])
+    jobs = [
+        _job("create", callback=callback),
+        _job("zoom_1", ["create"], callback),
+        _job("zoom_2", ["create"], callback),
+        _job("merge", ["zoom_1", "zoom_2"], callback),
+    ]
+
+    with patch("app.tasks.batch.submit_batch_job", side_effect=submit):
+        with pytest.raises(RuntimeError):
+            await schedule(jobs)
+
+    assert set(submitted) == {"create", "zoom_1"}
+    assert {call.kwargs["task_id"] for call in callback.await_args_list} == set(
+        submitted.values()
+    )
+
+
+@pytest.mark.asyncio
+async def test_schedule_creates_tasks_before_submitting_next_level():
+    asset_callback = AsyncMock(spec=AssetTaskCallback)
+    asset_callback.asset_id = uuid4()
+    created_task_ids: List[UUID] = list()
+    submitted: Dict[str, UUID] = dict()
+
+    def submit(job, depends_on=None):
+        # Parents may already report their status, so their tasks must exist
+        for parent in job.parents or []:
+            assert submitted[parent] in created_task_ids
+        submitted[job.job_name] = uuid4()
+        return submitted[job.job_name]
+
+    async def create_tasks(asset_id, change_logs):
+        created_task_ids.extend(change_logs)
+
+    jobs = [
+        _job("create", callback=asset_callback),
+        _job("index", ["create"], asset_callback),
+        _job("cluster", ["index"], asset_callback),
+    ]
+
+    with (
+        patch("app.tasks.batch.submit_batch_job", side_effect=submit),
+        patch(
+            "app.tasks.batch.create_tasks", side_effect=create_tasks
+        ) as mock_create_tasks,
+    ):
+        await schedule(jobs)
+
+    assert mock_create_tasks.await_count == 3
+    assert created_task_ids == [
+        submitted["create"],
+        submitted["index"],
+        submitted["cluster"],
+    ]
@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.enum.assets import AssetStatus
+from app.tasks import default_assets
+
+
+@pytest.mark.asyncio
+async def test_append_default_asset_sets_asset_pending_before_scheduling():
+    asset_id = uuid4()
+    input_data = {"creation_options": {"source_type": "table"}}
+    calls = MagicMock()
+
+    with patch.object(
+        default_assets.assets, "update_asset", AsyncMock()
+    ) as mock_update_asset, patch.object(
+        default_assets, "put_asset", AsyncMock()
+    ) as mock_put_asset:
+        calls.attach_mock(mock_update_asset, "update_asset")
+        calls.attach_mock(mock_put_asset, "put_asset")
+        await default_assets.append_default_asset(
+            "some_dataset", "v1", input_data, asset_id
+        )
+
+    assert [call[0] for call in calls.mock_calls] == ["update_asset", "put_asset"]
+    mock_update_asset.assert_awaited_once_with(asset_id, status=AssetStatus.pending)
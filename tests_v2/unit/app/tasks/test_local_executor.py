@@ -0,0 +1,216 @@
+import asyncio
+from typing import List, Optional
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.models.enum.change_log import ChangeLogStatus
+from app.models.pydantic.jobs import Job, PostgresqlClientJob
+from app.tasks import batch, local_executor
+from app.tasks.local_executor import _CPUPool, run_command, run_jobs, schedule
+
+
+def _job(
+    name: str,
+    command: List[str],
+    parents: Optional[List[str]] = None,
+    vcpus: int = 1,
+    attempts: int = 1,
+) -> Job:
+    return PostgresqlClientJob(
+        dataset="some_dataset",
+        job_name=name,
+        command=command,
+        parents=parents,
+        vcpus=vcpus,
+        attempts=attempts,
+        callback=AsyncMock(spec=[]),
+    )
+
+
+def test_run_command_measures_job():
+    result = run_command(
+        ["sh", "-c", "echo some output; echo PGPASSWORD=secret; exit 3"], {}
+    )
+
+    assert result.exit_code == 3
+    assert result.output == "some output\nPGPASSWORD=***\n"
+    assert result.wall_time > 0
+    assert result.max_rss > 0
+
+
+def test_run_command_reports_signals_like_a_shell():
+    result = run_command(["sh", "-c", "kill -9 $$"], {})
+
+    assert result.exit_code == 137
+
+
+def test_run_command_missing_command():
+    result = run_command(["no_such_script.sh"], {})
+
+    assert result.exit_code == 127
+
+
+@pytest.mark.asyncio
+async def test_cpu_pool_limits_concurrent_jobs():
+    pool = _CPUPool(3)
+    running: List[int] = []
+    max_running = 0
+
+    async def job(vcpus):
+        nonlocal max_running
+        async with pool.reserve(vcpus) as reserved:
+            running.append(reserved)
+            max_running = max(max_running, sum(running))
+            await asyncio.sleep(0.01)
+            running.remove(reserved)
+        return reserved
+
+    reserved = await asyncio.gather(job(2), job(2), job(1), job(8))
+
+    assert reserved == [2, 2, 1, 3]
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_run_jobs_runs_children_after_parents(tmp_path):
+    log = tmp_path / "log.txt"
+    jobs = [
+        _job("merge", ["sh", "-c", f"echo merge >> {log}"], ["zoom_1", "zoom_2"]),
+        _job("zoom_1", ["sh", "-c", f"sleep 0.1; echo zoom >> {log}"], ["create"]),
+        _job("create", ["sh", "-c", f"echo create >> {log}"]),
+        _job("zoom_2", ["sh", "-c", f"echo zoom >> {log}"], ["create"]),
+    ]
+    job_ids = {job.job_name: uuid4() for job in jobs}
+
+    with patch.object(local_executor, "_report_status", AsyncMock()) as mock_report:
+        results = await run_jobs(jobs, job_ids, vcpus=4)
+
+    assert log.read_text().split() == ["create", "zoom", "zoom", "merge"]
+    assert all(result.exit_code == 0 for result in results.values())
+    assert mock_report.await_count == 4
+    job_id, change_log = mock_report.await_args_list[-1].args
+    assert job_id == job_ids["merge"]
+    assert change_log.status == ChangeLogStatus.success
+    assert "peak RSS" in change_log.detail
+
+
+@pytest.mark.asyncio
+async def test_run_jobs_skips_children_of_failed_jobs():
+    jobs = [
+        _job("create", ["sh", "-c", "echo broken; exit 1"]),
+        _job("index", ["true"], ["create"]),
+    ]
+    job_ids = {job.job_name: uuid4() for job in jobs}
+
+    with patch.object(local_executor, "_report_status", AsyncMock()) as mock_report:
+        results = await run_jobs(jobs, job_ids, vcpus=1)
+
+    assert results["create"].exit_code == 1
+    assert results["index"] is None
+    mock_report.assert_awaited_once()
+    job_id, change_log = mock_report.await_args.args
+    assert job_id == job_ids["create"]
+    assert change_log.status == ChangeLogStatus.failed
+    assert "broken" in change_log.detail
+
+
+@pytest.mark.asyncio
+async def test_run_jobs_retries_killed_jobs_with_fewer_processes():
+    job = _job(
+        "load", ["sh", "-c", '[ "$NUM_PROCESSES" -le 2 ] || kill -9 $$'], attempts=3
+    )
+    job.environment.append({"name": "NUM_PROCESSES", "value": "8"})
+
+    with patch.object(local_executor, "_report_status", AsyncMock()):
+        results = await run_jobs([job], {"load": uuid4()}, vcpus=1)
+
+    assert results["load"].exit_code == 0
+
+
+@pytest.mark.asyncio
+async def test_run_jobs_reports_unexpected_errors_as_failures():
+    jobs = [
+        _job("create", ["true"]),
+        _job("index", ["true"], ["create"]),
+    ]
+    job_ids = {job.job_name: uuid4() for job in jobs}
+
+    with patch.object(
+        local_executor, "_run_job", AsyncMock(side_effect=OSError("disk full"))
+    ), patch.object(
+        local_executor,
+        "_report_status",
+        AsyncMock(side_effect=[RuntimeError("database down"), None]),
+    ) as mock_report:
+        results = await run_jobs(jobs, job_ids, vcpus=1)
+
+    assert results == {"create": None, "index": None}
+    job_id, change_log = mock_report.await_args.args
+    assert job_id == job_ids["create"]
+    assert change_log.status == ChangeLogStatus.failed
+    assert change_log.detail == "disk full"
+
+
+@pytest.mark.asyncio
+async def test_schedule_creates_tasks_and_starts_jobs():
+    callback = AsyncMock(spec=[])
+    jobs = [
+        _job("create", ["true"]),
+        _job("index", ["true"], ["create"]),
+    ]
+    for job in jobs:
+        job.callback = callback
+
+    with patch.object(local_executor, "run_jobs", AsyncMock()) as mock_run_jobs:
+        scheduled_jobs = await schedule(jobs)
+        await asyncio.gather(*local_executor._running)
+
+    assert list(scheduled_jobs) == ["create", "index"]
+    assert all(isinstance(job_id, UUID) for job_id in scheduled_jobs.values())
+    assert callback.await_count == 2
+    assert callback.await_args.kwargs["task_id"] == scheduled_jobs["index"]
+    mock_run_jobs.assert_awaited_once_with(jobs, scheduled_jobs)
+
+
+@pytest.mark.asyncio
+async def test_execute_uses_configured_executor(monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_EXECUTOR", "local")
+
+    with patch.object(
+        local_executor, "schedule", AsyncMock(return_value={"create": uuid4()})
+    ) as mock_schedule:
+        change_log = await batch.execute([_job("create", ["true"])])
+
+    mock_schedule.assert_awaited_once()
+    assert change_log.status == ChangeLogStatus.pending
+
+
+@pytest.mark.asyncio
+async def test_execute_rejects_unknown_executor(monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_EXECUTOR", "locale")
+
+    with patch.object(batch, "schedule", AsyncMock()) as mock_schedule:
+        with pytest.raises(ValueError, match="Unknown BATCH_EXECUTOR locale"):
+            await batch.execute([_job("create", ["true"])])
+
+    mock_schedule.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_report_status_updates_task_like_report_status_script():
+    job_id = uuid4()
+    result = local_executor.JobResult(0, "", 1.5, 2 ** 20)
+    change_log = local_executor._change_log(_job("create", ["true"]), result)
+
+    with patch(
+        "app.routes.tasks.task.update_task", AsyncMock()
+    ) as mock_update_task, patch.object(local_executor, "ContextEngine"):
+        await local_executor._report_status(job_id, change_log)
+
+    kwargs = mock_update_task.await_args.kwargs
+    assert kwargs["task_id"] == job_id
+    assert kwargs["request"].change_log == [change_log]
+    assert change_log.message == "Successfully ran command [ true ]"
+    assert change_log.detail == "Wall time: 1.500s, peak RSS: 1.0 MiB"
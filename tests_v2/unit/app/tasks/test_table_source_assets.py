@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import List
+from unittest.mock import Mock, patch
+from uuid import UUID
+
+import pytest
+
+from app.models.pydantic.change_log import ChangeLog
+from app.models.pydantic.jobs import Job
+from app.tasks.table_source_assets import (
+    append_table_source_asset,
+    table_source_asset,
+)
+
+MODULE_PATH_UNDER_TEST = "app.tasks.table_source_assets"
+
+DATASET: str = "some_dataset"
+VERSION: str = "v42"
+CREATION_OPTIONS = {
+    "source_type": "table",
+    "source_uri": [f"s3://some_bucket/part_{i}.csv" for i in range(3)],
+    "source_driver": "text",
+    "delimiter": ",",
+    "latitude": "latitude",
+    "longitude": "longitude",
+}
+TABLE_ASSET_UUID = UUID("1b368160-caf8-2bd7-819a-ad4949361f02")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "create_asset", [table_source_asset, append_table_source_asset]
+)
+@patch(f"{MODULE_PATH_UNDER_TEST}.execute", autospec=True)
+async def test_load_jobs_load_one_source_at_a_time(mock_execute: Mock, create_asset):
+    mock_execute.return_value = ChangeLog(
+        date_time=datetime(2022, 12, 20), message="All done!", status="success"
+    )
+
+    await create_asset(
+        DATASET,
+        VERSION,
+        TABLE_ASSET_UUID,
+        {"creation_options": CREATION_OPTIONS},
+    )
+
+    jobs: List[Job] = mock_execute.call_args_list[0].args[0]
+    load_jobs = [job for job in jobs if job.job_name.startswith("load_tabular_data_")]
+    assert load_jobs
+    for job in load_jobs:
+        assert job.num_processes is None
+        environment = {env["name"]: env["value"] for env in job.environment}
+        assert environment["CORES"] == "1"
+        assert "NUM_PROCESSES" not in environment
@@ -334,7 +334,7 @@ class TestVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 4
+        assert len(jobs) == 3
 
         expected_load_csv_data_jobs: int = 0
         observed_load_csv_data_jobs: int = 0
@@ -371,7 +371,7 @@ class TestVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 4
+        assert len(jobs) == 3
 
         expected_load_csv_data_jobs: int = 1
         observed_load_csv_data_jobs: int = 0
@@ -408,7 +408,7 @@ class TestVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 5
+        assert len(jobs) == 4
 
         expected_geostore_jobs: int = 1
         observed_geostore_jobs: int = 0
@@ -437,13 +437,16 @@ class TestVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 7
+        assert len(jobs) == 6
 
         expected_index_jobs: int = 3
         observed_index_jobs: int = 0
         for job in jobs:
             if job.job_name.startswith("create_index_"):
                 observed_index_jobs += 1
+                # GFW columns are computed while loading, so indices can
+                # be created right after
+                assert job.parents == ["load_vector_data_layer_0"]
         assert expected_index_jobs == observed_index_jobs
 
     @pytest.mark.asyncio
@@ -471,7 +474,7 @@ class TestVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 5
+        assert len(jobs) == 4
 
         expected_cluster_jobs: int = 1
         observed_cluster_jobs: int = 0
@@ -508,7 +511,7 @@ class TestAppendVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 2
+        assert len(jobs) == 1
 
         expected_load_csv_data_jobs: int = 0
         observed_load_csv_data_jobs: int = 0
@@ -552,7 +555,7 @@ class TestAppendVectorSourceAssets:
 
         assert mock_execute.call_count == 1
         jobs: List[Job] = mock_execute.call_args_list[0].args[0]
-        assert len(jobs) == 2
+        assert len(jobs) == 1
 
         expected_load_csv_data_jobs: int = 1
         observed_load_csv_data_jobs: int = 0
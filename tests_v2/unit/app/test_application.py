@@ -0,0 +1,36 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from app import application
+from app.application import QueryPool, get_query_engine, init_query_connection
+
+
+@pytest.mark.asyncio
+async def test_init_query_connection_registers_text_codecs():
+    conn = AsyncMock()
+
+    await init_query_connection(conn)
+
+    registered = {
+        call.args[0]: call.kwargs for call in conn.set_type_codec.call_args_list
+    }
+    assert registered["numeric"]["decoder"] is float
+    assert registered["uuid"]["decoder"] is str
+    for kwargs in registered.values():
+        assert kwargs["schema"] == "pg_catalog"
+        assert kwargs["format"] == "text"
+
+
+def test_query_pool_inits_connections():
+    assert QueryPool("url", None)._kwargs["init"] is init_query_connection
+
+
+def test_get_query_engine_uses_reader_for_exact_numeric(monkeypatch: MonkeyPatch):
+    read_engine, query_engine = Mock(), Mock()
+    monkeypatch.setattr(application, "READ_ENGINE", read_engine)
+    monkeypatch.setattr(application, "QUERY_ENGINE", query_engine)
+
+    assert get_query_engine() is query_engine
+    assert get_query_engine(exact_numeric=True) is read_engine
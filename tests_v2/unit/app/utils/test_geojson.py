@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from app.utils.geojson import iter_features, round_geometry
+
+
+def test_round_geometry_rounds_nested_coordinates():
+    geometry = {
+        "type": "MultiPolygon",
+        "coordinates": [[[[8.123456, 51.987654], [11, 55.5], [8.123456, 51.987654]]]],
+    }
+
+    assert round_geometry(geometry, 2) == {
+        "type": "MultiPolygon",
+        "coordinates": [[[[8.12, 51.99], [11, 55.5], [8.12, 51.99]]]],
+    }
+    assert geometry["coordinates"][0][0][0] == [8.123456, 51.987654]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+FEATURE_COLLECTION = {
+    "type": "FeatureCollection",
+    "crs": {"type": "name", "properties": {"name": "EPSG:4326"}},
+    "features": [
+        {"type": "Feature", "properties": {"name": "Côte d'Ivoire", "value": 12345.5}},
+        {"type": "Feature", "properties": {"bands": [{"stats": None}], "ok": True}},
+    ],
+    "bbox": [-180, -90, 180, 90],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+def test_iter_features_yields_features_across_chunks(chunk_size):
+    data = json.dumps(FEATURE_COLLECTION, ensure_ascii=False, indent=1).encode()
+
+    features = list(iter_features(_chunks(data, chunk_size)))
+
+    assert features == FEATURE_COLLECTION["features"]
+
+
+def test_iter_features_empty_collection():
+    assert list(iter_features([b'{"type": "FeatureCollection", "features": []}'])) == []
+    assert list(iter_features([b"{}"])) == []
+
+
+def test_iter_features_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_features([b'{"features": [{"type": "Feature"}, {"type": ']))
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import Mock
 from uuid import UUID
 
@@ -90,3 +91,52 @@ async def test_get_geostore_mixed_errors(monkeypatch: MonkeyPatch):
             geostore_id_uuid, geostore_origin=GeostoreOrigin.rw
         )
     assert e.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_get_geostore_hedged_returns_first_success(monkeypatch: MonkeyPatch):
+    geostore_id_str = "d8907d30eb5ec7e33a68aa31aaf918a4"
+    geostore_id_uuid = UUID(geostore_id_str)
+
+    async def slow_gfw_geostore(geostore_id: UUID) -> GeostoreCommon:
+        await asyncio.sleep(10)
+        raise RecordNotFoundError()
+
+    monkeypatch.setattr(geostore, "GEOSTORE_HEDGE_DELAY", 0.01)
+    monkeypatch.setattr(geostore, "_get_gfw_geostore", slow_gfw_geostore)
+    mock_rw_get_geostore = Mock(
+        geostore.rw_api.get_geostore, return_value=geostore_common
+    )
+    monkeypatch.setattr(geostore.rw_api, "get_geostore", mock_rw_get_geostore)
+
+    geo: GeostoreCommon = await asyncio.wait_for(
+        geostore.get_geostore(geostore_id_uuid, geostore_origin=GeostoreOrigin.gfw),
+        timeout=1,
+    )
+    assert geo.geostore_id == geostore_id_uuid
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "rw_exception, status_code",
+    [(RecordNotFoundError(), 404), (InvalidResponseError(), 500)],
+)
+async def test_get_geostore_hedged_aggregates_errors(
+    monkeypatch: MonkeyPatch, rw_exception: Exception, status_code: int
+):
+    geostore_id_str = "d8907d30eb5ec7e33a68aa31aaf918a7"
+    geostore_id_uuid = UUID(geostore_id_str)
+
+    monkeypatch.setattr(geostore, "GEOSTORE_HEDGE_DELAY", 0)
+    mock__get_gfw_geostore = Mock(
+        geostore._get_gfw_geostore, side_effect=RecordNotFoundError()
+    )
+    monkeypatch.setattr(geostore, "_get_gfw_geostore", mock__get_gfw_geostore)
+    mock_rw_get_geostore = Mock(geostore.rw_api.get_geostore, side_effect=rw_exception)
+    monkeypatch.setattr(geostore.rw_api, "get_geostore", mock_rw_get_geostore)
+
+    with pytest.raises(HTTPException) as e:
+        _ = await geostore.get_geostore(
+            geostore_id_uuid, geostore_origin=GeostoreOrigin.gfw
+        )
+    assert e.value.status_code == status_code
@@ -0,0 +1,127 @@
+from unittest.mock import AsyncMock
+from uuid import UUID
+
+import pytest
+
+from app.errors import RecordNotFoundError
+from app.models.pydantic.geostore import Geometry, GeostoreCommon
+from app.utils.geostore_cache import (
+    POSITION_SIZE,
+    GeostoreCache,
+    estimate_size,
+    geostore_cache,
+)
+from tests_v2.fixtures.sample_rw_geostore_response import geostore_common
+
+
+def test_cache_evicts_least_recently_used_entries_by_size():
+    cache = GeostoreCache("test", max_bytes=100, shared_dir=None)
+
+    cache.set("a", geostore_common, 40)
+    cache.set("b", geostore_common, 40)
+    assert cache.get("a") is geostore_common
+    cache.set("c", geostore_common, 40)
+
+    assert cache.current_bytes == 80
+    assert cache.get("b") is None
+    assert cache.get("a") is geostore_common
+    assert cache.get("c") is geostore_common
+
+
+def test_cache_skips_entries_larger_than_budget():
+    cache = GeostoreCache("test", max_bytes=100, shared_dir=None)
+
+    cache.set("a", geostore_common, 101)
+
+    assert cache.get("a") is None
+    assert cache.current_bytes == 0
+
+
+def test_cache_expires_not_found_entries():
+    cache = GeostoreCache("test", max_bytes=1000, not_found_ttl=-1, shared_dir=None)
+
+    cache.set_not_found("a")
+
+    assert cache.get("a") is None
+
+
+def test_estimate_size_counts_positions():
+    polygon = geostore_common.copy(
+        update={
+            "geojson": Geometry(
+                type="MultiPolygon",
+                coordinates=[
+                    [[[0, 0], [0, 1], [1, 1], [0, 0]]],
+                    [[[2, 2], [2, 3], [3, 3], [2, 2]], [[2, 2], [3, 2], [2, 2]]],
+                ],
+            )
+        }
+    )
+    point = geostore_common.copy(
+        update={"geojson": Geometry(type="Point", coordinates=[0, 0])}
+    )
+
+    assert estimate_size(polygon) - estimate_size(point) == 10 * POSITION_SIZE
+
+
+@pytest.mark.asyncio
+async def test_geostore_cache_caches_geostores_and_404s():
+    found_id = UUID("d8907d30eb5ec7e33a68aa31aaf918a4")
+    missing_id = UUID("d8907d30eb5ec7e33a68aa31aaf918a9")
+
+    async def fetch(geostore_id: UUID) -> GeostoreCommon:
+        if geostore_id == found_id:
+            return geostore_common
+        raise RecordNotFoundError(f"Geostore {geostore_id} not found")
+
+    mock_fetch = AsyncMock(side_effect=fetch)
+    cached_fetch = geostore_cache("test")(mock_fetch)
+
+    assert await cached_fetch(found_id) == geostore_common
+    assert await cached_fetch(found_id) == geostore_common
+    for _ in range(2):
+        with pytest.raises(RecordNotFoundError):
+            await cached_fetch(missing_id)
+
+    assert mock_fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_geostore_cache_can_skip_caching_404s():
+    geostore_id = UUID("d8907d30eb5ec7e33a68aa31aaf918a4")
+    mock_fetch = AsyncMock(
+        side_effect=[RecordNotFoundError("Geostore not found"), geostore_common]
+    )
+    cached_fetch = geostore_cache("test", cache_not_found=False)(mock_fetch)
+
+    with pytest.raises(RecordNotFoundError):
+        await cached_fetch(geostore_id)
+    assert await cached_fetch(geostore_id) == geostore_common
+
+    assert mock_fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_geostore_cache_shares_geostores_across_workers(tmp_path):
+    geostore_id = UUID("d8907d30eb5ec7e33a68aa31aaf918a4")
+    mock_fetch = AsyncMock(return_value=geostore_common)
+
+    worker_1 = geostore_cache("test")(mock_fetch)
+    worker_2 = geostore_cache("test")(mock_fetch)
+    for worker in (worker_1, worker_2):
+        worker.cache.shared_dir = str(tmp_path)
+
+    assert await worker_1(geostore_id) == geostore_common
+    assert await worker_2(geostore_id) == geostore_common
+
+    assert mock_fetch.await_count == 1
+
+
+def test_prune_shared_removes_least_recently_used_files(tmp_path):
+    cache = GeostoreCache("test", shared_dir=str(tmp_path), shared_max_bytes=10)
+
+    cache.write_shared("a", b"123456")
+    cache.write_shared("b", b"123456")
+
+    assert not (tmp_path / "test-a.json").exists()
+    assert (tmp_path / "test-b.json").exists()
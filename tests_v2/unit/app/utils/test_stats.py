@@ -0,0 +1,78 @@
+import numpy as np
+
+from app.models.pydantic.statistics import Histogram
+from app.utils.stats import merge_n_histograms
+
+
+def test_merge_n_histograms_no_histograms():
+    assert merge_n_histograms([]) is None
+
+
+def test_merge_n_histograms_single_histogram():
+    histo = Histogram(min=0, max=4, bin_count=4, value_count=[1, 2, 3, 4])
+
+    assert merge_n_histograms([histo]) is histo
+
+
+def test_merge_n_histograms_aligned_bins_add_up():
+    histos = [
+        Histogram(min=0, max=4, bin_count=4, value_count=[1, 2, 3, 4]),
+        Histogram(min=2, max=6, bin_count=4, value_count=[10, 20, 30, 40]),
+    ]
+
+    result = merge_n_histograms(histos)
+
+    assert result == Histogram(
+        min=0, max=6, bin_count=6, value_count=[1, 2, 13, 24, 30, 40]
+    )
+
+
+def test_merge_n_histograms_splits_coarse_bins_proportionally():
+    histos = [
+        Histogram(min=0, max=4, bin_count=4, value_count=[0, 0, 0, 0]),
+        Histogram(min=0, max=4, bin_count=2, value_count=[10, 20]),
+    ]
+
+    result = merge_n_histograms(histos)
+
+    assert result is not None
+    assert result.value_count == [5, 5, 10, 10]
+
+
+def test_merge_n_histograms_constant_histogram():
+    histos = [
+        Histogram(min=0, max=4, bin_count=4, value_count=[1, 1, 1, 1]),
+        Histogram(min=3.5, max=3.5, bin_count=1, value_count=[7]),
+    ]
+
+    result = merge_n_histograms(histos)
+
+    assert result is not None
+    assert result.value_count == [1, 1, 1, 8]
+
+
+def test_merge_n_histograms_approximates_histogram_of_all_values():
+    rng = np.random.default_rng(42)
+    tiles = [rng.normal(loc=i * 10, scale=3, size=10_000) for i in range(5)]
+    histos = []
+    for tile in tiles:
+        counts, edges = np.histogram(tile, bins=64)
+        histos.append(
+            Histogram(
+                min=float(edges[0]),
+                max=float(edges[-1]),
+                bin_count=64,
+                value_count=counts.tolist(),
+            )
+        )
+
+    result = merge_n_histograms(histos)
+
+    assert result is not None
+    all_values = np.concatenate(tiles)
+    expected, _ = np.histogram(
+        all_values, bins=result.bin_count, range=(result.min, result.max)
+    )
+    assert sum(result.value_count) == all_values.size
+    error = np.abs(np.array(result.value_count) - expected).sum() / all_values.size
+    assert error < 0.05
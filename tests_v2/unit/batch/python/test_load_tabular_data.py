@@ -0,0 +1,176 @@
+import io
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.response import StreamingBody
+from click.testing import CliRunner
+
+from batch.python.load_tabular_data import (
+    _column_name,
+    cli,
+    get_connection_limit,
+    insert_sql,
+    load,
+    load_source,
+    open_source,
+    split_columns,
+    staging_sql,
+)
+
+COLUMNS = ["id", "Latitude", "longitude", "geom", "geom_wm"]
+
+
+def test_column_name_matches_case_insensitively():
+    assert _column_name(COLUMNS, "Latitude") == "Latitude"
+    assert _column_name(COLUMNS, "latitude") == "Latitude"
+    with pytest.raises(ValueError):
+        _column_name(COLUMNS, "lat")
+
+
+def test_split_columns():
+    source_columns, geometry_columns = split_columns(COLUMNS, "geom", True)
+    assert source_columns == COLUMNS[:3]
+    assert geometry_columns == COLUMNS[3:]
+
+    source_columns, geometry_columns = split_columns(COLUMNS, "geom", False)
+    assert source_columns == COLUMNS[:3]
+    assert geometry_columns == []
+
+    with pytest.raises(ValueError):
+        split_columns(COLUMNS[:3], "geom", True)
+
+
+def test_staging_sql():
+    assert staging_sql('"ds"."v1"', "staging", "geom") == (
+        'CREATE TEMP TABLE "staging" (LIKE "ds"."v1" INCLUDING DEFAULTS) '
+        "ON COMMIT DROP; "
+        'ALTER TABLE "staging" '
+        'DROP COLUMN IF EXISTS "geom", DROP COLUMN IF EXISTS "geom_wm"'
+    )
+
+
+def test_insert_sql():
+    assert insert_sql('"ds"."v1"', "staging", COLUMNS[:2], [], None) == (
+        'INSERT INTO "ds"."v1" ("id", "Latitude") '
+        'SELECT "id", "Latitude" FROM "staging" '
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+def test_insert_sql_with_point_geometries():
+    point = 'ST_SetSRID(ST_MakePoint("longitude", "Latitude"), 4326)'
+
+    assert insert_sql(
+        '"ds"."v1"', "staging", COLUMNS[:3], COLUMNS[3:], ("longitude", "Latitude")
+    ) == (
+        'INSERT INTO "ds"."v1" ("id", "Latitude", "longitude", "geom", "geom_wm") '
+        f'SELECT "id", "Latitude", "longitude", {point}, ST_Transform({point}, 3857) '
+        'FROM "staging" ON CONFLICT DO NOTHING'
+    )
+
+
+def test_open_source_from_s3_returns_raw_body():
+    data = 'id,name\n1,"x\r\ny"\n2,""\n'.encode()
+    mock_client = MagicMock()
+    mock_client.get_object.return_value = {
+        "Body": StreamingBody(io.BytesIO(data), len(data))
+    }
+
+    with patch(
+        "batch.python.load_tabular_data.get_s3_client", return_value=mock_client
+    ):
+        source = open_source("s3://bucket/data.csv")
+        content = source.read()
+        source.close()
+
+    mock_client.get_object.assert_called_once_with(Bucket="bucket", Key="data.csv")
+    assert content == data
+
+
+@pytest.mark.asyncio
+async def test_load_source_copies_raw_csv_in_one_transaction(tmp_path):
+    source = tmp_path / "data.tsv"
+    source.write_text('id\tname\n1\ta\n2\t""\n3\t\n')
+
+    copied = list()
+
+    async def copy_to_table(table, source, **options):
+        copied.append((source.read(), options))
+        return "COPY 3"
+
+    conn = MagicMock()
+    conn.transaction.return_value = MagicMock(
+        __aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False)
+    )
+    conn.execute = AsyncMock(side_effect=["ALTER TABLE", "INSERT 0 2"])
+    conn.copy_to_table = AsyncMock(side_effect=copy_to_table)
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    pool = MagicMock(acquire=acquire)
+
+    result = await load_source(
+        pool, '"ds"."v1"', ["id", "name"], [], None, str(source), "\t", "geom"
+    )
+
+    assert copied == [
+        (source.read_bytes(), {"format": "csv", "header": True, "delimiter": "\t"})
+    ]
+    assert result.copied == 3
+    assert result.inserted == 2
+    conn.transaction.return_value.__aexit__.assert_awaited_once()
+    assert conn.execute.await_args.args[0].startswith('INSERT INTO "ds"."v1"')
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, 1),
+        ({"CORES": "2"}, 2),
+        ({"CORES": "2", "NUM_PROCESSES": "3"}, 3),
+    ],
+)
+def test_cli_concurrency_defaults_to_job_cores(monkeypatch, env, expected):
+    monkeypatch.delenv("CORES", raising=False)
+    monkeypatch.delenv("NUM_PROCESSES", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    with patch(
+        "batch.python.load_tabular_data.load", new_callable=AsyncMock
+    ) as mock_load:
+        mock_load.return_value = []
+        result = CliRunner().invoke(
+            cli, ["-d", "ds", "-v", "v1", "-s", "data.csv"], catch_exceptions=False
+        )
+
+    assert result.exit_code == 0
+    assert mock_load.await_args.args[7] == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("free, expected", [(-3, 1), (0, 1), (1, 1), (7, 4)])
+async def test_get_connection_limit_leaves_half_of_free_slots(free, expected):
+    conn = MagicMock(fetchval=AsyncMock(return_value=free))
+
+    assert await get_connection_limit(conn) == expected
+    assert "max_connections" in conn.fetchval.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_load_caps_concurrency_to_connection_limit():
+    conn = MagicMock(fetchval=AsyncMock(return_value=5), close=AsyncMock())
+
+    mock_connect = AsyncMock(return_value=conn)
+    with patch(
+        "batch.python.load_tabular_data.asyncpg.connect", mock_connect
+    ), patch("batch.python.load_tabular_data.asyncpg.create_pool") as mock_pool:
+        mock_pool.return_value.__aenter__.side_effect = RuntimeError("stop")
+        with pytest.raises(RuntimeError):
+            await load("ds", "v1", ["data.csv"], ",", None, None, "geom", 8)
+
+    conn.close.assert_awaited_once()
+    assert mock_pool.call_args.kwargs["max_size"] == 3